@@ -19,19 +19,27 @@ from snap7 import __all__ as __all__, __version__ as __version__
 
 _SUBMODULES = [
     "async_client",
+    "cache",
     "cli",
     "client",
     "connection",
     "datatypes",
     "demo",
     "discovery",
+    "engine",
     "error",
+    "exporter",
+    "fleet",
     "log",
     "logo",
+    "metrics",
     "optimizer",
     "partner",
+    "poller",
+    "pool",
     "s7protocol",
     "server",
+    "striped",
     "tags",
     "type",
     "util",
@@ -20,6 +20,14 @@ from .async_client import AsyncClient
 from .server import Server
 from .partner import Partner
 from .logo import Logo
+from .poller import Poller, PollResult
+from .fleet import FleetPoller, FleetResult
+from .pool import ClientPool, PoolResult
+from .striped import StripedClient
+from .cache import ReadCache
+from .engine import SelectorEngine
+from .metrics import ClientMetrics, MetricsSnapshot
+from .exporter import MetricsExporter
 from .util.db import Row, DB
 from .tags import NodeS7Tag, PLC4XTag, Tag, from_browse, load_csv, load_json, load_tia_xml, parse_tag
 from .type import Area, Block, ForceEntry, WordLen, SrvEvent, SrvArea
@@ -30,6 +38,18 @@ __all__ = [
     "Server",
     "Partner",
     "Logo",
+    "Poller",
+    "PollResult",
+    "FleetPoller",
+    "FleetResult",
+    "ClientPool",
+    "PoolResult",
+    "StripedClient",
+    "ReadCache",
+    "SelectorEngine",
+    "ClientMetrics",
+    "MetricsSnapshot",
+    "MetricsExporter",
     "Row",
     "DB",
     "Tag",
@@ -1,28 +1,42 @@
 """
 Legacy async S7 client implementation.
 
-Uses asyncio streams for non-blocking I/O with an asyncio.Lock() to serialize
-send/receive cycles, ensuring safe concurrent use via asyncio.gather().
+Uses asyncio streams for non-blocking I/O. Requests from concurrent
+coroutines (e.g. via asyncio.gather()) share one connection: up to the
+negotiated AMQ depth are in flight at once, and a background reader task
+hands each reply to the request with the same PDU reference.
 
 For new projects, use ``s7.AsyncClient`` instead, which supports all PLC
 models and automatically selects the best protocol.
 """
 
 import asyncio
+import contextlib
 import logging
 import struct
 import time
-from typing import List, Any, Optional, Tuple, Type
+from typing import Any, Callable, List, Optional, Tuple, Type, TypeVar, Union
 from types import TracebackType
 from datetime import datetime
 
-from .connection import TPDUSize
-from .s7protocol import S7Protocol, get_return_code_description
-from .datatypes import S7WordLen
+from .connection import ISOTCPConnection, TPDUSize
+from .s7protocol import RequestTemplate, S7Protocol, get_return_code_description
+from .datatypes import S7Area, S7WordLen
 from .error import S7Error, S7ConnectionError, S7ProtocolError, S7TimeoutError
-from .client_base import ClientMixin
+from .metrics import ClientMetrics, track
+from .client_base import ClientMixin, _OptimizationPlan
+from .optimizer import ReadPacket, WriteItem, packetize_writes
 from .szl import parse_cp_info_szl, parse_cpu_info_szl, parse_order_code_szl, parse_protection_szl
-from .client import _parse_force_szl
+from .client import (
+    _VALID_AREA_VALUES,
+    _decode_tag,
+    _encode_tag,
+    _parse_force_szl,
+    _resolve_tag,
+    _tag_read_items,
+    _tag_write_items,
+)
+from .tags import Tag
 from .type import (
     Area,
     Block,
@@ -40,6 +54,8 @@ from .type import (
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 class AsyncISOTCPConnection:
     """Async ISO on TCP connection using asyncio streams.
@@ -82,6 +98,9 @@ class AsyncISOTCPConnection:
         self._reader: Optional[asyncio.StreamReader] = None
         self._writer: Optional[asyncio.StreamWriter] = None
 
+        # Counts the PDUs and bytes of data frames when set, e.g. by a client
+        self.metrics: Optional[ClientMetrics] = None
+
     async def connect(self, timeout: float = 5.0) -> None:
         """Establish ISO on TCP connection."""
         self.timeout = timeout
@@ -148,14 +167,22 @@ class AsyncISOTCPConnection:
         except (OSError, ConnectionError) as e:
             self.connected = False
             raise S7ConnectionError(f"Send failed: {e}")
+        if self.metrics is not None:
+            self.metrics.count_sent(1, len(tpkt_frame))
+
+    async def receive_data(self, idle: bool = False) -> bytes:
+        """Receive data from ISO connection.
 
-    async def receive_data(self) -> bytes:
-        """Receive data from ISO connection."""
+        Args:
+            idle: Wait as long as it takes for the next frame to start, as a
+                reader waiting for unsolicited replies does.  The rest of the
+                frame must still arrive within the timeout.
+        """
         if not self.connected:
             raise S7ConnectionError("Not connected")
 
         try:
-            tpkt_header = await self._recv_exact(4)
+            tpkt_header = await self._recv_exact(4, wait=idle)
             version, reserved, length = struct.unpack(">BBH", tpkt_header)
             if version != 3:
                 raise S7ConnectionError(f"Invalid TPKT version: {version}")
@@ -172,6 +199,8 @@ class AsyncISOTCPConnection:
             pdu_len, pdu_type, eot_num = struct.unpack(">BBB", payload[:3])
             if pdu_type != self.COTP_DT:
                 raise S7ConnectionError(f"Expected COTP DT, got {pdu_type:#02x}")
+            if self.metrics is not None:
+                self.metrics.count_received(1, length)
             return payload[3:]
 
         except asyncio.TimeoutError:
@@ -258,14 +287,14 @@ class AsyncISOTCPConnection:
                 logger.debug(f"Negotiated PDU size: {self.pdu_size}")
             offset += 2 + param_len
 
-    async def _recv_exact(self, size: int) -> bytes:
-        """Receive exactly size bytes."""
+    async def _recv_exact(self, size: int, wait: bool = False) -> bytes:
+        """Receive exactly size bytes, without a timeout if *wait* is set."""
         if self._reader is None:
             raise S7ConnectionError("Stream not initialized")
         try:
             return await asyncio.wait_for(
                 self._reader.readexactly(size),
-                timeout=self.timeout,
+                timeout=None if wait else self.timeout,
             )
         except asyncio.IncompleteReadError:
             self.connected = False
@@ -293,9 +322,11 @@ class AsyncClient(ClientMixin):
     """
     Legacy async S7 client for classic PUT/GET communication.
 
-    Uses asyncio streams for non-blocking I/O. An internal asyncio.Lock
-    serializes each send+receive cycle so that concurrent coroutines
-    (e.g. via asyncio.gather) never interleave on the same TCP socket.
+    Uses asyncio streams for non-blocking I/O. Concurrent coroutines
+    (e.g. via asyncio.gather) share the TCP connection: each request is sent
+    as soon as one of the ``max_amq_caller`` job slots the PLC granted is
+    free, and a background reader task matches every reply to its request
+    by the S7 PDU reference, so replies may arrive in any order.
 
     For new projects, use ``s7.AsyncClient`` instead.
 
@@ -306,8 +337,6 @@ class AsyncClient(ClientMixin):
         ...     data = await client.db_read(1, 0, 4)
     """
 
-    MAX_VARS = 20
-
     def __init__(self) -> None:
         self.connection: Optional[AsyncISOTCPConnection] = None
         self.protocol = S7Protocol()
@@ -317,6 +346,8 @@ class AsyncClient(ClientMixin):
         self.rack = 0
         self.slot = 0
         self.pdu_length = 480
+        self.max_amq_caller = 1
+        self.max_amq_callee = 1
 
         self.local_tsap = 0x0100
         self.remote_tsap = 0x0102
@@ -326,7 +357,22 @@ class AsyncClient(ClientMixin):
         self._exec_time = 0
         self._last_error = 0
 
-        self._lock = asyncio.Lock()
+        # Latency histograms and traffic counters, see snap7.metrics
+        self.metrics = ClientMetrics()
+        track(self)
+
+        # Request multiplexing: futures of in-flight requests by PDU reference,
+        # resolved by the reader task; the semaphore bounds them to the AMQ
+        self._pending: dict[int, "asyncio.Future[bytes]"] = {}
+        self._window = asyncio.Semaphore(1)
+        # Optional bound on requests in flight shared with other clients (see snap7.fleet)
+        self._shared_window: Optional[asyncio.Semaphore] = None
+        self._reader_task: Optional["asyncio.Task[None]"] = None
+        self._reader_conn: Optional[AsyncISOTCPConnection] = None
+        self._reader_error: Optional[Exception] = None
+
+        # Multi-read optimizer state; plans are only touched from the event loop
+        self._init_optimizer(contextlib.nullcontext())
 
         self._params = {
             Parameter.RemotePort: 102,
@@ -347,44 +393,124 @@ class AsyncClient(ClientMixin):
         return self.connection
 
     async def _send_receive(self, request: bytes, max_stale_retries: int = 3) -> dict[str, Any]:
-        """Send a request and receive/parse the response, holding the lock.
-
-        The lock ensures that concurrent coroutines never interleave
-        send/receive on the same TCP socket.
+        """Send a request and receive/parse the response.
 
         Unlike the sync client, we do NOT use protocol.validate_pdu_reference()
         because the protocol's shared sequence counter can be incremented by
-        a concurrent coroutine between request building and lock acquisition.
-        Instead, we extract the expected sequence directly from the request
-        bytes (S7 header bytes 4-5).
+        a concurrent coroutine before the reply arrives.  Instead, the reply
+        is matched on the sequence taken from the request bytes (S7 header
+        bytes 4-5).
+        """
+        return await self._exchange(request, self._decode_response, max_stale_retries)
+
+    async def _send_receive_read(self, request: bytes, max_stale_retries: int = 3) -> memoryview:
+        """Send a single-item read request and return the reply payload.
+
+        Uses the allocation-free :meth:`S7Protocol.parse_read_reply` fast path.
+        """
+        return await self._exchange(request, self.protocol.parse_read_reply, max_stale_retries)
+
+    def _decode_response(self, pdu: bytes) -> Tuple[int, dict[str, Any]]:
+        """Full response decoder for :meth:`_exchange`."""
+        response = self.protocol.parse_response(pdu)
+        return response.get("sequence", 0), response
+
+    @staticmethod
+    def _raw_reply(pdu: bytes) -> Tuple[int, bytes]:
+        """Pass-through decoder for :meth:`_exchange`."""
+        return 0, pdu
+
+    async def _exchange(self, request: bytes, decode: Callable[[bytes], Tuple[int, _T]], max_stale_retries: int = 3) -> _T:
+        """Send a request and receive/decode its reply.
+
+        Waits for one of the ``max_amq_caller`` job slots (and a slot of the
+        shared window, if one is set), sends the request
+        and waits for the reader task to deliver the reply carrying the same
+        PDU reference, so concurrent callers keep several requests in flight.
+        Stale replies that no request waits for are discarded by the reader;
+        *max_stale_retries* is kept for compatibility.
+
+        *decode* turns a reply PDU into ``(sequence, result)``.
         """
         conn = self._get_connection()
+        self._start_reader(conn)
 
         # Extract the sequence number we embedded in this request's S7 header.
         # S7 header: 0x32 | pdu_type | reserved(2) | sequence(2) | ...
         expected_seq = struct.unpack(">H", request[4:6])[0]
 
-        async with self._lock:
-            await conn.send_data(request)
+        async with self._window, self._shared_window or contextlib.nullcontext():
+            if self._reader_error is not None:
+                raise S7ConnectionError(f"Connection lost: {self._reader_error}")
+            if expected_seq in self._pending:
+                raise S7ProtocolError(f"A request with PDU reference {expected_seq} is already in flight")
 
-            for attempt in range(max_stale_retries + 1):
-                response_data = await conn.receive_data()
-                response = self.protocol.parse_response(response_data)
+            reply: "asyncio.Future[bytes]" = asyncio.get_running_loop().create_future()
+            self._pending[expected_seq] = reply
+            try:
+                # One write per frame, so concurrent senders never interleave
+                sent_at = time.perf_counter()
+                await conn.send_data(request)
+                response_data = await asyncio.wait_for(reply, timeout=conn.timeout)
+            except asyncio.TimeoutError:
+                raise S7TimeoutError(f"Receive timeout waiting for reply {expected_seq}")
+            finally:
+                del self._pending[expected_seq]
 
-                resp_seq = response.get("sequence", 0)
-                if resp_seq == expected_seq:
-                    return response
+        self._cost_estimator.add_sample(
+            len(request) + len(response_data) + 2 * ISOTCPConnection.FRAME_HEADER_SIZE, time.perf_counter() - sent_at
+        )
+        return decode(response_data)[1]
+
+    def _start_reader(self, conn: AsyncISOTCPConnection) -> None:
+        """Start the reply reader task for *conn* unless it is running already."""
+        if self._reader_conn is conn and self._reader_task is not None:
+            return
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        self._reader_error = None
+        self._reader_conn = conn
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_replies(conn), name="s7-reply-reader")
+
+    async def _stop_reader(self) -> None:
+        """Stop the reader task and fail all requests still waiting for a reply."""
+        task, self._reader_task, self._reader_conn = self._reader_task, None, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._fail_pending(S7ConnectionError("Disconnected"))
 
-                # Stale packet — response is for an older request
-                if attempt < max_stale_retries:
-                    logger.warning(
-                        f"Stale packet: expected seq {expected_seq}, got {resp_seq} "
-                        f"(attempt {attempt + 1}/{max_stale_retries}), retrying receive"
-                    )
-                    continue
-                raise S7ProtocolError(f"Max stale packet retries ({max_stale_retries}) exceeded")
+    def _fail_pending(self, error: Exception) -> None:
+        for reply in self._pending.values():
+            if not reply.done():
+                reply.set_exception(error)
 
-        raise S7ProtocolError("Failed to receive valid response")  # Should not reach here
+    async def _read_replies(self, conn: AsyncISOTCPConnection) -> None:
+        """Reader task: deliver each reply PDU to the request with the same PDU reference.
+
+        On a receive error every waiting request fails with that error, and
+        so do all later requests until the client reconnects.
+        """
+        try:
+            while True:
+                pdu = await conn.receive_data(idle=True)
+                if len(pdu) < 6:
+                    logger.warning(f"Discarding {len(pdu)}-byte response without PDU reference")
+                    continue
+                seq = struct.unpack_from(">H", pdu, 4)[0]
+                reply = self._pending.get(seq)
+                if reply is None or reply.done():
+                    self.metrics.count_stale_retry()
+                    logger.warning(f"Discarding unexpected response with sequence {seq}")
+                    continue
+                reply.set_result(pdu)
+        except Exception as e:
+            logger.debug(f"Reply reader stopped: {e}")
+            self._reader_error = e
+            self._fail_pending(e)
 
     async def connect(self, address: str, rack: int, slot: int, tcp_port: int = 102) -> "AsyncClient":
         """Connect to S7 PLC.
@@ -407,18 +533,21 @@ class AsyncClient(ClientMixin):
         self.remote_tsap = (self.connection_type << 8) | (rack << 5) | slot
 
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             self.connection = AsyncISOTCPConnection(
                 host=address, port=tcp_port, local_tsap=self.local_tsap, remote_tsap=self.remote_tsap
             )
+            self.connection.metrics = self.metrics
 
             await self.connection.connect()
 
+            self._window = asyncio.Semaphore(1)
             await self._setup_communication()
+            self._window = asyncio.Semaphore(self.max_amq_caller)
 
             self.connected = True
-            self._exec_time = int((time.time() - start_time) * 1000)
+            self._record_time("connect", start_time)
             logger.info(f"Connected to {address}:{tcp_port} rack {rack} slot {slot}")
 
         except Exception as e:
@@ -436,11 +565,13 @@ class AsyncClient(ClientMixin):
         Returns:
             0 on success
         """
+        await self._stop_reader()
         if self.connection:
             await self.connection.disconnect()
             self.connection = None
 
         self.connected = False
+        self._opt_plans.clear()
         logger.info(f"Disconnected from {self.host}:{self.port}")
         return 0
 
@@ -466,6 +597,20 @@ class AsyncClient(ClientMixin):
         logger.debug(f"db_read: DB{db_number}, start={start}, size={size}")
         return await self.read_area(Area.DB, db_number, start, size)
 
+    async def db_read_into(self, db_number: int, start: int, buf: Union[bytearray, memoryview]) -> int:
+        """Read data from DB straight into a caller-owned buffer.
+
+        Args:
+            db_number: DB number to read from
+            start: Start byte offset
+            buf: Writable buffer; ``len(buf)`` bytes are read
+
+        Returns:
+            Number of bytes written into *buf*
+        """
+        logger.debug(f"db_read_into: DB{db_number}, start={start}, size={len(buf)}")
+        return await self.read_area_into(Area.DB, db_number, start, buf)
+
     async def db_write(self, db_number: int, start: int, data: bytearray) -> int:
         """Write data to DB.
 
@@ -522,49 +667,54 @@ class AsyncClient(ClientMixin):
 
         Automatically splits into multiple requests if size exceeds PDU capacity.
         """
-        start_time = time.time()
-        s7_area = self._map_area(area)
+        start_time = time.perf_counter()
+        payloads = await self._read_area_payloads(self._map_area(area), db_number, start, size, self._area_word_len(area))
+        self._record_time("read_area", start_time)
+        return bytearray(payloads[0]) if len(payloads) == 1 else bytearray(b"".join(payloads))
 
-        if area == Area.TM:
-            word_len = S7WordLen.TIMER
-        elif area == Area.CT:
-            word_len = S7WordLen.COUNTER
-        else:
-            word_len = S7WordLen.BYTE
+    async def read_area_into(self, area: Area, db_number: int, start: int, buf: Union[bytearray, memoryview]) -> int:
+        """Read data from memory area straight into a caller-owned buffer.
 
+        The number of items follows from the size of *buf*; each reply
+        payload is copied directly into it.
+
+        Returns:
+            Number of bytes written into *buf*
+        """
+        start_time = time.perf_counter()
+        word_len = self._area_word_len(area)
+        view, count = self._writable_view(buf, word_len)
+        payloads = await self._read_area_payloads(self._map_area(area), db_number, start, count, word_len)
+        written = self._copy_payloads(view, payloads)
+        self._record_time("read_area", start_time)
+        return written
+
+    async def _read_area_payloads(
+        self, s7_area: S7Area, db_number: int, start: int, size: int, word_len: S7WordLen
+    ) -> List[memoryview]:
+        """Read an area in PDU-sized chunks and return a view of each chunk's reply payload."""
         max_chunk = self._max_read_size()
         if size <= max_chunk:
             request = self.protocol.build_read_request(
                 area=s7_area, db_number=db_number, start=start, word_len=word_len, count=size
             )
-            response = await self._send_receive(request)
-            values = self.protocol.extract_read_data(response, word_len, size)
-            self._exec_time = int((time.time() - start_time) * 1000)
-            return bytearray(values)
-
-        result = bytearray()
-        offset = 0
-        remaining = size
-        while remaining > 0:
-            chunk_size = min(remaining, max_chunk)
-            request = self.protocol.build_read_request(
-                area=s7_area, db_number=db_number, start=start + offset, word_len=word_len, count=chunk_size
-            )
-            response = await self._send_receive(request)
-            values = self.protocol.extract_read_data(response, word_len, chunk_size)
-            result.extend(values)
-            offset += chunk_size
-            remaining -= chunk_size
+            return [await self._send_receive_read(request)]
 
-        self._exec_time = int((time.time() - start_time) * 1000)
-        return result
+        # All chunks go out at once; the AMQ window bounds how many are in flight
+        requests = [
+            self.protocol.build_read_request(
+                area=s7_area, db_number=db_number, start=start + offset, word_len=word_len, count=min(max_chunk, size - offset)
+            )
+            for offset in range(0, size, max_chunk)
+        ]
+        return list(await asyncio.gather(*(self._send_receive_read(request) for request in requests)))
 
     async def write_area(self, area: Area, db_number: int, start: int, data: bytearray) -> int:
         """Write data to memory area.
 
         Automatically splits into multiple requests if data exceeds PDU capacity.
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         s7_area = self._map_area(area)
 
         if area == Area.TM:
@@ -581,27 +731,33 @@ class AsyncClient(ClientMixin):
             )
             response = await self._send_receive(request)
             self.protocol.check_write_response(response)
-            self._exec_time = int((time.time() - start_time) * 1000)
+            self._record_time("write_area", start_time)
             return 0
 
-        offset = 0
-        remaining = len(data)
-        while remaining > 0:
-            chunk_size = min(remaining, max_chunk)
-            chunk_data = data[offset : offset + chunk_size]
-            request = self.protocol.build_write_request(
-                area=s7_area, db_number=db_number, start=start + offset, word_len=word_len, data=bytes(chunk_data)
+        requests = [
+            self.protocol.build_write_request(
+                area=s7_area,
+                db_number=db_number,
+                start=start + offset,
+                word_len=word_len,
+                data=bytes(data[offset : offset + max_chunk]),
             )
-            response = await self._send_receive(request)
+            for offset in range(0, len(data), max_chunk)
+        ]
+        for response in await asyncio.gather(*(self._send_receive(request) for request in requests)):
             self.protocol.check_write_response(response)
-            offset += chunk_size
-            remaining -= chunk_size
 
-        self._exec_time = int((time.time() - start_time) * 1000)
+        self._record_time("write_area", start_time)
         return 0
 
     async def read_multi_vars(self, items: List[dict[str, Any]]) -> Tuple[int, list[bytearray]]:
-        """Read multiple variables (sequentially, one read_area per item).
+        """Read multiple variables in as few requests as possible.
+
+        With two or more items, the multi-variable read optimizer merges
+        adjacent reads and packs them into multi-item PDUs, exactly as
+        ``Client.read_multi_vars`` does; plans are cached per item layout and
+        all packets are sent concurrently.  Disable it with
+        ``client.use_optimizer = False`` to read each item with ``read_area``.
 
         Args:
             items: List of item dicts with keys: area, db_number, start, size
@@ -611,39 +767,163 @@ class AsyncClient(ClientMixin):
         """
         if not items:
             return (0, [])
-        if len(items) > self.MAX_VARS:
-            raise ValueError(f"Too many items: {len(items)} exceeds MAX_VARS ({self.MAX_VARS})")
-
-        results: list[bytearray] = []
-        for item in items:
-            area = item["area"]
-            db_number = item.get("db_number", 0)
-            start = item["start"]
-            size = item["size"]
-            data = await self.read_area(area, db_number, start, size)
-            results.append(data)
+
+        if len(items) <= 1 or not self.use_optimizer:
+            results: list[bytearray] = []
+            for item in items:
+                area = item["area"]
+                db_number = item.get("db_number", 0)
+                start = item["start"]
+                size = item["size"]
+                data = await self.read_area(area, db_number, start, size)
+                results.append(data)
+            return (0, results)
+
+        start_time = time.perf_counter()
+        plan = self._optimization_plan(items)
+        results = self._plan_results(plan, await self._read_plan(plan))
+        self._record_time("read_multi_vars", start_time)
         return (0, results)
 
+    async def _read_plan(self, plan: _OptimizationPlan) -> List[List[bytearray]]:
+        """Execute the packets of *plan* concurrently.
+
+        Returns:
+            The data of every block, one list per packet parallel to
+            ``packet.blocks``.  The plan itself is shared and left untouched.
+        """
+
+        async def read_packet(packet: ReadPacket, request: Optional[RequestTemplate]) -> List[bytearray]:
+            if request is None:
+                # Single block: use regular read to avoid multi-read overhead
+                blk = packet.blocks[0]
+                area = Area(blk.area) if blk.area in _VALID_AREA_VALUES else Area.DB
+                return [await self.read_area(area, blk.db_number, blk.start_offset, blk.byte_length)]
+            response = await self._send_receive(bytes(self.protocol.stamp_request(request.copy())))
+            return self.protocol.extract_multi_read_data(response, len(packet.blocks))
+
+        return list(await asyncio.gather(*(read_packet(packet, request) for packet, request in zip(plan.packets, plan.requests))))
+
     async def write_multi_vars(self, items: List[dict[str, Any]]) -> int:
-        """Write multiple variables (sequentially, one write_area per item).
+        """Write multiple variables packed into multi-item WRITE_AREA requests.
 
         Args:
             items: List of item dicts with keys: area, db_number, start, data
+                and optionally word_len
 
         Returns:
             0 on success
+
+        Raises:
+            S7ProtocolError: If any item failed; every failed item is listed
+                with its return code.
         """
         if not items:
             return 0
-        if len(items) > self.MAX_VARS:
-            raise ValueError(f"Too many items: {len(items)} exceeds MAX_VARS ({self.MAX_VARS})")
-
-        for item in items:
-            area = item["area"]
-            db_number = item.get("db_number", 0)
-            start = item["start"]
-            data = item["data"]
-            await self.write_area(area, db_number, start, data)
+
+        self._check_write_results(await self._write_multi_items(self._build_write_items(items)))
+        return 0
+
+    async def _write_multi_items(self, write_items: List[WriteItem]) -> List[int]:
+        """Send write items as packed multi-item WRITE_AREA requests, all packets concurrently.
+
+        Returns:
+            One S7 return code per item in *write_items* order (``0xFF`` = success).
+        """
+        start_time = time.perf_counter()
+        packets = packetize_writes(write_items, self.pdu_length, max_items=self.MAX_VARS)
+        requests = [self.protocol.build_multi_write_request(self._write_packet_items(packet)) for packet in packets]
+        responses = await asyncio.gather(*(self._send_receive(request) for request in requests))
+
+        packet_codes = [
+            self.protocol.extract_multi_write_results(response, len(packet.items)) for packet, response in zip(packets, responses)
+        ]
+        self._record_time("write_multi_vars", start_time)
+        return self._fold_write_results(packets, packet_codes, len(write_items))
+
+    # ---------------------------------------------------------------
+    # Typed tag access
+    # ---------------------------------------------------------------
+
+    async def read_tag(self, tag: Union[Tag, str], encoding: str = "latin-1") -> Any:
+        """Read a typed value by :class:`~snap7.tags.Tag` or address string.
+
+        Args:
+            tag: A :class:`~snap7.tags.Tag` instance or a parseable address
+                string such as ``"DB1.DBX0.0:BOOL"`` or ``"DB1:10:INT"``.
+            encoding: Character encoding for STRING/FSTRING values (default ``"latin-1"``).
+
+        Returns:
+            The typed value (bool/int/float/datetime/str depending on type).
+        """
+        resolved = _resolve_tag(tag)
+        data = await self.read_area(Area(resolved.area), resolved.db_number, resolved.byte_offset, resolved.size)
+        return _decode_tag(resolved, data, encoding=encoding)
+
+    async def write_tag(self, tag: Union[Tag, str], value: Any, encoding: str = "latin-1") -> int:
+        """Write a typed value by :class:`~snap7.tags.Tag` or address string.
+
+        Args:
+            tag: A :class:`~snap7.tags.Tag` instance or a parseable address string.
+            value: The value to write (type must match the tag's datatype).
+            encoding: Character encoding for STRING/FSTRING values (default ``"latin-1"``).
+
+        Returns:
+            0 on success.
+        """
+        resolved = _resolve_tag(tag)
+        if resolved.datatype.upper() == "BOOL" and resolved.count == 1:
+            # A bit write leaves the other bits of the byte alone without reading it first
+            return await self.write_tags([resolved], [value])
+
+        buf = bytearray(resolved.size)
+        _encode_tag(resolved, buf, value, encoding=encoding)
+        return await self.write_area(Area(resolved.area), resolved.db_number, resolved.byte_offset, buf)
+
+    async def read_tags(self, tags: List[Union[Tag, str]], encoding: str = "latin-1") -> List[Any]:
+        """Read multiple tags through the multi-variable read optimizer.
+
+        There is no limit on the number of tags; they are spread over as
+        many PDUs as needed, which are sent concurrently.
+
+        Args:
+            tags: List of :class:`~snap7.tags.Tag` instances or address strings.
+            encoding: Character encoding for STRING/FSTRING values (default ``"latin-1"``).
+
+        Returns:
+            List of decoded values in the same order as input.
+        """
+        resolved, items = _tag_read_items(tags)
+        _code, data_list = await self.read_multi_vars(items)
+        return [_decode_tag(t, d, encoding=encoding) for t, d in zip(resolved, data_list)]
+
+    async def write_tags(self, tags: List[Union[Tag, str]], values: List[Any], encoding: str = "latin-1") -> int:
+        """Write multiple tags in as few requests as possible.
+
+        Values are packed into multi-item write requests.  Each BOOL tag is
+        written as a single bit, an item of its own in the same requests, so
+        no byte is read first and other bits of the byte are left alone.
+        There is no limit on the number of tags.
+
+        Args:
+            tags: List of :class:`~snap7.tags.Tag` instances or address strings.
+            values: Values to write, one per tag.
+            encoding: Character encoding for STRING/FSTRING values (default ``"latin-1"``).
+
+        Returns:
+            0 on success.
+
+        Raises:
+            ValueError: If *tags* and *values* differ in length.
+            S7ProtocolError: If any item failed; every failed item is listed
+                with its return code.
+        """
+        if len(tags) != len(values):
+            raise ValueError(f"Got {len(values)} values for {len(tags)} tags")
+
+        items = _tag_write_items(tags, values, encoding)
+        if items:
+            self._check_write_results(await self._write_multi_items(self._build_write_items(items)))
         return 0
 
     # ---------------------------------------------------------------
@@ -674,8 +954,6 @@ class AsyncClient(ClientMixin):
         if not self.get_connected():
             raise S7ConnectionError("Not connected to PLC")
 
-        conn = self._get_connection()
-
         block_type_codes = {
             Block.OB: 0x38,
             Block.DB: 0x41,
@@ -708,12 +986,8 @@ class AsyncClient(ClientMixin):
             if last_data_unit == 0x00:
                 break
 
-            async with self._lock:
-                followup = self.protocol.build_userdata_followup_request(group, subfunction, sequence_number)
-                await conn.send_data(followup)
-                response_data = await conn.receive_data()
-
-            response = self.protocol.parse_response(response_data)
+            followup = self.protocol.build_userdata_followup_request(group, subfunction, sequence_number)
+            response = await self._send_receive(followup)
 
             data_info = response.get("data", {})
             return_code = data_info.get("return_code", 0xFF) if isinstance(data_info, dict) else 0xFF
@@ -807,7 +1081,6 @@ class AsyncClient(ClientMixin):
         if not self.get_connected():
             raise S7ConnectionError("Not connected to PLC")
 
-        conn = self._get_connection()
         block_type = 0x41  # DB
 
         if block_num == -1:
@@ -833,10 +1106,7 @@ class AsyncClient(ClientMixin):
             len(data_section),
         )
 
-        async with self._lock:
-            await conn.send_data(header + param_data + data_section)
-            response_data = await conn.receive_data()
-        self.protocol.parse_response(response_data)
+        await self._send_receive(header + param_data + data_section)
 
         # Step 3: Download ended
         param_data = struct.pack(">B", 0x1C)
@@ -850,10 +1120,7 @@ class AsyncClient(ClientMixin):
             0x0000,
         )
 
-        async with self._lock:
-            await conn.send_data(header + param_data)
-            response_data = await conn.receive_data()
-        self.protocol.parse_response(response_data)
+        await self._send_receive(header + param_data)
 
         logger.info(f"Downloaded {len(data)} bytes to block {block_num}")
         return 0
@@ -998,8 +1265,6 @@ class AsyncClient(ClientMixin):
         if not self.get_connected():
             raise S7ConnectionError("Not connected to PLC")
 
-        conn = self._get_connection()
-
         request = self.protocol.build_read_szl_request(ssl_id, index)
         response = await self._send_receive(request)
 
@@ -1022,12 +1287,8 @@ class AsyncClient(ClientMixin):
             if last_data_unit == 0x00:
                 break
 
-            async with self._lock:
-                followup = self.protocol.build_userdata_followup_request(group, subfunction, sequence_number)
-                await conn.send_data(followup)
-                response_data = await conn.receive_data()
-
-            response = self.protocol.parse_response(response_data)
+            followup = self.protocol.build_userdata_followup_request(group, subfunction, sequence_number)
+            response = await self._send_receive(followup)
 
             data_info = response.get("data", {})
             return_code = data_info.get("return_code", 0xFF) if isinstance(data_info, dict) else 0xFF
@@ -1207,11 +1468,7 @@ class AsyncClient(ClientMixin):
 
     async def iso_exchange_buffer(self, data: bytearray) -> bytearray:
         """Exchange raw ISO PDU."""
-        conn = self._get_connection()
-
-        async with self._lock:
-            await conn.send_data(bytes(data))
-            response = await conn.receive_data()
+        response = await self._exchange(bytes(data), self._raw_reply)
         return bytearray(response)
 
     # ---------------------------------------------------------------
@@ -1270,20 +1527,12 @@ class AsyncClient(ClientMixin):
     # ---------------------------------------------------------------
 
     async def _setup_communication(self) -> None:
-        """Setup communication and negotiate PDU length."""
-        request = self.protocol.build_setup_communication_request(max_amq_caller=1, max_amq_callee=1, pdu_length=self.pdu_length)
+        """Setup communication and negotiate PDU length and AMQ depth."""
+        request = self.protocol.build_setup_communication_request(
+            max_amq_caller=self.AMQ_REQUEST, max_amq_callee=self.AMQ_REQUEST, pdu_length=self.pdu_length
+        )
         response = await self._send_receive(request)
-
-        if response.get("parameters"):
-            params = response["parameters"]
-            if "pdu_length" in params:
-                negotiated = params["pdu_length"]
-                if negotiated < 64:
-                    logger.warning(f"Server negotiated implausible PDU length {negotiated}, using minimum 240")
-                    negotiated = 240
-                self.pdu_length = negotiated
-                self._params[Parameter.PDURequest] = self.pdu_length
-                logger.info(f"Negotiated PDU length: {self.pdu_length}")
+        self._apply_setup_communication(response.get("parameters"))
 
     # ---------------------------------------------------------------
     # Context manager
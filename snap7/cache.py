@@ -0,0 +1,181 @@
+"""
+Read-through cache for byte reads of the classic S7 client.
+
+Many consumers of PLC data tolerate values that are a few hundred
+milliseconds old, yet read the same DB ranges over and over.  A
+:class:`ReadCache` given to a :class:`~snap7.client.Client` keeps the byte
+ranges it read for a time-to-live (TTL) and answers later reads of the same
+bytes, or of any sub-range, without a round trip to the PLC.
+
+Writes made through the same client drop the cached ranges they overlap, so
+a client always reads back what it wrote itself.  Writes by other clients or
+by the PLC program become visible once the cached range expires.
+
+Example::
+
+    from snap7 import Area, Client, ReadCache
+
+    cache = ReadCache(ttl=0.5, area_ttl={Area.PE: 0.1})
+    client = Client(read_cache=cache)
+    client.connect("192.168.1.10", 0, 1)
+
+    client.db_read(1, 0, 100)  # read from the PLC
+    client.db_read(1, 10, 4)  # answered from the cached block
+    print(cache.hits, cache.misses)
+"""
+
+import threading
+import time
+from typing import Mapping, Optional, Union
+
+
+class _Block:
+    """A cached byte range of one area/DB."""
+
+    __slots__ = ("start", "end", "data", "expires")
+
+    def __init__(self, start: int, data: bytes, expires: float) -> None:
+        self.start = start
+        self.end = start + len(data)
+        self.data = data
+        self.expires = expires
+
+
+class ReadCache:
+    """Byte ranges read from a PLC, kept for a limited time.
+
+    A read is a hit when a live cached block contains the whole requested
+    range; it is answered with a slice of that block.  Reads that are not
+    fully covered by one block go to the PLC, and their result is cached,
+    replacing the blocks it contains.
+
+    The cache is thread-safe.  A read that was already on the wire when a
+    local write invalidated its range is not cached, so it cannot bring back
+    the bytes from before the write.
+
+    Args:
+        ttl: Seconds a block stays valid.
+        area_ttl: TTL per area, overriding *ttl*; e.g. ``{Area.PE: 0.1}``.
+            A TTL of 0 disables caching for that area.
+        max_blocks: Maximum number of blocks kept; the blocks closest to
+            expiry are dropped first.
+
+    Attributes:
+        hits: Reads answered from the cache.
+        misses: Cacheable reads that went to the PLC.
+    """
+
+    def __init__(self, ttl: float = 0.5, area_ttl: Optional[Mapping[int, float]] = None, max_blocks: int = 256) -> None:
+        if ttl < 0 or any(t < 0 for t in (area_ttl or {}).values()):
+            raise ValueError("ttl must not be negative")
+        if max_blocks < 1:
+            raise ValueError(f"max_blocks must be at least 1, got {max_blocks}")
+        self.ttl = ttl
+        self.area_ttl = {int(area): t for area, t in (area_ttl or {}).items()}
+        self.max_blocks = max_blocks
+        self.hits = 0
+        self.misses = 0
+        self._blocks: dict[tuple[int, int], list[_Block]] = {}
+        self._count = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of cacheable reads answered from the cache (0.0 before any read)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation; pass it to :meth:`put`."""
+        return self._generation
+
+    def ttl_for(self, area: int) -> float:
+        """The TTL of *area* in seconds; 0 means the area is not cached."""
+        return self.area_ttl.get(int(area), self.ttl)
+
+    def get(self, area: int, db_number: int, start: int, size: int) -> Optional[memoryview]:
+        """Look up a byte range.
+
+        Returns:
+            A read-only view of the cached bytes, or None on a miss.
+        """
+        now = time.monotonic()
+        end = start + size
+        with self._lock:
+            for block in self._blocks.get((int(area), db_number), ()):
+                if block.start <= start and end <= block.end and block.expires > now:
+                    self.hits += 1
+                    return memoryview(block.data)[start - block.start : end - block.start]
+            self.misses += 1
+        return None
+
+    def put(
+        self, area: int, db_number: int, start: int, data: Union[bytes, bytearray, memoryview], generation: Optional[int] = None
+    ) -> None:
+        """Cache bytes read from the PLC.
+
+        Args:
+            area: Area read from.
+            db_number: DB number (0 for non-DB areas).
+            start: First byte read.
+            data: The bytes read; they are copied.
+            generation: :attr:`generation` taken before the read was sent.
+                If an invalidation happened since, the bytes may predate a
+                write and are not cached.
+        """
+        ttl = self.ttl_for(area)
+        if ttl <= 0 or not data:
+            return
+        now = time.monotonic()
+        new = _Block(start, bytes(data), now + ttl)
+        key = (int(area), db_number)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            blocks = self._blocks.setdefault(key, [])
+            kept = [b for b in blocks if b.expires > now and not (new.start <= b.start and b.end <= new.end)]
+            self._count += len(kept) + 1 - len(blocks)
+            kept.append(new)
+            self._blocks[key] = kept
+            if self._count > self.max_blocks:
+                self._evict(now)
+
+    def invalidate(self, area: int, db_number: int, start: int, size: int) -> None:
+        """Drop every cached block that overlaps a byte range, e.g. after writing it."""
+        end = start + size
+        key = (int(area), db_number)
+        with self._lock:
+            self._generation += 1
+            blocks = self._blocks.get(key)
+            if not blocks:
+                return
+            kept = [b for b in blocks if b.end <= start or end <= b.start]
+            self._count -= len(blocks) - len(kept)
+            if kept:
+                self._blocks[key] = kept
+            else:
+                del self._blocks[key]
+
+    def clear(self) -> None:
+        """Drop all cached blocks; the hit and miss counters are kept."""
+        with self._lock:
+            self._generation += 1
+            self._blocks.clear()
+            self._count = 0
+
+    def _evict(self, now: float) -> None:
+        """Drop expired blocks, then the blocks closest to expiry, down to ``max_blocks``."""
+        live = [(block.expires, key, block) for key, blocks in self._blocks.items() for block in blocks if block.expires > now]
+        live.sort(key=lambda item: item[0])
+        drop = {id(block) for _, _, block in live[: max(0, len(live) - self.max_blocks)]}
+        self._blocks = {}
+        for _, key, block in live:
+            if id(block) not in drop:
+                self._blocks.setdefault(key, []).append(block)
+        self._count = len(live) - len(drop)
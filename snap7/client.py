@@ -6,14 +6,15 @@ use ``s7.Client`` instead, which supports all PLC models and
 automatically selects the best protocol.
 """
 
-import copy
 import logging
 import random
 import struct
 import sys
 import threading
 import time
-from typing import List, Any, Optional, Tuple, Union, Callable, cast
+from collections import OrderedDict
+from functools import partial
+from typing import List, Any, Optional, Sequence, Tuple, TypeVar, Union, Callable, cast
 from datetime import datetime
 from ctypes import (
     c_int,
@@ -21,13 +22,19 @@ from ctypes import (
     memmove,
 )
 
+from .cache import ReadCache
 from .connection import ISOTCPConnection
-from .s7protocol import S7Protocol, get_return_code_description
-from .datatypes import S7WordLen
+from .s7protocol import RequestTemplate, S7Protocol, get_return_code_description
+from .datatypes import S7Area, S7WordLen
 from .error import S7Error, S7ConnectionError, S7ProtocolError, S7StalePacketError, S7TimeoutError
-from .client_base import ClientMixin
+from .client_base import ClientMixin, _OptimizationPlan
 from .log import PLCLoggerAdapter, OperationLogger
-from .optimizer import ReadItem, ReadPacket, sort_items, merge_items, packetize, extract_results
+from .metrics import ClientMetrics, track
+from .optimizer import (
+    ReadPacket,
+    WriteItem,
+    packetize_writes,
+)
 from .tags import Tag, _STRING_RE
 from . import util
 
@@ -234,6 +241,75 @@ def _encode_scalar(datatype: str, buf: bytearray, offset: int, value: Any, bit:
     raise ValueError(f"Unsupported tag datatype: {datatype}")
 
 
+def _resolve_tag(tag: "Union[Tag, str]") -> Tag:
+    """Parse an address string and reject symbolic tags, which need S7CommPlus."""
+    resolved = Tag.from_string(tag) if isinstance(tag, str) else tag
+    if resolved.is_symbolic:
+        raise NotImplementedError("Symbolic (LID-based) tag access requires S7CommPlus. Use s7.Client instead of snap7.Client.")
+    return resolved
+
+
+def _tag_read_items(tags: "Sequence[Union[Tag, str]]") -> Tuple[List[Tag], List[dict[str, Any]]]:
+    """Resolve *tags* and build the ``read_multi_vars`` item for each."""
+    resolved = [Tag.from_string(t) if isinstance(t, str) else t for t in tags]
+    items = [
+        {"area": Area(t.area), "db_number": t.db_number, "start": t.byte_offset, "size": t.size, "bit": t.bit} for t in resolved
+    ]
+    return resolved, items
+
+
+def _tag_write_items(tags: "Sequence[Union[Tag, str]]", values: Sequence[Any], encoding: str) -> List[dict[str, Any]]:
+    """Encode tag values into ``write_multi_vars`` items.
+
+    A single BOOL tag becomes an S7 BIT write, so the PLC changes that bit
+    alone: no read of the byte is needed, and bits the PLC program changes
+    in the meantime are left as they are.
+    """
+    items: List[dict[str, Any]] = []
+    for tag, value in zip(tags, values):
+        resolved = _resolve_tag(tag)
+        if resolved.datatype.upper() == "BOOL" and resolved.count == 1:
+            items.append(
+                {
+                    "area": Area(resolved.area),
+                    "db_number": resolved.db_number,
+                    "start": resolved.byte_offset * 8 + resolved.bit,
+                    "data": bytearray([1 if value else 0]),
+                    "word_len": WordLen.Bit,
+                }
+            )
+            continue
+        buf = bytearray(resolved.size)
+        _encode_tag(resolved, buf, value, encoding=encoding)
+        items.append({"area": Area(resolved.area), "db_number": resolved.db_number, "start": resolved.byte_offset, "data": buf})
+    return items
+
+
+class _InflightRead:
+    """A coalesced byte read on the wire, which other threads can wait for.
+
+    Attributes:
+        key: ``(area, db_number)`` read from.
+        start: First byte read.
+        end: Byte after the last byte read.
+        followers: Number of threads waiting for the result.
+        done: Set once the read has finished.
+        data: The bytes read, filled in only if there are followers.
+        error: The exception the read failed with, if any.
+    """
+
+    __slots__ = ("key", "start", "end", "followers", "done", "data", "error")
+
+    def __init__(self, key: Tuple[S7Area, int], start: int, end: int) -> None:
+        self.key = key
+        self.start = start
+        self.end = end
+        self.followers = 0
+        self.done = threading.Event()
+        self.data = b""
+        self.error: Optional[BaseException] = None
+
+
 def _parse_force_szl(raw: bytes) -> list[ForceEntry]:
     """Parse SZL 0x0025 (force table) data into :class:`ForceEntry` items.
 
@@ -259,13 +335,15 @@ def _parse_force_szl(raw: bytes) -> list[ForceEntry]:
     return entries
 
 
-class _OptimizationPlan:
-    """Cached optimization plan for repeated read_multi_vars calls with the same layout."""
+_T = TypeVar("_T")
+
+# A request is either a freshly built S7 PDU or a compiled, framed template
+_Request = Union[bytes, RequestTemplate]
+
 
-    def __init__(self, cache_key: tuple[int, ...], packets: list[ReadPacket], read_items: list[ReadItem]):
-        self.cache_key = cache_key
-        self.packets = packets
-        self.read_items = read_items
+def _compile_request(pdu: bytes) -> RequestTemplate:
+    """Compile an S7 PDU into a framed template for repeated sends."""
+    return RequestTemplate(ISOTCPConnection.frame_data(pdu), ISOTCPConnection.FRAME_HEADER_SIZE)
 
 
 class Client(ClientMixin):
@@ -284,7 +362,7 @@ class Client(ClientMixin):
         >>> client.disconnect()
     """
 
-    MAX_VARS = 20  # Max variables per multi-read/multi-write request
+    MAX_REQUEST_TEMPLATES = 64  # Compiled read_area requests kept for reuse
 
     def __init__(
         self,
@@ -298,6 +376,8 @@ class Client(ClientMixin):
         heartbeat_interval: float = 0,
         on_disconnect: Optional[Callable[[], None]] = None,
         on_reconnect: Optional[Callable[[], None]] = None,
+        coalesce_reads: bool = False,
+        read_cache: Optional[ReadCache] = None,
         **kwargs: Any,
     ):
         """
@@ -313,6 +393,10 @@ class Client(ClientMixin):
             heartbeat_interval: Interval in seconds for heartbeat probes (0=disabled).
             on_disconnect: Optional callback invoked when connection is lost.
             on_reconnect: Optional callback invoked after successful reconnection.
+            coalesce_reads: Let concurrent byte reads from several threads share
+                one request when a read in progress covers the requested range.
+            read_cache: Optional :class:`~snap7.cache.ReadCache` that answers
+                byte reads of recently read ranges without a PLC round trip.
             **kwargs: Ignored. Kept for backwards compatibility.
         """
         self.connection: Optional[ISOTCPConnection] = None
@@ -323,6 +407,8 @@ class Client(ClientMixin):
         self.rack = 0
         self.slot = 0
         self.pdu_length = 480  # Negotiated PDU length
+        self.max_amq_caller = 1  # Negotiated outstanding jobs we may have in flight
+        self.max_amq_callee = 1
 
         # Connection parameters
         self.local_tsap = 0x0100  # Default local TSAP
@@ -349,10 +435,9 @@ class Client(ClientMixin):
             Parameter.PDURequest: 480,
         }
 
-        # Multi-read optimizer state
-        self._opt_plan: Optional[_OptimizationPlan] = None
-        self.multi_read_max_gap: int = 5
-        self.use_optimizer: bool = True
+        # Compiled read_area requests, least recently used first
+        self._read_templates: OrderedDict[tuple[int, int, int, int, int], RequestTemplate] = OrderedDict()
+
         self.max_parallel: int = 1
 
         # Async operation state
@@ -380,6 +465,22 @@ class Client(ClientMixin):
         # Lock for thread safety during reconnection and heartbeat
         self._reconnect_lock = threading.RLock()
 
+        # Multi-read optimizer state, guarded by the same lock
+        self._init_optimizer(self._reconnect_lock)
+
+        # Single-flight read coalescing: byte reads on the wire that other
+        # threads may wait on instead of sending their own
+        self.coalesce_reads = coalesce_reads
+        self._inflight_reads: list[_InflightRead] = []
+        self._inflight_lock = threading.Lock()
+
+        # Read-through cache of recently read byte ranges, off unless given
+        self.read_cache = read_cache
+
+        # Latency histograms and traffic counters, see snap7.metrics
+        self.metrics = ClientMetrics()
+        track(self)
+
         # Structured logger with PLC context (updated on connect)
         self.logger: PLCLoggerAdapter = PLCLoggerAdapter(logger)
 
@@ -402,7 +503,7 @@ class Client(ClientMixin):
             raise S7ConnectionError("Not connected to PLC")
         return self.connection
 
-    def _send_receive(self, request: bytes, max_stale_retries: int = 3) -> dict[str, Any]:
+    def _send_receive(self, request: _Request, max_stale_retries: int = 3) -> dict[str, Any]:
         """Send a request and receive/parse the response with stale packet retry.
 
         Wraps the repeated send_data -> receive_data -> parse_response pattern
@@ -411,7 +512,7 @@ class Client(ClientMixin):
         thread.
 
         Args:
-            request: Complete S7 PDU to send.
+            request: Complete S7 PDU or compiled request to send.
             max_stale_retries: Max times to retry receive on stale packets.
 
         Returns:
@@ -421,27 +522,67 @@ class Client(ClientMixin):
             S7PacketLostError: If a packet loss is detected.
             S7ProtocolError: If all retries are exhausted or other protocol error.
         """
+        return self._exchange(request, self._decode_response, max_stale_retries)
+
+    def _send_receive_read(self, request: _Request, max_stale_retries: int = 3) -> memoryview:
+        """Send a single-item read request and return the reply payload.
+
+        Same as :meth:`_send_receive`, but the reply is decoded with the
+        allocation-free :meth:`S7Protocol.parse_read_reply` fast path.
+
+        Returns:
+            View of the read payload inside the received PDU.
+        """
+        return self._exchange(request, self.protocol.parse_read_reply, max_stale_retries)
+
+    def _decode_response(self, pdu: bytes) -> Tuple[int, dict[str, Any]]:
+        """Full response decoder for :meth:`_exchange`."""
+        response = self.protocol.parse_response(pdu)
+        return response["sequence"], response
+
+    def _exchange(self, request: _Request, decode: Callable[[bytes], Tuple[int, _T]], max_stale_retries: int = 3) -> _T:
+        """Send a request and receive/decode its reply with stale packet retry.
+
+        Args:
+            request: Complete S7 PDU or compiled request to send.
+            decode: Decodes a reply PDU into ``(sequence, result)``.
+            max_stale_retries: Max times to retry receive on stale packets.
+
+        Returns:
+            The decoded result of the matching reply.
+        """
         conn = self._get_connection()
 
         with self._reconnect_lock:
-            conn.send_data(request)
+            sent_at = time.perf_counter()
+            self._transmit(conn, request)
 
             for attempt in range(max_stale_retries + 1):
                 response_data = conn.receive_data()
-                response = self.protocol.parse_response(response_data)
+                sequence, result = decode(response_data)
 
                 try:
-                    self.protocol.validate_pdu_reference(response["sequence"])
-                    return response
+                    self.protocol.validate_pdu_reference(sequence)
+                    request_size = (
+                        len(request.frame)
+                        if isinstance(request, RequestTemplate)
+                        else len(request) + ISOTCPConnection.FRAME_HEADER_SIZE
+                    )
+                    self._cost_estimator.add_sample(
+                        request_size + len(response_data) + ISOTCPConnection.FRAME_HEADER_SIZE,
+                        time.perf_counter() - sent_at,
+                    )
+                    return result
                 except S7StalePacketError:
                     if attempt < max_stale_retries:
+                        self.metrics.count_stale_retry()
                         logger.warning(f"Stale packet (attempt {attempt + 1}/{max_stale_retries}), retrying receive")
                         continue
                     raise S7ProtocolError(f"Max stale packet retries ({max_stale_retries}) exceeded")
 
         raise S7ProtocolError("Failed to receive valid response")  # Should not reach here
 
-    def _send_receive_with_reconnect(self, request_builder: Callable[[], bytes], max_stale_retries: int = 3) -> dict[str, Any]:
+    def _send_receive_with_reconnect(self, request_builder: Callable[[], _Request], max_stale_retries: int = 3) -> dict[str, Any]:
         """Send a request with automatic reconnection on connection loss.
 
         If auto_reconnect is disabled, behaves identically to _send_receive.
@@ -456,14 +597,67 @@ class Client(ClientMixin):
         Returns:
             Parsed S7 response dict.
         """
+        return self._with_reconnect(request_builder, partial(self._send_receive, max_stale_retries=max_stale_retries))
+
+    def _with_reconnect(self, request_builder: Callable[[], _Request], exchange: Callable[[_Request], _T]) -> _T:
+        """Run *exchange* on a freshly built request, reconnecting and retrying once on connection loss."""
         try:
-            return self._send_receive(request_builder(), max_stale_retries)
+            return exchange(request_builder())
         except (S7ConnectionError, OSError) as e:
             if not self._auto_reconnect:
                 raise
             logger.warning(f"Connection lost during operation: {e}")
             self._do_reconnect()
-            return self._send_receive(request_builder(), max_stale_retries)
+            return exchange(request_builder())
+
+    def _transmit(self, conn: ISOTCPConnection, request: _Request) -> None:
+        """Send one request.
+
+        Compiled requests get their sequence number here, right before they
+        go on the wire, so the caller must hold ``_reconnect_lock``.
+        """
+        if isinstance(request, RequestTemplate):
+            conn.send_frame(self.protocol.stamp_request(request))
+        else:
+            conn.send_data(request)
+
+    def _transmit_batch(self, conn: ISOTCPConnection, requests: Sequence[_Request]) -> None:
+        """Send several requests with one system call; see :meth:`_transmit`."""
+        if len(requests) <= 1:
+            for request in requests:
+                self._transmit(conn, request)
+            return
+        pdus: list[Union[bytes, memoryview]] = []
+        for request in requests:
+            if isinstance(request, RequestTemplate):
+                self.protocol.stamp_request(request)
+                pdus.append(request.pdu)
+            else:
+                pdus.append(request)
+        conn.send_batch(pdus)
+
+    def _read_template(self, s7_area: S7Area, db_number: int, start: int, s7_word_len: S7WordLen, count: int) -> RequestTemplate:
+        """Compiled read request for an address range, reused across calls.
+
+        The most recently used :attr:`MAX_REQUEST_TEMPLATES` requests are
+        kept, so a poller reading the same ranges never encodes them again.
+        """
+        key = (s7_area, db_number, start, s7_word_len, count)
+        with self._reconnect_lock:
+            template = self._read_templates.get(key)
+            if template is not None:
+                self._read_templates.move_to_end(key)
+                return template
+
+            template = _compile_request(
+                self.protocol.build_read_request(
+                    area=s7_area, db_number=db_number, start=start, word_len=s7_word_len, count=count
+                )
+            )
+            self._read_templates[key] = template
+            if len(self._read_templates) > self.MAX_REQUEST_TEMPLATES:
+                self._read_templates.popitem(last=False)
+            return template
 
     def _do_reconnect(self) -> None:
         """Perform reconnection with exponential backoff and jitter.
@@ -507,6 +701,7 @@ class Client(ClientMixin):
                     self.connection = ISOTCPConnection(
                         host=self.host, port=self.port, local_tsap=self.local_tsap, remote_tsap=self.remote_tsap
                     )
+                    self.connection.metrics = self.metrics
                     self.connection.connect()
 
                     # Re-create protocol to reset sequence counters
@@ -515,6 +710,7 @@ class Client(ClientMixin):
 
                     self.connected = True
                     self._is_alive = True
+                    self.metrics.count_reconnect()
                     logger.info(f"Reconnected to {self.host}:{self.port}")
 
                     if self._on_reconnect is not None:
@@ -578,6 +774,7 @@ class Client(ClientMixin):
                         self._is_alive = True
             except Exception as e:
                 logger.warning(f"Heartbeat probe failed: {e}")
+                self.metrics.count_heartbeat_failure()
                 self._is_alive = False
                 self.connected = False
 
@@ -611,12 +808,13 @@ class Client(ClientMixin):
         self.remote_tsap = (self.connection_type << 8) | (rack << 5) | slot
 
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             # Establish ISO on TCP connection
             self.connection = ISOTCPConnection(
                 host=address, port=tcp_port, local_tsap=self.local_tsap, remote_tsap=self.remote_tsap
             )
+            self.connection.metrics = self.metrics
 
             self.connection.connect()
 
@@ -625,14 +823,14 @@ class Client(ClientMixin):
 
             self.connected = True
             self._is_alive = True
-            self._exec_time = int((time.time() - start_time) * 1000)
+            self._record_time("connect", start_time)
             self.logger.update_context(plc_host=address, rack=rack, slot=slot, protocol="legacy")
             self.logger.info(f"Connected to {address}:{tcp_port} rack {rack} slot {slot}")
 
             # Start heartbeat if configured
             self._start_heartbeat()
 
-            # Auto-tune parallel dispatch based on PDU size
+            # Auto-tune parallel dispatch based on the negotiated AMQ
             if self.use_optimizer:
                 self._auto_tune_parallel()
 
@@ -688,7 +886,7 @@ class Client(ClientMixin):
         self.remote_tsap = (self.connection_type << 8) | (router_rack << 5) | router_slot
 
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             self.connection = ISOTCPConnection(
                 host=host,
@@ -696,6 +894,7 @@ class Client(ClientMixin):
                 local_tsap=self.local_tsap,
                 remote_tsap=self.remote_tsap,
             )
+            self.connection.metrics = self.metrics
             self.connection.set_routing(subnet, dest_rack, dest_slot)
             self.connection.connect(timeout=timeout)
 
@@ -703,7 +902,7 @@ class Client(ClientMixin):
             self._setup_communication()
 
             self.connected = True
-            self._exec_time = int((time.time() - start_time) * 1000)
+            self._record_time("connect", start_time)
             logger.info(
                 f"Connected (routed) to {host}:{port} via rack {router_rack} slot {router_slot}, "
                 f"subnet {subnet:#06x} -> rack {dest_rack} slot {dest_slot}"
@@ -732,7 +931,9 @@ class Client(ClientMixin):
 
         self.connected = False
         self._is_alive = False
-        self._opt_plan = None
+        self._opt_plans.clear()
+        if self.read_cache is not None:
+            self.read_cache.clear()
         logger.info(f"Disconnected from {self.host}:{self.port}")
         return 0
 
@@ -831,11 +1032,7 @@ class Client(ClientMixin):
             client.read_tag(Tag(Area.DB, 1, 0, "REAL"))   # from Tag instance
             client.read_tag("DB1:34:STRING[10]", encoding="gbk")  # Chinese string
         """
-        resolved = Tag.from_string(tag) if isinstance(tag, str) else tag
-        if resolved.is_symbolic:
-            raise NotImplementedError(
-                "Symbolic (LID-based) tag access requires S7CommPlus. Use s7.Client instead of snap7.Client."
-            )
+        resolved = _resolve_tag(tag)
         data = self.read_area(Area(resolved.area), resolved.db_number, resolved.byte_offset, resolved.size)
         return _decode_tag(resolved, bytearray(data), encoding=encoding)
 
@@ -850,25 +1047,50 @@ class Client(ClientMixin):
         Returns:
             0 on success.
         """
-        resolved = Tag.from_string(tag) if isinstance(tag, str) else tag
-        if resolved.is_symbolic:
-            raise NotImplementedError(
-                "Symbolic (LID-based) tag access requires S7CommPlus. Use s7.Client instead of snap7.Client."
-            )
-        size = resolved.size
-        buf = bytearray(size)
-        # For BOOL writes, we need the current byte to preserve other bits
-        if resolved.datatype.upper() == "BOOL":
-            current = self.read_area(Area(resolved.area), resolved.db_number, resolved.byte_offset, 1)
-            buf[0] = current[0]
+        resolved = _resolve_tag(tag)
+        if resolved.datatype.upper() == "BOOL" and resolved.count == 1:
+            # A bit write leaves the other bits of the byte alone without reading it first
+            return self.write_tags([resolved], [value])
+
+        buf = bytearray(resolved.size)
         _encode_tag(resolved, buf, value, encoding=encoding)
         return self.write_area(Area(resolved.area), resolved.db_number, resolved.byte_offset, buf)
 
+    def write_tags(self, tags: "list[Union[Tag, str]]", values: list[Any], encoding: str = "latin-1") -> int:
+        """Write multiple tags in as few requests as possible.
+
+        Values are packed into multi-item write requests.  Each BOOL tag is
+        written as a single bit, an item of its own in the same requests, so
+        no byte is read first and other bits of the byte are left alone.
+        There is no limit on the number of tags.
+
+        Args:
+            tags: List of :class:`~snap7.tags.Tag` instances or address strings.
+            values: Values to write, one per tag.
+            encoding: Character encoding for STRING/FSTRING values (default ``"latin-1"``).
+
+        Returns:
+            0 on success.
+
+        Raises:
+            ValueError: If *tags* and *values* differ in length.
+            S7ProtocolError: If any item failed; every failed item is listed
+                with its return code.
+        """
+        if len(tags) != len(values):
+            raise ValueError(f"Got {len(values)} values for {len(tags)} tags")
+
+        items = _tag_write_items(tags, values, encoding)
+        if items:
+            self._check_write_results(self._write_multi_items(self._build_write_items(items)))
+        return 0
+
     def read_tags(self, tags: "list[Union[Tag, str]]", encoding: str = "latin-1") -> list[Any]:
         """Read multiple tags in a single optimized request.
 
         Uses the multi-variable read optimizer when available to batch
-        reads into minimal PDU exchanges.
+        reads into minimal PDU exchanges.  There is no limit on the number
+        of tags; they are spread over as many PDUs as needed.
 
         Args:
             tags: List of :class:`~snap7.tags.Tag` instances or address strings.
@@ -877,8 +1099,7 @@ class Client(ClientMixin):
         Returns:
             List of decoded values in the same order as input.
         """
-        resolved = [Tag.from_string(t) if isinstance(t, str) else t for t in tags]
-        items = [{"area": Area(t.area), "db_number": t.db_number, "start": t.byte_offset, "size": t.size} for t in resolved]
+        resolved, items = _tag_read_items(tags)
         _code, data_list = self.read_multi_vars(items)
         return [_decode_tag(t, bytearray(d), encoding=encoding) for t, d in zip(resolved, data_list)]
 
@@ -898,6 +1119,22 @@ class Client(ClientMixin):
             data = self.read_area(Area.DB, db_number, start, size)
         return data
 
+    def db_read_into(self, db_number: int, start: int, buf: Union[bytearray, memoryview]) -> int:
+        """
+        Read data from DB straight into a caller-owned buffer.
+
+        Args:
+            db_number: DB number to read from
+            start: Start byte offset
+            buf: Writable buffer; ``len(buf)`` bytes are read
+
+        Returns:
+            Number of bytes written into *buf*
+        """
+        with OperationLogger(self.logger, "db_read_into", db=db_number, start=start, size=len(buf)):
+            written = self.read_area_into(Area.DB, db_number, start, buf)
+        return written
+
     def db_write(self, db_number: int, start: int, data: bytearray) -> int:
         """
         Write data to DB.
@@ -992,55 +1229,131 @@ class Client(ClientMixin):
         Returns:
             Data read from area
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        s7_word_len = self._area_word_len(area, word_len)
+        payloads = self._read_area_payloads(self._map_area(area), db_number, start, size, s7_word_len)
+        self._record_time("read_area", start_time)
+        return bytearray(payloads[0]) if len(payloads) == 1 else bytearray(b"".join(payloads))
 
-        # Map area enum to native area
-        s7_area = self._map_area(area)
+    def read_area_into(
+        self, area: Area, db_number: int, start: int, buf: Union[bytearray, memoryview], word_len: Optional[WordLen] = None
+    ) -> int:
+        """
+        Read data from memory area straight into a caller-owned buffer.
 
-        # Determine word length
-        if word_len is not None:
-            s7_word_len = S7WordLen(word_len)
-        elif area == Area.TM:
-            s7_word_len = S7WordLen.TIMER
-        elif area == Area.CT:
-            s7_word_len = S7WordLen.COUNTER
-        else:
-            s7_word_len = S7WordLen.BYTE
+        Like :meth:`read_area`, but the number of items follows from the size
+        of *buf* and each reply payload is copied directly into it, so a
+        cyclic poller can reuse one preallocated buffer instead of
+        allocating a new one per read.
+
+        Args:
+            area: Memory area to read from
+            db_number: DB number (for DB area only)
+            start: Start address
+            buf: Writable buffer (bytearray, memoryview, ctypes array, ...)
+                whose whole length is filled
+            word_len: Optional word length override, as for :meth:`read_area`.
 
+        Returns:
+            Number of bytes written into *buf*
+
+        Raises:
+            TypeError: If *buf* is read-only
+            S7ProtocolError: If the PLC returns more or fewer bytes than *buf* holds
+        """
+        start_time = time.perf_counter()
+        s7_word_len = self._area_word_len(area, word_len)
+        view, count = self._writable_view(buf, s7_word_len)
+        payloads = self._read_area_payloads(self._map_area(area), db_number, start, count, s7_word_len)
+        written = self._copy_payloads(view, payloads)
+        self._record_time("read_area", start_time)
+        return written
+
+    def _read_area_payloads(
+        self, s7_area: S7Area, db_number: int, start: int, size: int, s7_word_len: S7WordLen
+    ) -> List[memoryview]:
+        """Read an area in PDU-sized chunks, through the read cache and coalesced with concurrent reads if enabled.
+
+        Returns:
+            A view of each chunk's reply payload, in address order.
+        """
+        if s7_word_len != S7WordLen.BYTE:
+            return self._read_area_wire(s7_area, db_number, start, size, s7_word_len)
+        cache = self.read_cache
+        if cache is None or cache.ttl_for(s7_area) <= 0:
+            return self._read_area_bytes(s7_area, db_number, start, size)
+
+        cached = cache.get(s7_area, db_number, start, size)
+        if cached is not None:
+            return [cached]
+        generation = cache.generation
+        payloads = self._read_area_bytes(s7_area, db_number, start, size)
+        cache.put(s7_area, db_number, start, payloads[0] if len(payloads) == 1 else b"".join(payloads), generation)
+        return payloads
+
+    def _read_area_bytes(self, s7_area: S7Area, db_number: int, start: int, size: int) -> List[memoryview]:
+        """Byte read from the PLC, coalesced with concurrent reads if enabled."""
+        if self.coalesce_reads:
+            return self._read_area_coalesced(s7_area, db_number, start, size)
+        return self._read_area_wire(s7_area, db_number, start, size, S7WordLen.BYTE)
+
+    def _read_area_coalesced(self, s7_area: S7Area, db_number: int, start: int, size: int) -> List[memoryview]:
+        """Byte read that waits for a read in progress covering the same range instead of sending its own.
+
+        The first thread to ask for a range reads it from the PLC.  Threads
+        asking for the same bytes, or a sub-range, while that read is in
+        progress wait for it and are served a slice of its result; if it
+        fails, they fail with the same error.
+        """
+        key = (s7_area, db_number)
+        end = start + size
+        with self._inflight_lock:
+            flight = next((f for f in self._inflight_reads if f.key == key and f.start <= start and end <= f.end), None)
+            if flight is None:
+                own = _InflightRead(key, start, end)
+                self._inflight_reads.append(own)
+            else:
+                flight.followers += 1
+
+        if flight is not None:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return [memoryview(flight.data)[start - flight.start : end - flight.start]]
+
+        try:
+            payloads = self._read_area_wire(s7_area, db_number, start, size, S7WordLen.BYTE)
+        except BaseException as e:
+            own.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight_reads.remove(own)
+            # No follower can join any more; copy the result only if someone waits for it
+            if own.followers and own.error is None:
+                own.data = bytes(payloads[0]) if len(payloads) == 1 else b"".join(payloads)
+            own.done.set()
+        return payloads
+
+    def _read_area_wire(self, s7_area: S7Area, db_number: int, start: int, size: int, s7_word_len: S7WordLen) -> List[memoryview]:
+        """Read an area from the PLC in PDU-sized chunks."""
         max_chunk = self._max_read_size()
         if size <= max_chunk:
             # Single request - use reconnect-aware send/receive
-            def build_request() -> bytes:
-                return self.protocol.build_read_request(
-                    area=s7_area, db_number=db_number, start=start, word_len=s7_word_len, count=size
-                )
-
-            response = self._send_receive_with_reconnect(build_request)
-            values = self.protocol.extract_read_data(response, s7_word_len, size)
-            self._exec_time = int((time.time() - start_time) * 1000)
-            return bytearray(values)
+            build_request = partial(self._read_template, s7_area, db_number, start, s7_word_len, size)
+            return [self._with_reconnect(build_request, self._send_receive_read)]
 
         # Split into chunks
-        result = bytearray()
-        offset = 0
-        remaining = size
-        while remaining > 0:
-            chunk_size = min(remaining, max_chunk)
-            chunk_offset = offset
-
-            def build_chunk_request(o: int = chunk_offset, cs: int = chunk_size) -> bytes:
-                return self.protocol.build_read_request(
-                    area=s7_area, db_number=db_number, start=start + o, word_len=s7_word_len, count=cs
-                )
+        builders = [
+            partial(self._read_template, s7_area, db_number, start + offset, s7_word_len, min(size - offset, max_chunk))
+            for offset in range(0, size, max_chunk)
+        ]
 
-            response = self._send_receive_with_reconnect(build_chunk_request)
-            values = self.protocol.extract_read_data(response, s7_word_len, chunk_size)
-            result.extend(values)
-            offset += chunk_size
-            remaining -= chunk_size
+        if self._pipeline_depth() > 1:
+            # Pipelined: keep several chunk requests in flight at once
+            return self._pipeline_with_reconnect(builders, self.protocol.parse_read_reply, self._send_receive_read)
 
-        self._exec_time = int((time.time() - start_time) * 1000)
-        return result
+        return [self._with_reconnect(build_chunk_request, self._send_receive_read) for build_chunk_request in builders]
 
     def write_area(self, area: Area, db_number: int, start: int, data: bytearray, word_len: Optional[WordLen] = None) -> int:
         """
@@ -1059,7 +1372,7 @@ class Client(ClientMixin):
         Returns:
             0 on success
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Map area enum to native area
         s7_area = self._map_area(area)
@@ -1074,6 +1387,17 @@ class Client(ClientMixin):
         else:
             s7_word_len = S7WordLen.BYTE
 
+        try:
+            self._write_area_wire(s7_area, db_number, start, data, s7_word_len)
+        finally:
+            # Also after a failure: some chunks may have been written
+            if self.read_cache is not None:
+                self.read_cache.invalidate(s7_area, db_number, start, len(data))
+        self._record_time("write_area", start_time)
+        return 0
+
+    def _write_area_wire(self, s7_area: S7Area, db_number: int, start: int, data: bytearray, s7_word_len: S7WordLen) -> None:
+        """Write an area to the PLC in PDU-sized chunks."""
         max_chunk = self._max_write_size()
         if len(data) <= max_chunk:
             # Single request
@@ -1084,29 +1408,37 @@ class Client(ClientMixin):
 
             response = self._send_receive_with_reconnect(build_request)
             self.protocol.check_write_response(response)
-            self._exec_time = int((time.time() - start_time) * 1000)
-            return 0
+            return
 
         # Split into chunks
-        offset = 0
-        remaining = len(data)
-        while remaining > 0:
-            chunk_size = min(remaining, max_chunk)
-            chunk_data = data[offset : offset + chunk_size]
-            chunk_offset = offset
+        chunks = [(offset, bytes(data[offset : offset + max_chunk])) for offset in range(0, len(data), max_chunk)]
+
+        if self._pipeline_depth() > 1:
+            # Pipelined: keep several chunk requests in flight at once
+            builders = [
+                partial(
+                    self.protocol.build_write_request,
+                    area=s7_area,
+                    db_number=db_number,
+                    start=start + chunk_offset,
+                    word_len=s7_word_len,
+                    data=chunk_data,
+                )
+                for chunk_offset, chunk_data in chunks
+            ]
+            for response in self._send_receive_pipelined_with_reconnect(builders):
+                self.protocol.check_write_response(response)
+            return
+
+        for chunk_offset, chunk_data in chunks:
 
-            def build_chunk_request(o: int = chunk_offset, cd: bytes = bytes(chunk_data)) -> bytes:
+            def build_chunk_request(o: int = chunk_offset, cd: bytes = chunk_data) -> bytes:
                 return self.protocol.build_write_request(
                     area=s7_area, db_number=db_number, start=start + o, word_len=s7_word_len, data=cd
                 )
 
             response = self._send_receive_with_reconnect(build_chunk_request)
             self.protocol.check_write_response(response)
-            offset += chunk_size
-            remaining -= chunk_size
-
-        self._exec_time = int((time.time() - start_time) * 1000)
-        return 0
 
     def read_multi_vars(self, items: Union[List[dict[str, Any]], "Array[S7DataItem]"]) -> Tuple[int, Any]:
         """Read multiple variables in a single request.
@@ -1122,6 +1454,9 @@ class Client(ClientMixin):
            versions. Disable it with ``client.use_optimizer = False`` if you
            encounter issues.
 
+        Any number of items is accepted: the optimizer splits them into as
+        many PDUs as needed, with at most ``MAX_VARS`` address specs each.
+
         Args:
             items: List of item specifications (dicts with ``area``, ``start``,
                 ``size``, and optionally ``db_number``) **or** a ctypes
@@ -1130,16 +1465,10 @@ class Client(ClientMixin):
         Returns:
             Tuple of (result_code, data) where *data* is either the updated
             ctypes array or a list of bytearrays in the original item order.
-
-        Raises:
-            ValueError: If more than MAX_VARS items are requested.
         """
         if not items:
             return (0, items)
 
-        if len(items) > self.MAX_VARS:
-            raise ValueError(f"Too many items: {len(items)} exceeds MAX_VARS ({self.MAX_VARS})")
-
         # Handle S7DataItem array (ctypes) -- unchanged legacy path
         if hasattr(items, "_type_") and hasattr(items[0], "Area"):
             s7_items = cast("Array[S7DataItem]", items)
@@ -1171,84 +1500,153 @@ class Client(ClientMixin):
 
         return self._read_multi_vars_optimized(dict_items)
 
-    # PDU size → max_parallel mapping.  Smaller PDUs indicate older/smaller
-    # PLCs with fewer resources, so we stay sequential for safety.
-    _PARALLEL_THRESHOLDS: list[Tuple[int, int]] = [
-        (960, 8),
-        (480, 4),
-        (240, 2),
-    ]
-
     def _auto_tune_parallel(self) -> None:
-        """Set *max_parallel* based on negotiated PDU size.
+        """Set *max_parallel* to the AMQ depth negotiated with the PLC.
 
         Called automatically after :meth:`connect` when the optimizer is
-        enabled.  Larger PDU sizes indicate more capable PLCs that can
-        handle multiple in-flight requests.
+        enabled.  The PLC reports how many outstanding jobs it accepts in
+        its setup communication reply (``max_amq_caller``), which is the
+        maximum safe number of in-flight requests on this connection.
         """
-        for threshold, parallel in self._PARALLEL_THRESHOLDS:
-            if self.pdu_length >= threshold:
-                self.max_parallel = parallel
-                break
-        else:
-            self.max_parallel = 1
-        logger.info(f"Auto-tuned max_parallel={self.max_parallel} (PDU={self.pdu_length})")
+        self.max_parallel = self.max_amq_caller
+        logger.info(f"Auto-tuned max_parallel={self.max_parallel} (AMQ={self.max_amq_caller}, PDU={self.pdu_length})")
 
-    def _send_receive_parallel(self, requests: list[Tuple[int, bytes]]) -> dict[int, dict[str, Any]]:
-        """Fire multiple S7 requests back-to-back and collect responses by sequence number.
+    def _pipeline_depth(self) -> int:
+        """Number of requests that may be in flight at once on this connection.
 
-        All PDUs are sent on the single TCP connection before reading any
-        responses.  Responses are matched to requests via the S7 sequence
-        number in the header (bytes 4-5).
+        This is *max_parallel*, bounded by the AMQ depth the PLC accepted
+        during setup communication so that a manual override can never
+        overload the CPU's job queue.
+        """
+        return max(1, min(self.max_parallel, self.max_amq_caller))
 
-        .. warning::
+    def _send_receive_pipelined(
+        self, request_builders: Sequence[Callable[[], _Request]], depth: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """Pipelined send/receive returning fully parsed responses; see :meth:`_pipeline`."""
+        return self._pipeline(request_builders, self._decode_response, depth)
+
+    def _pipeline(
+        self,
+        request_builders: Sequence[Callable[[], _Request]],
+        decode: Callable[[bytes], Tuple[int, _T]],
+        depth: Optional[int] = None,
+    ) -> list[_T]:
+        """Send requests with up to *depth* in flight and collect responses by sequence number.
 
-           This method is **experimental** and part of the read optimizer.
+        Keeps a sliding window of outstanding PDUs on the single TCP
+        connection: a new request is sent as soon as a response frees a
+        slot.  Responses are matched to requests via the S7 PDU reference
+        in the header (bytes 4-5), so the PLC may answer out of order.
 
         Args:
-            requests: ``(packet_index, pdu_bytes)`` pairs.
+            request_builders: Callables building each request PDU or
+                returning a compiled request.  Each is called right before
+                its request is sent, so sequence numbers are assigned in
+                send order.
+            decode: Decodes a reply PDU into ``(sequence, result)``.
+            depth: Maximum number of outstanding requests.  Defaults to
+                :meth:`_pipeline_depth`.
 
         Returns:
-            Dict mapping *packet_index* to the parsed response dict.
+            Decoded responses in the same order as *request_builders*.
+
+        If a reply cannot be decoded, or the transfer fails otherwise, the
+        replies still in flight are drained before the error is raised (see
+        :meth:`_drain_pipeline`), so they are not mistaken for the replies
+        of later requests.
         """
         conn = self._get_connection()
+        window = max(1, depth if depth is not None else self._pipeline_depth())
+        responses: dict[int, _T] = {}
 
         with self._reconnect_lock:
-            # Build seq_num → packet_index lookup
+            # seq_num -> request index of outstanding requests
             pending: dict[int, int] = {}
-            for packet_index, pdu in requests:
-                seq = struct.unpack(">H", pdu[4:6])[0]
-                pending[seq] = packet_index
+            next_index = 0
 
-            # Send all requests back-to-back
-            for _, pdu in requests:
-                conn.send_data(pdu)
+            try:
+                while next_index < len(request_builders) or pending:
+                    # Top up the window, sending the new requests together
+                    batch = [
+                        request_builders[index]()
+                        for index in range(next_index, min(len(request_builders), next_index + window - len(pending)))
+                    ]
+                    self._transmit_batch(conn, batch)
+                    for request in batch:
+                        if isinstance(request, RequestTemplate):
+                            seq = request.sequence
+                        else:
+                            seq = struct.unpack(">H", request[4:6])[0]
+                        pending[seq] = next_index
+                        next_index += 1
+
+                    if not conn.data_available(timeout=conn.timeout):
+                        raise S7TimeoutError(f"Timeout waiting for {len(pending)} pipelined response(s)")
+
+                    response_data = conn.receive_data()
+                    resp_seq = struct.unpack(">H", response_data[4:6])[0] if len(response_data) >= 6 else None
+                    if resp_seq in pending:
+                        index = pending.pop(resp_seq)
+                        responses[index] = decode(response_data)[1]
+                    else:
+                        self.metrics.count_stale_retry()
+                        logger.warning(f"Discarding unexpected response with sequence {resp_seq}")
+            except BaseException as e:
+                if pending:
+                    self._drain_pipeline(conn, pending, e)
+                raise
 
-            # Receive responses, matching by sequence number
-            results: dict[int, dict[str, Any]] = {}
-            remaining = len(requests)
-            deadline = time.monotonic() + conn.timeout
+        return [responses[index] for index in range(len(request_builders))]
 
-            while remaining > 0:
-                wait_time = deadline - time.monotonic()
-                if wait_time <= 0:
-                    raise S7TimeoutError(f"Timeout waiting for {remaining} parallel response(s)")
+    def _drain_pipeline(self, conn: ISOTCPConnection, pending: dict[int, int], error: BaseException) -> None:
+        """Discard the replies of requests still in flight after a pipelined transfer failed with *error*.
 
-                if not conn.data_available(timeout=wait_time):
-                    raise S7TimeoutError(f"Timeout waiting for {remaining} parallel response(s)")
+        If the connection itself failed or the replies do not all arrive in
+        time, the connection is closed instead, so that the next call does
+        not read them; with ``auto_reconnect`` it reconnects.
+        """
+        if not isinstance(error, (S7ConnectionError, S7TimeoutError, OSError)):
+            try:
+                while pending:
+                    if not conn.data_available(timeout=conn.timeout):
+                        raise S7TimeoutError(f"Timeout waiting for {len(pending)} pipelined response(s)")
+                    response_data = conn.receive_data()
+                    if len(response_data) >= 6:
+                        pending.pop(struct.unpack(">H", response_data[4:6])[0], None)
+                return
+            except (S7ConnectionError, S7TimeoutError, OSError) as e:
+                error = e
+        logger.warning(f"Closing connection with {len(pending)} pipelined request(s) unanswered: {error}")
+        conn.disconnect()
+        self.connected = False
 
-                response_data = conn.receive_data()
-                response = self.protocol.parse_response(response_data)
-                resp_seq = response["sequence"]
+    def _send_receive_pipelined_with_reconnect(self, request_builders: Sequence[Callable[[], _Request]]) -> list[dict[str, Any]]:
+        """Pipelined send/receive with automatic reconnection on connection loss.
 
-                if resp_seq in pending:
-                    packet_index = pending.pop(resp_seq)
-                    results[packet_index] = response
-                    remaining -= 1
-                else:
-                    logger.warning(f"Discarding unexpected response with sequence {resp_seq}")
+        On connection loss the whole batch is replayed sequentially after
+        reconnecting, since replies to in-flight requests are lost with the
+        old socket.  Reads and writes of fixed data are idempotent, so
+        replaying already-answered requests is safe.
+        """
+        return self._pipeline_with_reconnect(request_builders, self._decode_response, self._send_receive)
 
-        return results
+    def _pipeline_with_reconnect(
+        self,
+        request_builders: Sequence[Callable[[], _Request]],
+        decode: Callable[[bytes], Tuple[int, _T]],
+        exchange: Callable[[_Request], _T],
+    ) -> list[_T]:
+        """Run :meth:`_pipeline`, replaying the batch one request at a time through
+        *exchange* after reconnecting if the connection drops."""
+        try:
+            return self._pipeline(request_builders, decode)
+        except (S7ConnectionError, OSError) as e:
+            if not self._auto_reconnect:
+                raise
+            logger.warning(f"Connection lost during pipelined transfer: {e}")
+            self._do_reconnect()
+            return [self._with_reconnect(builder, exchange) for builder in request_builders]
 
     def _read_multi_vars_optimized(self, dict_items: List[dict[str, Any]]) -> Tuple[int, List[bytearray]]:
         """Optimized multi-variable read using merge + packetize strategy.
@@ -1259,44 +1657,25 @@ class Client(ClientMixin):
         Returns:
             Tuple of (0, list of bytearrays in original order).
         """
-        # Build ReadItem list
-        read_items: list[ReadItem] = []
-        for idx, d in enumerate(dict_items):
-            area_val = int(d["area"])
-            db_number = d.get("db_number", 0)
-            read_items.append(
-                ReadItem(
-                    area=area_val,
-                    db_number=db_number,
-                    byte_offset=d["start"],
-                    bit_offset=0,
-                    byte_length=d["size"],
-                    index=idx,
-                )
-            )
-
-        # Build cache key from the item layout
-        cache_key = tuple(val for ri in read_items for val in (ri.area, ri.db_number, ri.byte_offset, ri.byte_length))
-
-        # Reuse cached plan if layout matches
-        if self._opt_plan is not None and self._opt_plan.cache_key == cache_key:
-            packets = self._opt_plan.packets
-        else:
-            sorted_ri = sort_items(read_items)
-            max_block = self._max_read_size()
-            blocks = merge_items(sorted_ri, max_gap=self.multi_read_max_gap, max_block_size=max_block)
-            packets = packetize(blocks, self.pdu_length)
-            self._opt_plan = _OptimizationPlan(cache_key, packets, read_items)
+        start_time = time.perf_counter()
+        plan = self._optimization_plan(dict_items)
+        results = self._plan_results(plan, self._read_plan(plan))
+        self._record_time("read_multi_vars", start_time)
+        return (0, results)
 
-        # Deep-copy blocks from cached packets so we don't mutate cached state
-        working_packets = copy.deepcopy(packets)
+    def _read_plan(self, plan: _OptimizationPlan) -> list[list[bytearray]]:
+        """Execute the packets of *plan*.
 
-        # Build PDU requests for each packet
-        packet_requests: list[Tuple[int, bytes, ReadPacket]] = []
-        for pkt_idx, packet in enumerate(working_packets):
-            block_specs = [(blk.area, blk.db_number, blk.start_offset, blk.byte_length) for blk in packet.blocks]
+        Returns:
+            The data of every block, one list per packet parallel to
+            ``packet.blocks``.  The plan itself is shared and left untouched.
+        """
+        buffers: list[list[bytearray]] = [[] for _ in plan.packets]
 
-            if len(block_specs) == 1:
+        # Pair each multi-block packet with its compiled request
+        packet_requests: list[Tuple[int, RequestTemplate, ReadPacket]] = []
+        for pkt_idx, (packet, request) in enumerate(zip(plan.packets, plan.requests)):
+            if request is None:
                 # Single block: use regular read to avoid multi-read overhead
                 blk = packet.blocks[0]
                 data = self.read_area(
@@ -1305,112 +1684,139 @@ class Client(ClientMixin):
                     blk.start_offset,
                     blk.byte_length,
                 )
-                blk.buffer = data
+                buffers[pkt_idx] = [data]
             else:
-                request = self.protocol.build_multi_read_request(block_specs)
                 packet_requests.append((pkt_idx, request, packet))
 
         # Execute multi-block packets
         if packet_requests:
             if self.max_parallel > 1 and len(packet_requests) > 1:
-                self._execute_packets_parallel(packet_requests)
+                self._execute_packets_parallel(packet_requests, buffers)
             else:
-                self._execute_packets_sequential(packet_requests)
-
-        # Extract per-item results in original order
-        results = extract_results(working_packets, len(dict_items))
-        return (0, results)
-
-    def _execute_packets_sequential(self, packet_requests: list[Tuple[int, bytes, ReadPacket]]) -> None:
-        """Execute multi-block packets one at a time."""
-        for _, _request, packet in packet_requests:
-            block_specs = [(blk.area, blk.db_number, blk.start_offset, blk.byte_length) for blk in packet.blocks]
-
-            def build_request(specs: list[tuple[int, int, int, int]] = block_specs) -> bytes:
-                return self.protocol.build_multi_read_request(specs)
-
-            response = self._send_receive_with_reconnect(build_request)
-            block_data_list = self.protocol.extract_multi_read_data(response, len(packet.blocks))
-            for blk, buf in zip(packet.blocks, block_data_list):
-                blk.buffer = buf
-
-    def _execute_packets_parallel(self, packet_requests: list[Tuple[int, bytes, ReadPacket]]) -> None:
+                self._execute_packets_sequential(packet_requests, buffers)
+        return buffers
+
+    def _compile_plan_request(self, pdu: bytes) -> RequestTemplate:
+        """Compile a multi-read PDU of a plan, framing included."""
+        return _compile_request(pdu)
+
+    def _execute_packets_sequential(
+        self, packet_requests: list[Tuple[int, RequestTemplate, ReadPacket]], buffers: list[list[bytearray]]
+    ) -> None:
+        """Execute multi-block packets one at a time, storing block data in *buffers*."""
+        for pkt_idx, request, packet in packet_requests:
+            response = self._send_receive_with_reconnect(request.copy)
+            buffers[pkt_idx] = self.protocol.extract_multi_read_data(response, len(packet.blocks))
+
+    def _execute_packets_parallel(
+        self, packet_requests: list[Tuple[int, RequestTemplate, ReadPacket]], buffers: list[list[bytearray]]
+    ) -> None:
         """Execute multi-block packets using parallel dispatch.
 
-        Sends up to *max_parallel* PDUs back-to-back before reading
-        responses, reducing round-trip overhead.  Falls back to
+        Keeps up to *max_parallel* PDUs in flight, sending the next one as
+        soon as a response arrives, reducing round-trip overhead.  Falls back to
         sequential reconnect-aware execution on connection loss.
         """
         try:
-            self._execute_packets_parallel_inner(packet_requests)
+            self._execute_packets_parallel_inner(packet_requests, buffers)
         except (S7ConnectionError, OSError) as e:
             if not self._auto_reconnect:
                 raise
             logger.warning(f"Connection lost during parallel read: {e}")
             self._do_reconnect()
-            self._execute_packets_sequential(packet_requests)
+            self._execute_packets_sequential(packet_requests, buffers)
 
-    def _execute_packets_parallel_inner(self, packet_requests: list[Tuple[int, bytes, ReadPacket]]) -> None:
+    def _execute_packets_parallel_inner(
+        self, packet_requests: list[Tuple[int, RequestTemplate, ReadPacket]], buffers: list[list[bytearray]]
+    ) -> None:
         """Inner parallel dispatch without reconnect handling."""
-        for chunk_start in range(0, len(packet_requests), self.max_parallel):
-            chunk = packet_requests[chunk_start : chunk_start + self.max_parallel]
-            requests = [(pkt_idx, pdu) for pkt_idx, pdu, _ in chunk]
-            responses = self._send_receive_parallel(requests)
+        builders = [request.copy for _, request, _ in packet_requests]
+        responses = self._send_receive_pipelined(builders)
 
-            for pkt_idx, _, packet in chunk:
-                response = responses[pkt_idx]
-                block_data_list = self.protocol.extract_multi_read_data(response, len(packet.blocks))
-                for blk, buf in zip(packet.blocks, block_data_list):
-                    blk.buffer = buf
+        for (pkt_idx, _, packet), response in zip(packet_requests, responses):
+            buffers[pkt_idx] = self.protocol.extract_multi_read_data(response, len(packet.blocks))
 
     def write_multi_vars(self, items: Union[List[dict[str, Any]], List[S7DataItem]]) -> int:
         """
-        Write multiple variables in a single request.
+        Write multiple variables in as few requests as possible.
+
+        Items are packed into multi-item WRITE_AREA PDUs that respect the
+        negotiated PDU size, so writing many small values costs one or two
+        round-trips instead of one per item.  Items are never merged, so
+        bytes between them are left untouched.
 
         Args:
-            items: List of item specifications with data
+            items: List of item specifications (dicts with ``area``,
+                ``start``, ``data``, and optionally ``db_number`` and
+                ``word_len``) **or** a list of ``S7DataItem``.
 
         Returns:
-            0 on success
+            0 on success.  For ``S7DataItem`` lists each item's ``Result``
+            is set to 0 or the client error code of its failure.
 
         Raises:
-            ValueError: If more than MAX_VARS items are requested
+            S7ProtocolError: If any dict item failed; every failed item is
+                listed with its return code.
         """
         if not items:
             return 0
 
-        if len(items) > self.MAX_VARS:
-            raise ValueError(f"Too many items: {len(items)} exceeds MAX_VARS ({self.MAX_VARS})")
-
         # Handle S7DataItem list (ctypes)
         if hasattr(items[0], "Area"):
             s7_items = cast(List[S7DataItem], items)
+            dict_items: List[dict[str, Any]] = []
             for s7_item in s7_items:
-                area = Area(s7_item.Area)
-                db_number = s7_item.DBNumber
-                start = s7_item.Start
                 size = s7_item.Amount
-
-                # Extract data from pData
                 data = bytearray(size)
                 if s7_item.pData:
                     for i in range(size):
                         data[i] = s7_item.pData[i]
-
-                self.write_area(area, db_number, start, data)
+                dict_items.append(
+                    {
+                        "area": Area(s7_item.Area),
+                        "db_number": s7_item.DBNumber,
+                        "start": s7_item.Start,
+                        "data": data,
+                    }
+                )
+            results = self._write_multi_items(self._build_write_items(dict_items))
+            for s7_item, code in zip(s7_items, results):
+                s7_item.Result = self._item_result_code(code)
             return 0
 
-        # Handle dict list
-        dict_items = cast(List[dict[str, Any]], items)
-        for dict_item in dict_items:
-            area = dict_item["area"]
-            db_number = dict_item.get("db_number", 0)
-            start = dict_item["start"]
-            data = dict_item["data"]
-            self.write_area(area, db_number, start, data)
-
+        results = self._write_multi_items(self._build_write_items(cast(List[dict[str, Any]], items)))
+        self._check_write_results(results)
         return 0
 
+    def _write_multi_items(self, write_items: List[WriteItem]) -> List[int]:
+        """Send write items as packed multi-item WRITE_AREA requests.
+
+        Returns:
+            One S7 return code per item in *write_items* order (``0xFF`` = success).
+        """
+        start_time = time.perf_counter()
+        packets = packetize_writes(write_items, self.pdu_length, max_items=self.MAX_VARS)
+        builders = [partial(self.protocol.build_multi_write_request, self._write_packet_items(packet)) for packet in packets]
+
+        try:
+            if len(builders) > 1 and self._pipeline_depth() > 1:
+                responses = self._send_receive_pipelined_with_reconnect(builders)
+            else:
+                responses = [self._send_receive_with_reconnect(builder) for builder in builders]
+        finally:
+            if self.read_cache is not None:
+                for item in write_items:
+                    if item.word_len == S7WordLen.BIT:
+                        self.read_cache.invalidate(item.area, item.db_number, item.start >> 3, 1)
+                    else:
+                        self.read_cache.invalidate(item.area, item.db_number, item.start, len(item.data))
+
+        packet_codes = [
+            self.protocol.extract_multi_write_results(response, len(packet.items)) for packet, response in zip(packets, responses)
+        ]
+        self._record_time("write_multi_vars", start_time)
+        return self._fold_write_results(packets, packet_codes, len(write_items))
+
     def list_blocks(self) -> BlocksList:
         """
         List blocks available in PLC.
@@ -2433,11 +2839,7 @@ class Client(ClientMixin):
             bit_offset: Bit offset within the byte (0-7)
             value: Boolean value to write
         """
-        from .util import set_bool
-
-        data = self.db_read(db_number, byte_offset, 1)
-        set_bool(data, 0, bit_offset, value)
-        self.db_write(db_number, byte_offset, data)
+        self.write_tags([Tag(Area.DB, db_number, byte_offset, "BOOL", bit=bit_offset)], [value])
 
     def db_read_byte(self, db_number: int, offset: int) -> int:
         """Read a BYTE (8-bit unsigned) from a DB."""
@@ -2828,21 +3230,12 @@ class Client(ClientMixin):
         return 0
 
     def _setup_communication(self) -> None:
-        """Setup communication and negotiate PDU length."""
-        request = self.protocol.build_setup_communication_request(max_amq_caller=1, max_amq_callee=1, pdu_length=self.pdu_length)
-
+        """Setup communication and negotiate PDU length and AMQ depth."""
+        request = self.protocol.build_setup_communication_request(
+            max_amq_caller=self.AMQ_REQUEST, max_amq_callee=self.AMQ_REQUEST, pdu_length=self.pdu_length
+        )
         response = self._send_receive(request)
-
-        if response.get("parameters"):
-            params = response["parameters"]
-            if "pdu_length" in params:
-                negotiated = params["pdu_length"]
-                if negotiated < 64:
-                    logger.warning(f"Server negotiated implausible PDU length {negotiated}, using minimum 240")
-                    negotiated = 240
-                self.pdu_length = negotiated
-                self._params[Parameter.PDURequest] = self.pdu_length
-                logger.info(f"Negotiated PDU length: {self.pdu_length}")
+        self._apply_setup_communication(response.get("parameters"))
 
     def __enter__(self) -> "Client":
         """Context manager entry."""
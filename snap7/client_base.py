@@ -7,10 +7,31 @@ the two implementations.
 
 import logging
 import struct
-from typing import Optional
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, ContextManager, List, Optional, Sequence, Tuple, Union
 
-from .datatypes import S7Area
+from .datatypes import S7Area, S7DataTypes, S7WordLen
 from .error import S7ProtocolError
+from .metrics import ClientMetrics
+from .optimizer import (
+    CostEstimator,
+    CostModel,
+    PlanParameters,
+    ReadItem,
+    ReadPacket,
+    WriteItem,
+    WritePacket,
+    choose_parameters,
+    coalesce_items,
+    extract_results,
+    gap_bytes,
+    merge_items,
+    packetize,
+    sort_items,
+)
+from .s7protocol import RequestTemplate, S7Protocol, get_return_code_description
 
 from .type import (
     Area,
@@ -20,6 +41,47 @@ from .type import (
 
 logger = logging.getLogger(__name__)
 
+# S7 data item return codes mapped to snap7 client error codes, as reported
+# in ``S7DataItem.Result`` (0 = success).
+_ITEM_RESULT_CODES: dict[int, int] = {
+    0xFF: 0,
+    0x05: 0x00900000,  # errCliAddressOutOfRange
+    0x06: 0x00A00000,  # errCliInvalidTransportSize
+    0x07: 0x00B00000,  # errCliWriteDataSizeMismatch
+    0x0A: 0x00C00000,  # errCliItemNotAvailable
+}
+
+
+@dataclass(frozen=True)
+class _OptimizationPlan:
+    """Compiled read_multi_vars plan for one item layout.
+
+    Plans are shared by every call with the same layout and never modified;
+    block data read by a call is kept in a separate per-call list.  The
+    compiled requests are never stamped themselves: every send stamps a
+    :meth:`~snap7.s7protocol.RequestTemplate.copy`, so callers in other
+    threads (or a :class:`~snap7.engine.SelectorEngine`) can use the same
+    plan at once.
+
+    Attributes:
+        packets: Packets of merged blocks, in send order.
+        requests: Compiled multi-read request per packet, or None for
+            single-block packets, which are read with ``read_area``.
+            Copy a request before stamping it.
+        parameters: Merge parameters the plan was built with.
+        item_count: Number of distinct items read by the packets.
+        item_map: Distinct item read for each caller item, or None if all
+            caller items are distinct.
+        gap_bytes: Bytes the packets read only to bridge gaps between items.
+    """
+
+    packets: Tuple[ReadPacket, ...]
+    requests: Tuple[Optional[RequestTemplate], ...]
+    parameters: PlanParameters
+    item_count: int
+    item_map: Optional[Tuple[int, ...]]
+    gap_bytes: int = 0
+
 
 class ClientMixin:
     """Methods shared between Client and AsyncClient.
@@ -30,9 +92,19 @@ class ClientMixin:
 
     Subclasses must provide the following attributes (set in __init__):
         host, local_tsap, remote_tsap, connection_type, session_password,
-        pdu_length, connected, _exec_time, _last_error, _params
+        pdu_length, connected, _exec_time, _last_error, _params,
+        max_amq_caller, max_amq_callee, protocol, metrics, and the multi-read
+        optimizer state (see :meth:`_init_optimizer`)
     """
 
+    # Outstanding jobs requested from the PLC during setup communication.
+    # The PLC answers with the number it actually accepts (max_amq_caller).
+    AMQ_REQUEST = 8
+
+    MAX_VARS = 20  # Max variables per multi-read/multi-write PDU
+    MAX_OPTIMIZER_PLANS = 16  # Compiled read_multi_vars plans kept for reuse
+    DEFAULT_MAX_GAP = 5  # Merge gap used until the link has been measured
+
     # Declared for type checkers — concrete values set by subclass __init__
     host: str
     local_tsap: int
@@ -44,6 +116,37 @@ class ClientMixin:
     _exec_time: int
     _last_error: int
     _params: dict[Parameter, int]
+    max_amq_caller: int
+    max_amq_callee: int
+    protocol: S7Protocol
+    metrics: ClientMetrics
+
+    # Multi-read optimizer state
+    use_optimizer: bool
+    multi_read_max_gap: Optional[int]
+    _opt_plans: "OrderedDict[tuple[Any, ...], _OptimizationPlan]"
+    _plan_lock: ContextManager[Any]
+    _cost_estimator: CostEstimator
+    _cost_model: Optional[CostModel]
+    _cost_model_samples: int
+    _plan_parameters: Optional[PlanParameters]
+
+    def _init_optimizer(self, plan_lock: ContextManager[Any]) -> None:
+        """Set up the multi-read optimizer state.
+
+        Args:
+            plan_lock: Held while the plan cache and cost model are updated.
+        """
+        # Compiled plans, least recently used first
+        self._opt_plans = OrderedDict()
+        self._plan_lock = plan_lock
+        # Fixed merge gap in bytes; None chooses it from the measured cost model
+        self.multi_read_max_gap = None
+        self.use_optimizer = True
+        self._cost_estimator = CostEstimator()
+        self._cost_model = None
+        self._cost_model_samples = 0
+        self._plan_parameters = None
 
     def get_pdu_length(self) -> int:
         """Get negotiated PDU length.
@@ -61,6 +164,12 @@ class ClientMixin:
         """
         return self._exec_time
 
+    def _record_time(self, operation: str, start_time: float) -> None:
+        """Record an operation started at *start_time* (``time.perf_counter()``) as exec time and in ``metrics``."""
+        elapsed = time.perf_counter() - start_time
+        self._exec_time = int(elapsed * 1000)
+        self.metrics.observe(operation, elapsed)
+
     def get_last_error(self) -> int:
         """Get last error code.
 
@@ -196,6 +305,299 @@ class ClientMixin:
         logger.debug(f"Set param {param}={value}")
         return 0
 
+    def _apply_setup_communication(self, params: Optional[dict[str, Any]]) -> None:
+        """Store the PDU length and AMQ depth negotiated by setup communication.
+
+        Args:
+            params: Parsed parameter section of the setup communication reply.
+        """
+        if not params:
+            return
+
+        if "pdu_length" in params:
+            negotiated = params["pdu_length"]
+            if negotiated < 64:
+                logger.warning(f"Server negotiated implausible PDU length {negotiated}, using minimum 240")
+                negotiated = 240
+            self.pdu_length = negotiated
+            self._params[Parameter.PDURequest] = self.pdu_length
+            logger.info(f"Negotiated PDU length: {self.pdu_length}")
+
+        if "max_amq_caller" in params:
+            # A PLC always accepts at least one outstanding job
+            self.max_amq_caller = max(1, params["max_amq_caller"])
+            self.max_amq_callee = max(1, params.get("max_amq_callee", 1))
+            logger.info(f"Negotiated AMQ: caller={self.max_amq_caller}, callee={self.max_amq_callee}")
+
+    @staticmethod
+    def _area_word_len(area: Area, word_len: Optional[int] = None) -> S7WordLen:
+        """Resolve the word length of an area access.
+
+        Returns *word_len* if given, else TIMER for TM, COUNTER for CT and
+        BYTE for all other areas.
+        """
+        if word_len is not None:
+            return S7WordLen(word_len)
+        if area == Area.TM:
+            return S7WordLen.TIMER
+        if area == Area.CT:
+            return S7WordLen.COUNTER
+        return S7WordLen.BYTE
+
+    @staticmethod
+    def _writable_view(buf: Union[bytearray, memoryview], word_len: S7WordLen) -> tuple[memoryview, int]:
+        """Byte view of a caller-owned read buffer and the item count it holds.
+
+        Raises:
+            TypeError: If *buf* is read-only.
+            ValueError: If the buffer size is not a whole number of items.
+        """
+        view = memoryview(buf).cast("B")
+        if view.readonly:
+            raise TypeError("read buffer must be writable")
+        item_size = S7DataTypes.get_size_bytes(word_len, 1)
+        if len(view) % item_size:
+            raise ValueError(f"buffer size {len(view)} is not a multiple of the {word_len.name} size ({item_size})")
+        return view, len(view) // item_size
+
+    @staticmethod
+    def _copy_payloads(view: memoryview, payloads: Sequence[Union[bytes, memoryview]]) -> int:
+        """Copy read reply payloads back to back into *view*.
+
+        Returns:
+            Number of bytes copied.
+
+        Raises:
+            ~snap7.error.S7ProtocolError: If the payloads do not exactly fill the view.
+        """
+        offset = 0
+        for payload in payloads:
+            end = offset + len(payload)
+            if end > len(view):
+                raise S7ProtocolError(f"Read reply of {end} bytes overflows the {len(view)} byte buffer")
+            view[offset:end] = payload
+            offset = end
+        if offset != len(view):
+            raise S7ProtocolError(f"Short read: received {offset} of {len(view)} bytes")
+        return offset
+
+    def _build_write_items(self, items: list[dict[str, Any]]) -> list[WriteItem]:
+        """Convert ``write_multi_vars`` item dicts to optimizer write items.
+
+        Each dict needs ``area``, ``start`` and ``data``, and may carry
+        ``db_number`` and ``word_len``.  Without ``word_len`` the word length
+        follows the area, as in ``write_area``.
+
+        Raises:
+            ValueError: If a bit item carries more than one byte of data.
+        """
+        write_items: list[WriteItem] = []
+        for index, item in enumerate(items):
+            area = item["area"]
+            s7_word_len = self._area_word_len(area, item.get("word_len"))
+
+            data = bytes(item["data"])
+            if s7_word_len == S7WordLen.BIT and len(data) != 1:
+                raise ValueError(f"Bit write item {index} must carry exactly one byte, got {len(data)}")
+
+            write_items.append(
+                WriteItem(
+                    area=self._map_area(area),
+                    db_number=item.get("db_number", 0),
+                    start=item["start"],
+                    word_len=s7_word_len,
+                    data=data,
+                    index=index,
+                )
+            )
+        return write_items
+
+    @staticmethod
+    def _write_packet_items(packet: WritePacket) -> list[tuple[int, int, int, int, bytes]]:
+        """Address/data tuples of a write packet, for ``build_multi_write_request``."""
+        return [(item.area, item.db_number, item.start, item.word_len, item.data) for item in packet.items]
+
+    @staticmethod
+    def _fold_write_results(packets: list[WritePacket], packet_codes: list[list[int]], item_count: int) -> list[int]:
+        """Fold per-packet return codes back onto the caller's items.
+
+        An item split across several packets reports the first failure of
+        any of its chunks.
+
+        Returns:
+            One S7 return code per original item (``0xFF`` = success).
+        """
+        results = [0xFF] * item_count
+        for packet, codes in zip(packets, packet_codes):
+            for item, code in zip(packet.items, codes):
+                if results[item.index] == 0xFF:
+                    results[item.index] = code
+        return results
+
+    @staticmethod
+    def _item_result_code(return_code: int) -> int:
+        """Map an S7 data item return code to a snap7 client error code (0 = success)."""
+        return _ITEM_RESULT_CODES.get(return_code, 0x02300000)  # errCliFunctionRefused
+
+    @staticmethod
+    def _check_write_results(results: list[int]) -> None:
+        """Raise if any item of a multi-variable write failed.
+
+        Raises:
+            ~snap7.error.S7ProtocolError: Listing every failed item with its
+                return code; the other items were written.
+        """
+        failed = [
+            f"item {index}: {get_return_code_description(code)} (0x{code:02x})"
+            for index, code in enumerate(results)
+            if code != 0xFF
+        ]
+        if failed:
+            raise S7ProtocolError(f"Multi-write failed for {len(failed)} of {len(results)} items: {', '.join(failed)}")
+
+    @property
+    def cost_model(self) -> Optional[CostModel]:
+        """Round-trip and per-byte cost measured on this connection.
+
+        This is the model the optimizer currently plans with, or None
+        until enough exchanges have been timed.
+        """
+        return self._cost_model
+
+    @property
+    def plan_parameters(self) -> Optional[PlanParameters]:
+        """Merge parameters of the plan used by the last optimized ``read_multi_vars`` call."""
+        return self._plan_parameters
+
+    def _planning_model(self) -> Optional[CostModel]:
+        """Refresh the planning cost model from the exchange timings.
+
+        The measured model is picked up after 8, 16, 32, ... samples and then
+        every 1024, and only replaces the current one (dropping the cached
+        plans) if the round-trip or per-byte cost moved by more than 25%.
+        """
+        estimator = self._cost_estimator
+        step = min(max(self._cost_model_samples, estimator.min_samples), 1024)
+        if estimator.samples < self._cost_model_samples + step:
+            return self._cost_model
+
+        self._cost_model_samples = estimator.samples
+        measured = estimator.model()
+        current = self._cost_model
+        if measured is not None and (
+            current is None
+            or abs(measured.rtt - current.rtt) > 0.25 * current.rtt
+            or abs(measured.byte_time - current.byte_time) > 0.25 * current.byte_time
+        ):
+            logger.debug(f"Planning with measured RTT {measured.rtt * 1000:.2f} ms, {measured.byte_time * 1e6:.3f} us/byte")
+            self._cost_model = measured
+            self._opt_plans.clear()
+        return self._cost_model
+
+    def _optimization_plan(self, dict_items: List[dict[str, Any]]) -> _OptimizationPlan:
+        """Compiled plan for an item layout, from the LRU cache when possible.
+
+        Plans depend on the negotiated PDU length, ``multi_read_max_gap`` and
+        the pipeline depth as well as on the items, so all are part of the
+        cache key; a change of the measured cost model drops all plans.  The
+        :attr:`MAX_OPTIMIZER_PLANS` most recently used plans are kept, so an
+        application cycling through several tag groups plans each only once.
+        """
+        depth = self._pipeline_depth()
+        cache_key = (self.pdu_length, self.multi_read_max_gap, depth) + tuple(
+            (int(d["area"]), d.get("db_number", 0), d["start"], d["size"]) for d in dict_items
+        )
+
+        with self._plan_lock:
+            model = self._planning_model() if self.multi_read_max_gap is None else self._cost_model
+            plan = self._opt_plans.get(cache_key)
+            if plan is not None:
+                self._opt_plans.move_to_end(cache_key)
+                self._plan_parameters = plan.parameters
+                self.metrics.count_plan(len(plan.packets), plan.gap_bytes)
+                return plan
+
+        read_items = [
+            ReadItem(
+                area=int(d["area"]),
+                db_number=d.get("db_number", 0),
+                byte_offset=d["start"],
+                bit_offset=d.get("bit", 0),
+                byte_length=d["size"],
+                index=idx,
+            )
+            for idx, d in enumerate(dict_items)
+        ]
+        # BOOL tags sharing a byte (and any other repeated range) are read once
+        distinct_items, item_map = coalesce_items(read_items)
+        sorted_ri = sort_items(distinct_items)
+        max_block = self._max_read_size()
+        if self.multi_read_max_gap is None and model is not None:
+            parameters, packets = choose_parameters(
+                sorted_ri, self.pdu_length, model, max_block, max_blocks=self.MAX_VARS, depth=depth
+            )
+        else:
+            max_gap = self.DEFAULT_MAX_GAP if self.multi_read_max_gap is None else self.multi_read_max_gap
+            blocks = merge_items(sorted_ri, max_gap=max_gap, max_block_size=max_block)
+            packets = packetize(blocks, self.pdu_length, max_blocks=self.MAX_VARS)
+            estimated_time = (model or CostModel()).estimate(packets, depth)
+            parameters = PlanParameters(max_gap, max_block, len(packets), estimated_time)
+        # Compile the multi-block requests once; later calls only patch the sequence
+        requests = tuple(
+            self._compile_plan_request(
+                self.protocol.build_multi_read_request(
+                    [(blk.area, blk.db_number, blk.start_offset, blk.byte_length) for blk in packet.blocks]
+                )
+            )
+            if len(packet.blocks) > 1
+            else None
+            for packet in packets
+        )
+        plan = _OptimizationPlan(
+            tuple(packets),
+            requests,
+            parameters,
+            item_count=len(distinct_items),
+            item_map=None if len(distinct_items) == len(read_items) else tuple(item_map),
+            gap_bytes=gap_bytes(packets),
+        )
+
+        with self._plan_lock:
+            self._plan_parameters = parameters
+            self._opt_plans[cache_key] = plan
+            if len(self._opt_plans) > self.MAX_OPTIMIZER_PLANS:
+                self._opt_plans.popitem(last=False)
+        self.metrics.count_plan(len(plan.packets), plan.gap_bytes)
+        return plan
+
+    def _pipeline_depth(self) -> int:
+        """Number of requests that may be in flight at once on this connection."""
+        return max(1, self.max_amq_caller)
+
+    def _compile_plan_request(self, pdu: bytes) -> RequestTemplate:
+        """Compile a multi-read PDU of a plan for repeated sends."""
+        return RequestTemplate(bytearray(pdu))
+
+    @staticmethod
+    def _plan_results(plan: _OptimizationPlan, buffers: List[List[bytearray]]) -> List[bytearray]:
+        """Per-item results of an executed *plan*, in the caller's item order.
+
+        Args:
+            plan: The executed plan.
+            buffers: Data of every block, one list per packet.
+        """
+        results = extract_results(plan.packets, plan.item_count, buffers)
+        if plan.item_map is None:
+            return results
+
+        # Items that shared a byte range each get their own copy
+        expanded: List[bytearray] = []
+        handed_out = [False] * plan.item_count
+        for distinct in plan.item_map:
+            expanded.append(bytearray(results[distinct]) if handed_out[distinct] else results[distinct])
+            handed_out[distinct] = True
+        return expanded
+
     def _max_read_size(self) -> int:
         """Maximum payload bytes for a single read request.
 
@@ -0,0 +1,471 @@
+"""
+Many PLC connections driven from one thread, for sync code.
+
+A :class:`~snap7.client.Client` blocks in its own socket calls, so talking to
+many PLCs at the same time from sync code normally takes a thread per PLC.
+:class:`SelectorEngine` instead puts the sockets of many connected clients in
+non-blocking mode and drives all their requests with one ``selectors`` loop
+(epoll on Linux, kqueue on BSD/macOS).  Requests are submitted up front; the
+thread that waits for them runs the loop until they are answered.
+
+Example::
+
+    from snap7 import Area, Client, SelectorEngine
+
+    clients = [Client().connect(host, 0, 1) for host in ("10.0.0.1", "10.0.0.2")]
+    with SelectorEngine() as engine:
+        for client in clients:
+            engine.add(client)
+        futures = [engine.submit_read_area(client, Area.DB, 1, 0, 100) for client in clients]
+        engine.wait(futures, timeout=5)
+        data = [f.result() for f in futures]
+"""
+
+import logging
+import selectors
+import struct
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from types import TracebackType
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Type, TypeVar, Union
+
+from .client import Client, _decode_tag, _tag_read_items
+from .connection import ISOTCPConnection
+from .datatypes import S7Area, S7WordLen
+from .error import S7ConnectionError, S7TimeoutError
+from .s7protocol import RequestTemplate
+from .tags import Tag
+from .type import Area
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_PDU_REFERENCE = struct.Struct(">H")
+
+
+class _Job:
+    """One request of a submitted operation: how to build it and what to do with its reply.
+
+    *operation* names the latency histogram in the client's metrics that the
+    time from submission to the decoded reply is counted in.
+    """
+
+    __slots__ = ("operation", "build", "decode", "done", "started")
+
+    def __init__(
+        self,
+        operation: str,
+        build: Callable[[], Union[bytes, RequestTemplate]],
+        decode: Callable[[bytes], Any],
+        done: Callable[[Any, Optional[BaseException]], None],
+    ) -> None:
+        self.operation = operation
+        self.build = build
+        self.decode = decode
+        self.done = done
+        self.started = time.perf_counter()
+
+
+class _Channel:
+    """Engine state of one client: requests waiting, requests in flight and unsent bytes."""
+
+    def __init__(self, client: Client, connection: ISOTCPConnection, heartbeat: bool) -> None:
+        self.client = client
+        self.connection = connection
+        self.heartbeat = heartbeat
+        self.window = max(1, client.max_amq_caller)
+        self.queue: Deque[_Job] = deque()
+        self.in_flight: Dict[int, _Job] = {}
+        self.outgoing = bytearray()
+        self.events = selectors.EVENT_READ
+
+
+class _Gather:
+    """Collects the results of the requests of one operation into its future."""
+
+    def __init__(self, future: "Future[Any]", count: int, finish: Callable[[List[Any]], Any]) -> None:
+        self.future = future
+        self.results: List[Any] = [None] * count
+        self.remaining = count
+        self.finish = finish
+
+    def part_done(self, index: int, result: Any, error: Optional[BaseException]) -> None:
+        if self.future.done():
+            return
+        if error is not None:
+            self.future.set_exception(error)
+            return
+        self.results[index] = result
+        self.remaining -= 1
+        if self.remaining == 0:
+            try:
+                self.future.set_result(self.finish(self.results))
+            except Exception as e:
+                self.future.set_exception(e)
+
+
+class SelectorEngine:
+    """Drives the requests of many connected clients from one thread.
+
+    Clients are connected as usual and then handed to :meth:`add`, which
+    switches their socket to non-blocking mode.  ``submit_*`` methods queue
+    an operation and return a :class:`~concurrent.futures.Future`; nothing
+    is sent until :meth:`wait` (or :meth:`poll`) runs the event loop.  Each
+    client keeps up to its negotiated AMQ of requests in flight, and replies
+    are matched to requests by their PDU reference.
+
+    The engine is not thread-safe: submit and wait from one thread.  While a
+    client is added, use it only through the engine; :meth:`remove` gives it
+    back for blocking calls.  Reads through the engine bypass the client's
+    read cache and coalescing, writes drop the cached ranges they touch.
+
+    If a client's connection fails, its pending operations fail with the
+    error and the client is removed and disconnected.
+    """
+
+    def __init__(self) -> None:
+        self._selector = selectors.DefaultSelector()
+        self._channels: Dict[Client, _Channel] = {}
+
+    def __enter__(self) -> "SelectorEngine":
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    @property
+    def clients(self) -> List[Client]:
+        """The clients driven by the engine."""
+        return list(self._channels)
+
+    def add(self, client: Client) -> None:
+        """Drive a connected client from the engine.
+
+        A heartbeat thread of the client is stopped while the engine drives
+        it, since its probes would share the socket with the engine's
+        requests, and restarted by :meth:`remove`.
+
+        Raises:
+            S7ConnectionError: If the client is not connected.
+            ValueError: If the client is already added.
+        """
+        if client in self._channels:
+            raise ValueError("Client is already added to the engine")
+        connection = client.connection
+        if not client.connected or connection is None or connection.socket is None:
+            raise S7ConnectionError("Not connected to PLC")
+        heartbeat = client._heartbeat_thread is not None
+        if heartbeat:
+            client._stop_heartbeat()
+        connection.socket.setblocking(False)
+        channel = _Channel(client, connection, heartbeat)
+        self._selector.register(connection.socket, channel.events, channel)
+        self._channels[client] = channel
+
+    def remove(self, client: Client) -> None:
+        """Stop driving a client and restore its socket for blocking use.
+
+        Operations of the client that have not finished fail with
+        :class:`~snap7.error.S7ConnectionError`.  If requests were still in
+        flight or partly sent, the client is disconnected instead, since
+        its next blocking call would read their replies or send after a
+        half-sent frame.
+        """
+        channel = self._channels.get(client)
+        if channel is None:
+            return
+        busy = bool(channel.in_flight or channel.outgoing)
+        self._drop(channel, S7ConnectionError("Client removed from the engine"))
+        if busy:
+            logger.warning(f"Disconnecting {client.host}, removed from the engine with requests in flight")
+            client.disconnect()
+        elif channel.connection.socket is not None:
+            channel.connection.socket.settimeout(channel.connection.timeout)
+            if channel.heartbeat:
+                client._start_heartbeat()
+
+    def close(self) -> None:
+        """Remove every client (see :meth:`remove`) and release the selector."""
+        for client in list(self._channels):
+            self.remove(client)
+        self._selector.close()
+
+    def submit(self, client: Client, request: Union[bytes, RequestTemplate], decode: Callable[[bytes], _T]) -> "Future[_T]":
+        """Queue one raw request.
+
+        Args:
+            client: An added client.
+            request: Complete S7 PDU, or a compiled request of *client*.
+            decode: Turns the reply PDU into the future's result.
+        """
+        future: "Future[_T]" = Future()
+        gather = _Gather(future, 1, lambda results: results[0])
+        self._queue(client, [_Job("request", partial(_prebuilt, request), decode, partial(gather.part_done, 0))])
+        return future
+
+    def submit_read_area(self, client: Client, area: Area, db_number: int, start: int, size: int) -> "Future[bytearray]":
+        """Queue a byte read of a memory area, split into PDU-sized requests.
+
+        The future's result is the data read, as :meth:`Client.read_area` returns it.
+        """
+        future: "Future[bytearray]" = Future()
+        if size <= 0:
+            future.set_result(bytearray())
+            return future
+
+        s7_area = client._map_area(area)
+        s7_word_len = client._area_word_len(area)
+        chunk = client._max_read_size()
+        offsets = range(0, size, chunk)
+        gather = _Gather(future, len(offsets), lambda parts: bytearray(b"".join(parts)))
+        jobs = [
+            _Job(
+                "read_area",
+                partial(client._read_template, s7_area, db_number, start + offset, s7_word_len, min(chunk, size - offset)),
+                partial(_read_payload, client),
+                partial(gather.part_done, index),
+            )
+            for index, offset in enumerate(offsets)
+        ]
+        self._queue(client, jobs)
+        return future
+
+    def submit_write_area(self, client: Client, area: Area, db_number: int, start: int, data: bytearray) -> "Future[int]":
+        """Queue a write to a memory area, split into PDU-sized requests.
+
+        The future's result is 0 once every request was acknowledged.
+        """
+        future: "Future[int]" = Future()
+        if not data:
+            future.set_result(0)
+            return future
+
+        s7_area = client._map_area(area)
+        s7_word_len = client._area_word_len(area)
+        chunk = client._max_write_size()
+
+        def finish(_: List[Any]) -> int:
+            if client.read_cache is not None:
+                client.read_cache.invalidate(s7_area, db_number, start, len(data))
+            return 0
+
+        offsets = range(0, len(data), chunk)
+        gather = _Gather(future, len(offsets), finish)
+        jobs = [
+            _Job(
+                "write_area",
+                partial(
+                    client.protocol.build_write_request,
+                    area=s7_area,
+                    db_number=db_number,
+                    start=start + offset,
+                    word_len=s7_word_len,
+                    data=bytes(data[offset : offset + chunk]),
+                ),
+                partial(_write_ack, client),
+                partial(gather.part_done, index),
+            )
+            for index, offset in enumerate(offsets)
+        ]
+        self._queue(client, jobs)
+        return future
+
+    def submit_read_multi_vars(self, client: Client, items: List[Dict[str, Any]]) -> "Future[List[bytearray]]":
+        """Queue an optimized multi-variable read.
+
+        The items are planned by the client's optimizer, and the packets of
+        the plan are sent as separate requests.  The future's result is the
+        data of every item, in order.
+
+        Args:
+            items: Item dicts with keys area, db_number, start, size.
+        """
+        future: "Future[List[bytearray]]" = Future()
+        if not items:
+            future.set_result([])
+            return future
+
+        plan = client._optimization_plan(items)
+        gather = _Gather(future, len(plan.packets), partial(client._plan_results, plan))
+        jobs = []
+        for index, (packet, request) in enumerate(zip(plan.packets, plan.requests)):
+            if request is None:
+                blk = packet.blocks[0]
+                build: Callable[[], Union[bytes, RequestTemplate]] = partial(
+                    client._read_template, S7Area(blk.area), blk.db_number, blk.start_offset, S7WordLen.BYTE, blk.byte_length
+                )
+                decode: Callable[[bytes], Any] = partial(_single_block, client)
+            else:
+                build = request.copy
+                decode = partial(_multi_blocks, client, len(packet.blocks))
+            jobs.append(_Job("read_multi_vars", build, decode, partial(gather.part_done, index)))
+        self._queue(client, jobs)
+        return future
+
+    def submit_read_tags(self, client: Client, tags: List[Union[Tag, str]], encoding: str = "latin-1") -> "Future[List[Any]]":
+        """Queue a read of typed tags, decoded like :meth:`Client.read_tags`."""
+        resolved, items = _tag_read_items(tags)
+        future: "Future[List[Any]]" = Future()
+
+        def decode(done: "Future[List[bytearray]]") -> None:
+            try:
+                future.set_result([_decode_tag(t, d, encoding=encoding) for t, d in zip(resolved, done.result())])
+            except Exception as e:
+                future.set_exception(e)
+
+        self.submit_read_multi_vars(client, items).add_done_callback(decode)
+        return future
+
+    def wait(self, futures: Iterable["Future[Any]"], timeout: Optional[float] = None) -> None:
+        """Run the event loop until every future in *futures* is done.
+
+        Args:
+            futures: Futures returned by ``submit_*``.
+            timeout: Maximum seconds to wait, or None for no limit.
+
+        Raises:
+            S7TimeoutError: If the futures are not all done in time.  They
+                stay pending and complete on a later :meth:`wait`.
+        """
+        pending = [f for f in futures if not f.done()]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while pending:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise S7TimeoutError(f"Timeout waiting for {len(pending)} request(s)")
+            self.poll(remaining)
+            pending = [f for f in pending if not f.done()]
+
+    def poll(self, timeout: Optional[float] = 0) -> None:
+        """Run one round of the event loop.
+
+        Sends what fits in each client's window, then waits up to *timeout*
+        seconds for socket events and handles the replies that arrived.
+        """
+        for channel in list(self._channels.values()):
+            self._dispatch(channel)
+        if not self._channels:
+            return
+        for key, events in self._selector.select(timeout):
+            channel = key.data
+            if self._channels.get(channel.client) is not channel:
+                continue
+            try:
+                if events & selectors.EVENT_WRITE:
+                    self._flush(channel)
+                if events & selectors.EVENT_READ:
+                    self._receive(channel)
+            except (S7ConnectionError, OSError) as e:
+                self._fail(channel, e)
+
+    def _queue(self, client: Client, jobs: Sequence[_Job]) -> None:
+        channel = self._channels.get(client)
+        if channel is None:
+            raise ValueError("Client is not added to the engine")
+        channel.queue.extend(jobs)
+
+    def _dispatch(self, channel: _Channel) -> None:
+        """Send queued requests up to the channel's window."""
+        try:
+            while channel.queue and len(channel.in_flight) < channel.window:
+                job = channel.queue.popleft()
+                request = job.build()
+                if isinstance(request, RequestTemplate):
+                    frame = channel.client.protocol.stamp_request(request)
+                    sequence = request.sequence
+                else:
+                    frame = ISOTCPConnection.frame_data(request)
+                    sequence = _PDU_REFERENCE.unpack_from(request, 4)[0]
+                channel.outgoing += frame
+                channel.client.metrics.count_sent(1, len(frame))
+                channel.in_flight[sequence] = job
+            self._flush(channel)
+        except (S7ConnectionError, OSError) as e:
+            self._fail(channel, e)
+
+    def _flush(self, channel: _Channel) -> None:
+        """Send as much of the channel's unsent bytes as the socket takes."""
+        sock = channel.connection.socket
+        if sock is None:
+            raise S7ConnectionError("Not connected to PLC")
+        if channel.outgoing:
+            try:
+                sent = sock.send(channel.outgoing)
+            except BlockingIOError:
+                sent = 0
+            except OSError as e:
+                raise S7ConnectionError(f"Send failed: {e}")
+            del channel.outgoing[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if channel.outgoing else 0)
+        if events != channel.events:
+            channel.events = events
+            self._selector.modify(sock, events, channel)
+
+    def _receive(self, channel: _Channel) -> None:
+        """Handle the replies that arrived for a channel."""
+        for pdu in channel.connection.receive_nowait():
+            if len(pdu) < 6:
+                logger.warning(f"Discarding short reply from {channel.client.host}")
+                continue
+            sequence = _PDU_REFERENCE.unpack_from(pdu, 4)[0]
+            job = channel.in_flight.pop(sequence, None)
+            if job is None:
+                channel.client.metrics.count_stale_retry()
+                logger.warning(f"Discarding unexpected reply with sequence {sequence} from {channel.client.host}")
+                continue
+            try:
+                result = job.decode(pdu)
+            except Exception as e:
+                job.done(None, e)
+            else:
+                channel.client.metrics.observe(job.operation, time.perf_counter() - job.started)
+                job.done(result, None)
+        self._dispatch(channel)
+
+    def _fail(self, channel: _Channel, error: BaseException) -> None:
+        """Drop a channel whose connection failed and disconnect its client."""
+        logger.warning(f"Engine connection to {channel.client.host} failed: {error}")
+        self._drop(channel, error)
+        channel.client.disconnect()
+
+    def _drop(self, channel: _Channel, error: BaseException) -> None:
+        """Stop driving a channel and fail its unfinished requests with *error*."""
+        if self._channels.get(channel.client) is not channel:
+            return
+        del self._channels[channel.client]
+        sock = channel.connection.socket
+        if sock is not None:
+            try:
+                self._selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass
+        jobs = list(channel.in_flight.values()) + list(channel.queue)
+        channel.in_flight.clear()
+        channel.queue.clear()
+        for job in jobs:
+            job.done(None, error)
+
+
+def _prebuilt(request: Union[bytes, RequestTemplate]) -> Union[bytes, RequestTemplate]:
+    return request
+
+
+def _read_payload(client: Client, pdu: bytes) -> bytes:
+    return bytes(client.protocol.parse_read_reply(pdu)[1])
+
+
+def _single_block(client: Client, pdu: bytes) -> List[bytearray]:
+    return [bytearray(client.protocol.parse_read_reply(pdu)[1])]
+
+
+def _multi_blocks(client: Client, count: int, pdu: bytes) -> List[bytearray]:
+    return client.protocol.extract_multi_read_data(client.protocol.parse_response(pdu), count)
+
+
+def _write_ack(client: Client, pdu: bytes) -> None:
+    client.protocol.check_write_response(client.protocol.parse_response(pdu))
@@ -0,0 +1,271 @@
+"""
+OpenMetrics exporter for client, server and partner metrics.
+
+:func:`render` writes the metrics of every live
+:class:`~snap7.client.Client`, :class:`~snap7.async_client.AsyncClient`,
+:class:`~snap7.server.Server` and :class:`~snap7.partner.Partner` (see
+:mod:`snap7.metrics`) in the OpenMetrics text format that Prometheus
+scrapes.  :class:`MetricsExporter` serves it over HTTP with the standard
+library's ``http.server``, so no extra packages are needed.
+
+Example::
+
+    from snap7 import Client
+    from snap7.exporter import MetricsExporter
+
+    client = Client()
+    client.connect("192.168.1.10", 0, 1)
+
+    with MetricsExporter(port=8000):
+        ...  # poll the PLC; Prometheus scrapes http://<host>:8000/metrics
+
+Every series carries an ``id`` label that tells apart several objects of
+the same kind, e.g. two clients connected to the same PLC.
+"""
+
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+from .async_client import AsyncClient
+from .client import Client
+from .metrics import HistogramSnapshot, tracked
+from .partner import Partner
+from .server import Server
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Counters of a client or partner: family name, snapshot field, unit and help text
+_Counter = Tuple[str, str, str, str]
+
+_TRAFFIC_COUNTERS: Tuple[_Counter, ...] = (
+    ("pdus_sent", "pdus_sent", "", "S7 PDUs sent."),
+    ("pdus_received", "pdus_received", "", "S7 PDUs received."),
+    ("sent_bytes", "bytes_sent", "bytes", "Bytes sent, TPKT and COTP headers included."),
+    ("received_bytes", "bytes_received", "bytes", "Bytes received, TPKT and COTP headers included."),
+)
+_CLIENT_COUNTERS: Tuple[_Counter, ...] = _TRAFFIC_COUNTERS + (
+    ("optimizer_calls", "optimizer_calls", "", "read_multi_vars calls planned by the optimizer."),
+    ("optimizer_packets", "optimizer_packets", "", "Packets sent by optimized read_multi_vars calls."),
+    ("optimizer_gap_bytes", "optimizer_gap_bytes", "bytes", "Bytes read only to bridge gaps between merged items."),
+    ("stale_retries", "stale_retries", "", "Replies discarded because they answered an older request."),
+    ("reconnects", "reconnects", "", "Successful automatic reconnections."),
+    ("heartbeat_failures", "heartbeat_failures", "", "Failed heartbeat probes."),
+)
+
+
+class _Family:
+    """One metric family: its metadata lines followed by all its samples."""
+
+    def __init__(self, name: str, kind: str, help_text: str, unit: str = "") -> None:
+        self.name = name
+        self.kind = kind
+        self.lines = [f"# TYPE {name} {kind}"]
+        if unit:
+            self.lines.append(f"# UNIT {name} {unit}")
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.samples = 0
+
+    def add(self, labels: Mapping[str, str], value: float, suffix: str = "") -> None:
+        if self.kind == "counter" and not suffix:
+            suffix = "_total"
+        self.lines.append(f"{self.name}{suffix}{_labels(labels)} {_value(value)}")
+        self.samples += 1
+
+    def add_histogram(self, labels: Mapping[str, str], histogram: HistogramSnapshot) -> None:
+        cumulative = 0
+        for bound, count in zip(histogram.bounds + (math.inf,), histogram.counts):
+            cumulative += count
+            self.add({**labels, "le": _value(bound)}, cumulative, "_bucket")
+        self.add(labels, histogram.sum, "_sum")
+        self.add(labels, histogram.count, "_count")
+
+
+class _Families:
+    """Metric families by name, in the order they were first used."""
+
+    def __init__(self) -> None:
+        self._families: Dict[str, _Family] = {}
+
+    def get(self, name: str, kind: str, help_text: str, unit: str = "") -> _Family:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = _Family(name, kind, help_text, unit)
+        return family
+
+    def text(self) -> str:
+        lines: List[str] = []
+        for family in self._families.values():
+            if family.samples:
+                lines.extend(family.lines)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_client(families: _Families, prefix: str, labels: Dict[str, str], owner: Any, counters: Iterable[_Counter]) -> None:
+    """Add the connection state, counters and operation latency of a client or partner."""
+    snapshot = owner.metrics.snapshot()
+    families.get(f"{prefix}_connected", "gauge", "1 while connected, else 0.").add(labels, int(bool(owner.connected)))
+    for name, field, unit, help_text in counters:
+        families.get(f"{prefix}_{name}", "counter", help_text, unit).add(labels, getattr(snapshot, field))
+    latency = families.get(f"{prefix}_operation_seconds", "histogram", "Duration of completed operations.", "seconds")
+    for operation, histogram in sorted(snapshot.latency.items()):
+        latency.add_histogram({**labels, "operation": operation}, histogram)
+
+
+def _render_server(families: _Families, labels: Dict[str, str], server: Server) -> None:
+    snapshot = server.metrics.snapshot()
+    families.get("snap7_server_clients", "gauge", "Connected clients.").add(labels, server.client_count)
+    requests = families.get("snap7_server_requests", "counter", "Requests handled per S7 function.")
+    for function, count in sorted(snapshot.requests.items()):
+        requests.add({**labels, "function": function}, count)
+    latency = families.get(
+        "snap7_server_request_seconds", "histogram", "Time from receiving a request to sending its reply, per client.", "seconds"
+    )
+    for client, histogram in sorted(snapshot.request_latency.items()):
+        latency.add_histogram({**labels, "client": client}, histogram)
+    lock_wait = families.get(
+        "snap7_server_area_lock_wait_seconds", "histogram", "Time requests waited for an area lock.", "seconds"
+    )
+    for area, histogram in sorted(snapshot.lock_wait.items()):
+        lock_wait.add_histogram({**labels, "area": area}, histogram)
+
+
+def render(owners: Optional[Iterable[Any]] = None) -> str:
+    """Render metrics in the OpenMetrics text format.
+
+    Args:
+        owners: Clients, async clients, servers and partners to render;
+            by default every one that is still alive.
+
+    Returns:
+        The exposition text, ending with ``# EOF``.
+    """
+    families = _Families()
+    for owner in tracked() if owners is None else owners:
+        if isinstance(owner, (Client, AsyncClient)):
+            labels = {"id": str(owner.metrics.id), "host": owner.host, "rack": str(owner.rack), "slot": str(owner.slot)}
+            _render_client(families, "snap7_client", labels, owner, _CLIENT_COUNTERS)
+        elif isinstance(owner, Partner):
+            labels = {"id": str(owner.metrics.id), "remote": owner.remote_ip, "active": str(owner.active).lower()}
+            _render_client(families, "snap7_partner", labels, owner, _TRAFFIC_COUNTERS)
+            families.get("snap7_partner_send_errors", "counter", "Failed sends.").add(labels, owner.send_errors)
+            families.get("snap7_partner_recv_errors", "counter", "Failed receives.").add(labels, owner.recv_errors)
+        elif isinstance(owner, Server):
+            labels = {"id": str(owner.metrics.id), "port": str(owner.port)}
+            _render_server(families, labels, owner)
+        else:
+            raise TypeError(f"Cannot render metrics of {type(owner).__name__}")
+    return families.text()
+
+
+class MetricsExporter:
+    """HTTP endpoint serving :func:`render` for Prometheus to scrape.
+
+    Requests are answered from a background thread; each scrape takes a
+    fresh snapshot of every object.
+
+    Args:
+        host: Address to listen on.
+        port: TCP port to listen on; 0 lets the OS choose one, see :attr:`port`.
+        path: URL path of the metrics.
+        owners: Called on every scrape for the objects to render; by
+            default every live client, server and partner.
+    """
+
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        path: str = "/metrics",
+        owners: Optional[Callable[[], Iterable[Any]]] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.path = path
+        self.owners = owners
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._httpd is not None
+
+    def start(self) -> None:
+        """Start listening; :attr:`port` is the bound port afterwards."""
+        if self._httpd is not None:
+            raise RuntimeError("Exporter already running")
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="s7-metrics-exporter")
+        self._thread.start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}{self.path}")
+
+    def stop(self) -> None:
+        """Stop listening."""
+        httpd, self._httpd = self._httpd, None
+        if httpd is None:
+            return
+        httpd.shutdown()
+        httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _handler(self) -> Type[BaseHTTPRequestHandler]:
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != exporter.path:
+                    self.send_error(404)
+                    return
+                try:
+                    body = render(None if exporter.owners is None else exporter.owners()).encode()
+                except Exception as e:
+                    logger.error(f"Rendering metrics failed: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        return Handler
+
+    def __enter__(self) -> "MetricsExporter":
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.stop()
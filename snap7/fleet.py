@@ -0,0 +1,352 @@
+"""
+Asyncio polling of many PLCs from one event loop.
+
+:class:`FleetPoller` owns one :class:`~snap7.async_client.AsyncClient` per
+PLC and scans each PLC's tag groups on the schedule :class:`~snap7.poller.Poller`
+uses, but as a task on the event loop instead of a thread per PLC.  A few
+hundred PLCs can be polled from a single process.
+
+Connection setup is staggered so a restart does not hit every PLC at once.
+The number of requests in flight across the fleet is capped, and the results
+of all PLCs arrive on one :class:`asyncio.Queue`.
+
+Example::
+
+    import asyncio
+    from snap7 import FleetPoller
+
+    async def main():
+        async with FleetPoller(max_in_flight=32) as fleet:
+            for n in range(1, 401):
+                plc = f"press{n}"
+                fleet.add_plc(plc, f"10.0.{n // 256}.{n % 256}", 0, 1)
+                fleet.add_group(plc, "status", ["DB1.DBX0.0:BOOL", "DB1.DBW2:INT"], interval=0.5)
+            async for result in fleet.results():
+                print(result.plc, result.group, result.values)
+
+    asyncio.run(main())
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, AsyncIterator, Optional, Type
+
+from .async_client import AsyncClient
+from .client import _decode_tag
+from .error import S7ConnectionError, S7Error
+from .poller import Poller, PollGroup, TagSpec, _new_group, _put_dropping_oldest
+from .tags import Tag
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FleetResult:
+    """Values of one tag group of one PLC from one scan.
+
+    Attributes:
+        plc: Name of the PLC.
+        group: Name of the tag group.
+        values: Decoded values keyed by tag name, in the order the tags were added.
+        timestamp: Wall-clock time (``time.time()``) at which the read completed.
+        error: The exception raised by the read or connect, or None.  When
+            set, *values* is empty.
+    """
+
+    plc: str
+    group: str
+    values: dict[str, Any]
+    timestamp: float
+    error: Optional[Exception] = None
+
+
+@dataclass
+class FleetPLC:
+    """A PLC polled by a :class:`FleetPoller`.
+
+    Attributes:
+        name: PLC name, used in :class:`FleetResult`.
+        address: IP address of the PLC.
+        rack: Rack number.
+        slot: Slot number.
+        tcp_port: TCP port.
+        client: The client the PLC is read with.
+        groups: Tag groups scanned on this PLC, keyed by name.
+        connects: Number of successful connects.
+        connect_errors: Number of failed connect attempts.
+    """
+
+    name: str
+    address: str
+    rack: int
+    slot: int
+    tcp_port: int = 102
+    client: AsyncClient = field(default_factory=AsyncClient, repr=False)
+    groups: dict[str, PollGroup] = field(default_factory=dict)
+    connects: int = 0
+    connect_errors: int = 0
+    # Tags and read_multi_vars items per combination of due groups
+    _layouts: dict[tuple[str, ...], tuple[list[tuple[PollGroup, str, Tag]], list[dict[str, Any]]]] = field(
+        default_factory=dict, repr=False
+    )
+
+
+class FleetPoller:
+    """Scans tag groups on many PLCs from one event loop.
+
+    Every PLC gets its own task, which connects, then scans the PLC's groups
+    with drift-free scheduling: groups due on the same tick are read
+    together in one optimized ``read_multi_vars`` call, and scans missed
+    during a slow read are skipped and counted in :attr:`PollGroup.overruns`.
+
+    A failed connect is retried after *reconnect_delay* seconds; a scan that
+    loses the connection reports the error and the task reconnects.  Every
+    failure is delivered as a :class:`FleetResult` with ``error`` set.
+
+    Args:
+        max_in_flight: Maximum number of requests in flight across the whole
+            fleet.  A scan sends one request per packet of its optimized
+            read, up to the PLC's AMQ at a time, and each of them takes a slot.
+        connect_interval: Minimum time in seconds between two connection
+            attempts, so that starting the fleet ramps up gradually.
+        reconnect_delay: Seconds to wait before retrying a failed connect.
+        queue_size: Maximum number of results held in :attr:`queue`; 0 means
+            unbounded.  When full, the oldest result is discarded.
+    """
+
+    MERGE_WINDOW = Poller.MERGE_WINDOW
+    MAX_LAYOUTS = Poller.MAX_LAYOUTS
+
+    def __init__(
+        self, max_in_flight: int = 64, connect_interval: float = 0.05, reconnect_delay: float = 5.0, queue_size: int = 0
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+        self.connect_interval = connect_interval
+        self.reconnect_delay = reconnect_delay
+        self.encoding = "latin-1"
+        self.queue: "asyncio.Queue[FleetResult]" = asyncio.Queue(maxsize=queue_size)
+        self._plcs: dict[str, FleetPLC] = {}
+        self._tasks: dict[str, "asyncio.Task[None]"] = {}
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._connect_lock = asyncio.Lock()
+        self._next_connect = 0.0
+        self._running = False
+
+    async def __aenter__(self) -> "FleetPoller":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> None:
+        await self.stop()
+
+    @property
+    def plcs(self) -> dict[str, FleetPLC]:
+        """The registered PLCs, keyed by name."""
+        return dict(self._plcs)
+
+    @property
+    def running(self) -> bool:
+        """Whether the PLC tasks are running."""
+        return self._running
+
+    def add_plc(self, name: str, address: str, rack: int, slot: int, tcp_port: int = 102) -> FleetPLC:
+        """Register a PLC.  If the fleet is running, polling starts right away.
+
+        Raises:
+            ValueError: If the name is taken.
+        """
+        if name in self._plcs:
+            raise ValueError(f"PLC {name!r} already exists")
+        plc = FleetPLC(name, address, rack, slot, tcp_port)
+        plc.client._shared_window = self._in_flight
+        self._plcs[name] = plc
+        if self._running:
+            self._start_plc(plc)
+        return plc
+
+    async def remove_plc(self, name: str) -> None:
+        """Stop polling a PLC and disconnect from it.
+
+        Raises:
+            KeyError: If there is no PLC with that name.
+        """
+        plc = self._plcs.pop(name)
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await plc.client.disconnect()
+
+    def add_group(self, plc: str, name: str, tags: TagSpec, interval: float) -> PollGroup:
+        """Register a tag group on a PLC.
+
+        Args:
+            plc: Name of the PLC.
+            name: Group name, unique per PLC.
+            tags: Tags or address strings, named by their ``name`` (or
+                address), or a mapping of names to tags or address strings.
+            interval: Scan interval in seconds.
+
+        Returns:
+            The new group.  The first scan is due immediately.
+
+        Raises:
+            KeyError: If there is no PLC with that name.
+            ValueError: If the group name is taken, the interval is not
+                positive, a tag name is repeated or a tag uses symbolic access.
+        """
+        target = self._plcs[plc]
+        if name in target.groups:
+            raise ValueError(f"Group {name!r} already exists on PLC {plc!r}")
+        group = _new_group(name, tags, interval)
+        target.groups[name] = group
+        target._layouts.clear()
+        return group
+
+    def remove_group(self, plc: str, name: str) -> None:
+        """Unregister a tag group.
+
+        Raises:
+            KeyError: If there is no such PLC or group.
+        """
+        target = self._plcs[plc]
+        del target.groups[name]
+        target._layouts.clear()
+
+    async def results(self) -> AsyncIterator[FleetResult]:
+        """Yield results from :attr:`queue` as they arrive, from all PLCs."""
+        while True:
+            yield await self.queue.get()
+
+    async def poll(self, plc: str, now: Optional[float] = None) -> list[FleetResult]:
+        """Scan the groups of *plc* that are due and deliver their results.
+
+        This is one tick of the PLC's task; call it directly to drive a
+        connected PLC without :meth:`start`.
+
+        Args:
+            plc: Name of the PLC.
+            now: Monotonic time of the tick.  Defaults to ``time.monotonic()``.
+
+        Returns:
+            The results delivered on this tick, one per scanned group.
+        """
+        target = self._plcs[plc]
+        if now is None:
+            now = time.monotonic()
+        due = [g for g in target.groups.values() if g.next_due <= now + self.MERGE_WINDOW]
+        if not due:
+            return []
+        key = tuple(g.name for g in due)
+        layout = target._layouts.get(key)
+        if layout is None:
+            if len(target._layouts) >= self.MAX_LAYOUTS:
+                target._layouts.clear()
+            layout = ([(g, name, tag) for g in due for name, tag in g.tags.items()], [item for g in due for item in g._items])
+            target._layouts[key] = layout
+        entries, items = layout
+
+        results: list[FleetResult] = []
+        try:
+            _code, data_list = await target.client.read_multi_vars(items)
+            timestamp = time.time()
+            values: dict[str, dict[str, Any]] = {g.name: {} for g in due}
+            for (group, name, tag), data in zip(entries, data_list):
+                values[group.name][name] = _decode_tag(tag, data, self.encoding)
+            results = [FleetResult(plc, g.name, values[g.name], timestamp) for g in due]
+        except (S7Error, OSError) as e:
+            logger.warning(f"Poll of {', '.join(key)} on PLC {plc!r} failed: {e}")
+            timestamp = time.time()
+            for group in due:
+                group.errors += 1
+                results.append(FleetResult(plc, group.name, {}, timestamp, e))
+            if isinstance(e, (S7ConnectionError, OSError)):
+                await target.client.disconnect()
+        finally:
+            self._advance(plc, due)
+
+        for result in results:
+            self._deliver(result)
+        return results
+
+    @staticmethod
+    def _advance(plc: str, due: list[PollGroup]) -> None:
+        """Move the scanned groups to their next slot, skipping slots that have already passed."""
+        finished = time.monotonic()
+        for group in due:
+            missed = group.advance(finished)
+            if missed:
+                logger.debug(f"Poll group {group.name!r} on PLC {plc!r} overran by {missed} cycle(s)")
+
+    def _deliver(self, result: FleetResult) -> None:
+        """Put *result* on the queue, discarding the oldest result if it is full."""
+        _put_dropping_oldest(self.queue, result)
+
+    async def start(self) -> None:
+        """Start a polling task for every PLC.
+
+        Every group's schedule restarts from now, so each PLC's groups are
+        all scanned as soon as it is connected.
+        """
+        if self._running:
+            return
+        self._running = True
+        for plc in self._plcs.values():
+            self._start_plc(plc)
+        logger.debug(f"Fleet poller started with {len(self._plcs)} PLC(s)")
+
+    async def stop(self) -> None:
+        """Cancel the polling tasks and disconnect from every PLC."""
+        self._running = False
+        tasks, self._tasks = list(self._tasks.values()), {}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*(plc.client.disconnect() for plc in self._plcs.values()), return_exceptions=True)
+        logger.debug("Fleet poller stopped")
+
+    def _start_plc(self, plc: FleetPLC) -> None:
+        now = time.monotonic()
+        for group in plc.groups.values():
+            group._origin = now
+            group._slot = 0
+        self._tasks[plc.name] = asyncio.get_running_loop().create_task(self._run(plc), name=f"s7-fleet-{plc.name}")
+
+    async def _connect(self, plc: FleetPLC) -> None:
+        """Connect *plc*, at least :attr:`connect_interval` after the previous connect attempt."""
+        async with self._connect_lock:
+            delay = self._next_connect - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_connect = time.monotonic() + self.connect_interval
+        await plc.client.connect(plc.address, plc.rack, plc.slot, plc.tcp_port)
+        plc.connects += 1
+
+    async def _run(self, plc: FleetPLC) -> None:
+        """PLC task: connect when needed, scan the due groups, then sleep until the next one is due."""
+        while True:
+            if not plc.client.get_connected():
+                try:
+                    await self._connect(plc)
+                except (S7Error, OSError) as e:
+                    plc.connect_errors += 1
+                    logger.warning(f"Connecting to PLC {plc.name!r} at {plc.address} failed: {e}")
+                    timestamp = time.time()
+                    for group in list(plc.groups.values()):
+                        self._deliver(FleetResult(plc.name, group.name, {}, timestamp, e))
+                    await asyncio.sleep(self.reconnect_delay)
+                    continue
+            try:
+                await self.poll(plc.name)
+            except Exception:
+                logger.exception(f"Fleet tick of PLC {plc.name!r} failed")
+            next_due = min((g.next_due for g in plc.groups.values()), default=None)
+            delay = 0.1 if next_due is None else next_due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
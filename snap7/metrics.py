@@ -0,0 +1,335 @@
+"""
+Performance metrics of S7 clients, servers and partners.
+
+Every :class:`~snap7.client.Client` and :class:`~snap7.async_client.AsyncClient`
+counts its traffic in a :class:`ClientMetrics` kept in its ``metrics``
+attribute: latency histograms per operation, PDUs and bytes on the wire,
+how the multi-read optimizer packed ``read_multi_vars`` calls, and the
+stale-packet retries, reconnects and heartbeat failures of the connection.
+A :class:`~snap7.partner.Partner` counts its traffic the same way, and a
+:class:`~snap7.server.Server` keeps a :class:`ServerMetrics`.
+
+Clients, servers and partners are tracked while they are alive (see
+:func:`tracked`), so :mod:`snap7.exporter` can render all of them.
+
+:meth:`ClientMetrics.snapshot` copies all counters under one short lock, so
+it can be taken every second, e.g. to size poll rates against what the PLC
+answers.  Counters only grow; take the difference of two snapshots for rates.
+
+Example::
+
+    from snap7 import Client
+
+    client = Client()
+    client.connect("192.168.1.10", 0, 1)
+    client.db_read(1, 0, 100)
+
+    snapshot = client.metrics.snapshot()
+    print(snapshot.pdus_sent, snapshot.bytes_received)
+    print(snapshot.latency["read_area"].quantile(0.99))
+"""
+
+import itertools
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Sequence, Tuple
+
+# Upper bounds of the latency buckets in seconds; replies of a PLC on the
+# local network take from under a millisecond to some hundred milliseconds
+LATENCY_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Live clients, servers and partners; ids tell apart several metrics
+# objects of the same kind, e.g. two clients connected to one PLC
+_tracked: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_tracked_lock = threading.Lock()
+_ids = itertools.count(1)
+
+
+def track(owner: Any) -> None:
+    """Add a client, server or partner to the objects returned by :func:`tracked`."""
+    with _tracked_lock:
+        _tracked.add(owner)
+
+
+def tracked() -> List[Any]:
+    """The clients, servers and partners that are still alive, oldest first."""
+    with _tracked_lock:
+        owners = list(_tracked)
+    return sorted(owners, key=lambda owner: owner.metrics.id)
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Copy of a :class:`LatencyHistogram`.
+
+    Attributes:
+        bounds: Upper bounds of the buckets in seconds, ascending.
+        counts: Observations per bucket; one more entry than *bounds*, the
+            last counting observations above the last bound.
+        count: Number of observations.
+        sum: Sum of all observations in seconds.
+    """
+
+    bounds: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds (0.0 without observations)."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            q: Quantile between 0 and 1, e.g. 0.99.
+
+        Returns:
+            Latency in seconds; 0.0 without observations and ``inf`` if the
+            quantile lies above the last bound.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be between 0 and 1, got {q}")
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return bound
+        return float("inf")
+
+
+class LatencyHistogram:
+    """Latencies counted in fixed buckets.
+
+    Not thread-safe by itself; the metrics objects holding it guard it.
+
+    Args:
+        bounds: Upper bounds of the buckets in seconds, ascending.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError("bounds must be ascending and distinct")
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Count one latency."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(self.bounds, tuple(self.counts), self.count, self.sum)
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Copy of the counters of a :class:`ClientMetrics`.
+
+    Attributes:
+        timestamp: ``time.time()`` when the snapshot was taken.
+        pdus_sent: S7 PDUs sent.
+        pdus_received: S7 PDUs received.
+        bytes_sent: Bytes sent, TPKT and COTP headers included.
+        bytes_received: Bytes received, TPKT and COTP headers included.
+        optimizer_calls: ``read_multi_vars`` calls planned by the optimizer.
+        optimizer_packets: Packets (PDU exchanges) of those calls.
+        optimizer_gap_bytes: Bytes those calls read only to bridge the gaps
+            between merged items.
+        stale_retries: Replies discarded because they answered an older request.
+        reconnects: Successful automatic reconnections.
+        heartbeat_failures: Failed heartbeat probes.
+        latency: Latency histogram per operation name, e.g. ``"read_area"``.
+    """
+
+    timestamp: float
+    pdus_sent: int
+    pdus_received: int
+    bytes_sent: int
+    bytes_received: int
+    optimizer_calls: int
+    optimizer_packets: int
+    optimizer_gap_bytes: int
+    stale_retries: int
+    reconnects: int
+    heartbeat_failures: int
+    latency: Mapping[str, HistogramSnapshot]
+
+    @property
+    def packets_per_call(self) -> float:
+        """Mean number of packets per optimized ``read_multi_vars`` call."""
+        return self.optimizer_packets / self.optimizer_calls if self.optimizer_calls else 0.0
+
+
+class ClientMetrics:
+    """Thread-safe performance counters of one client.
+
+    Connections count the PDUs and bytes they send and receive here; the
+    client records the latency of its operations and its retries.
+
+    Args:
+        buckets: Upper bounds of the latency buckets in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        LatencyHistogram(self.buckets)  # validate the bounds now, not on the first observation
+        self.id = next(_ids)
+        self._lock = threading.Lock()
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._pdus_sent = 0
+        self._pdus_received = 0
+        self._bytes_sent = 0
+        self._bytes_received = 0
+        self._optimizer_calls = 0
+        self._optimizer_packets = 0
+        self._optimizer_gap_bytes = 0
+        self._stale_retries = 0
+        self._reconnects = 0
+        self._heartbeat_failures = 0
+
+    def observe(self, operation: str, seconds: float) -> None:
+        """Count the latency of one completed operation."""
+        with self._lock:
+            histogram = self._latency.get(operation)
+            if histogram is None:
+                histogram = self._latency[operation] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count_sent(self, pdus: int, nbytes: int) -> None:
+        """Count PDUs sent in frames of *nbytes* bytes in total."""
+        with self._lock:
+            self._pdus_sent += pdus
+            self._bytes_sent += nbytes
+
+    def count_received(self, pdus: int, nbytes: int) -> None:
+        """Count PDUs received in frames of *nbytes* bytes in total."""
+        with self._lock:
+            self._pdus_received += pdus
+            self._bytes_received += nbytes
+
+    def count_plan(self, packets: int, gap_bytes: int) -> None:
+        """Count one optimized multi-read of *packets* packets that read *gap_bytes* unrequested bytes."""
+        with self._lock:
+            self._optimizer_calls += 1
+            self._optimizer_packets += packets
+            self._optimizer_gap_bytes += gap_bytes
+
+    def count_stale_retry(self) -> None:
+        with self._lock:
+            self._stale_retries += 1
+
+    def count_reconnect(self) -> None:
+        with self._lock:
+            self._reconnects += 1
+
+    def count_heartbeat_failure(self) -> None:
+        with self._lock:
+            self._heartbeat_failures += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Copy all counters at one point in time."""
+        with self._lock:
+            return MetricsSnapshot(
+                timestamp=time.time(),
+                pdus_sent=self._pdus_sent,
+                pdus_received=self._pdus_received,
+                bytes_sent=self._bytes_sent,
+                bytes_received=self._bytes_received,
+                optimizer_calls=self._optimizer_calls,
+                optimizer_packets=self._optimizer_packets,
+                optimizer_gap_bytes=self._optimizer_gap_bytes,
+                stale_retries=self._stale_retries,
+                reconnects=self._reconnects,
+                heartbeat_failures=self._heartbeat_failures,
+                latency={name: histogram.snapshot() for name, histogram in self._latency.items()},
+            )
+
+
+@dataclass(frozen=True)
+class ServerMetricsSnapshot:
+    """Copy of the counters of a :class:`ServerMetrics`.
+
+    Attributes:
+        timestamp: ``time.time()`` when the snapshot was taken.
+        requests: Requests handled per S7 function, e.g. ``"READ_AREA"``;
+            user data requests are counted as ``"USER_DATA"``.
+        request_latency: Histogram of the time from receiving a request to
+            sending its reply, per connected client (``"host:port"``).
+        lock_wait: Histogram of the time requests waited for an area lock,
+            per area (e.g. ``"DB1"``).
+    """
+
+    timestamp: float
+    requests: Mapping[str, int]
+    request_latency: Mapping[str, HistogramSnapshot]
+    lock_wait: Mapping[str, HistogramSnapshot]
+
+
+class ServerMetrics:
+    """Thread-safe performance counters of a server.
+
+    The latency of a client is dropped when it disconnects, so a server
+    with many short-lived clients does not accumulate histograms.
+
+    Args:
+        buckets: Upper bounds of the latency buckets in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        LatencyHistogram(self.buckets)
+        self.id = next(_ids)
+        self._lock = threading.Lock()
+        self._requests: dict[str, int] = {}
+        self._request_latency: dict[str, LatencyHistogram] = {}
+        self._lock_wait: dict[str, LatencyHistogram] = {}
+
+    def count_request(self, function: str) -> None:
+        """Count one request for an S7 function."""
+        with self._lock:
+            self._requests[function] = self._requests.get(function, 0) + 1
+
+    def observe_request(self, client: str, seconds: float) -> None:
+        """Count the time taken to answer one request of *client*."""
+        with self._lock:
+            self._observe(self._request_latency, client, seconds)
+
+    def observe_lock_wait(self, area: str, seconds: float) -> None:
+        """Count the time a request waited for the lock of *area*."""
+        with self._lock:
+            self._observe(self._lock_wait, area, seconds)
+
+    def drop_client(self, client: str) -> None:
+        """Forget the latency of a disconnected client."""
+        with self._lock:
+            self._request_latency.pop(client, None)
+
+    def _observe(self, histograms: dict[str, LatencyHistogram], key: str, seconds: float) -> None:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram(self.buckets)
+        histogram.observe(seconds)
+
+    def snapshot(self) -> ServerMetricsSnapshot:
+        """Copy all counters at one point in time."""
+        with self._lock:
+            return ServerMetricsSnapshot(
+                timestamp=time.time(),
+                requests=dict(self._requests),
+                request_latency={name: histogram.snapshot() for name, histogram in self._request_latency.items()},
+                lock_wait={name: histogram.snapshot() for name, histogram in self._lock_wait.items()},
+            )
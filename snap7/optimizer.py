@@ -3,6 +3,10 @@ Multi-variable read optimizer for S7 communication.
 
 Optimizes multiple scattered read requests into minimal PDU-packed S7 exchanges
 by merging adjacent/overlapping reads and packing them into PDU-sized packets.
+Multi-variable writes are packed the same way by :func:`packetize_writes`.
+BOOL tags sharing a byte are read once (:func:`coalesce_items`).
+:func:`choose_parameters` picks the merge parameters with the lowest expected
+time under a :class:`CostModel` measured by :class:`CostEstimator`.
 
 .. warning::
 
@@ -11,6 +15,7 @@ by merging adjacent/overlapping reads and packing them into PDU-sized packets.
 
 import logging
 from dataclasses import dataclass, field
+from typing import Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +77,38 @@ class ReadPacket:
     blocks: list[ReadBlock] = field(default_factory=list)
 
 
+@dataclass
+class WriteItem:
+    """A single write request from the caller.
+
+    Attributes:
+        area: S7Area value (e.g. 0x84 for DB).
+        db_number: DB number (0 for non-DB areas).
+        start: Start address (a bit address for ``S7WordLen.BIT`` items).
+        word_len: S7WordLen value used in the address specification.
+        data: Bytes to write.
+        index: Original ordering position so results can be returned in order.
+    """
+
+    area: int
+    db_number: int
+    start: int
+    word_len: int
+    data: bytes
+    index: int
+
+
+@dataclass
+class WritePacket:
+    """A group of WriteItems that fit in a single S7 PDU exchange.
+
+    Attributes:
+        items: The items in this packet.
+    """
+
+    items: list[WriteItem] = field(default_factory=list)
+
+
 def sort_items(items: list[ReadItem]) -> list[ReadItem]:
     """Sort read items for optimal merging.
 
@@ -88,6 +125,38 @@ def sort_items(items: list[ReadItem]) -> list[ReadItem]:
     return sorted(items, key=lambda i: (i.area, i.db_number, i.byte_offset, i.bit_offset, -i.byte_length))
 
 
+def coalesce_items(items: list[ReadItem]) -> tuple[list[ReadItem], list[int]]:
+    """Collapse items that read the same byte range into one item.
+
+    BOOL tags in the same byte differ only in ``bit_offset`` and all read
+    that one byte, so an alarm map of hundreds of bits needs only one item
+    per byte.  The kept items are renumbered in first-seen order.
+
+    Args:
+        items: Read items, indexed 0..n-1.
+
+    Returns:
+        The distinct items, and for every original item the index of the
+        distinct item that reads its bytes.
+    """
+    distinct: dict[tuple[int, int, int, int], ReadItem] = {}
+    item_map: list[int] = []
+    for item in items:
+        key = (item.area, item.db_number, item.byte_offset, item.byte_length)
+        kept = distinct.get(key)
+        if kept is None:
+            kept = distinct[key] = ReadItem(
+                area=item.area,
+                db_number=item.db_number,
+                byte_offset=item.byte_offset,
+                bit_offset=0,
+                byte_length=item.byte_length,
+                index=len(distinct),
+            )
+        item_map.append(kept.index)
+    return list(distinct.values()), item_map
+
+
 def merge_items(sorted_items: list[ReadItem], max_gap: int = 5, max_block_size: int = 462) -> list[ReadBlock]:
     """Merge sorted read items into contiguous blocks.
 
@@ -206,7 +275,7 @@ def _split_block(block: ReadBlock, max_block_size: int) -> list[ReadBlock]:
     return sub_blocks
 
 
-def packetize(blocks: list[ReadBlock], pdu_size: int) -> list[ReadPacket]:
+def packetize(blocks: list[ReadBlock], pdu_size: int, max_blocks: int = 20) -> list[ReadPacket]:
     """Pack blocks into PDU-sized packets.
 
     Two budgets are enforced per packet:
@@ -214,11 +283,13 @@ def packetize(blocks: list[ReadBlock], pdu_size: int) -> list[ReadPacket]:
       - **Reply budget**: ``12 (header) + 2 (func+count) + sum(4 + ceil_even(length)) <= pdu_size``
 
     Oversized blocks are first split at item boundaries, then blocks are
-    greedily packed into packets.
+    greedily packed into packets of at most *max_blocks* blocks.
 
     Args:
         blocks: Merged read blocks.
         pdu_size: Negotiated PDU size in bytes.
+        max_blocks: Maximum number of address specs per packet (the PLC's
+            per-request item limit).
 
     Returns:
         List of ReadPackets.
@@ -248,8 +319,9 @@ def packetize(blocks: list[ReadBlock], pdu_size: int) -> list[ReadPacket]:
 
         fits_request = current_req_used + req_cost <= pdu_size
         fits_reply = current_reply_used + reply_cost <= pdu_size
+        fits_count = len(current_packet.blocks) < max_blocks
 
-        if current_packet.blocks and (not fits_request or not fits_reply):
+        if current_packet.blocks and (not fits_request or not fits_reply or not fits_count):
             # Start a new packet
             packets.append(current_packet)
             current_packet = ReadPacket()
@@ -266,28 +338,294 @@ def packetize(blocks: list[ReadBlock], pdu_size: int) -> list[ReadPacket]:
     return packets
 
 
-def extract_results(packets: list[ReadPacket], original_count: int) -> list[bytearray]:
+@dataclass(frozen=True)
+class CostModel:
+    """Expected cost of S7 exchanges on a connection.
+
+    The time of one request/reply exchange is modelled as a fixed round-trip
+    time plus a cost per byte on the wire (request and reply).
+
+    Attributes:
+        rtt: Fixed cost of one round-trip, in seconds.
+        byte_time: Cost per transferred byte, in seconds.
+    """
+
+    rtt: float = 0.005
+    byte_time: float = 1e-6
+
+    def estimate(self, packets: Sequence[ReadPacket], depth: int = 1) -> float:
+        """Expected time to execute *packets* with up to *depth* of them in flight."""
+        rounds = -(-len(packets) // max(1, depth))
+        return rounds * self.rtt + sum(packet_bytes(packet) for packet in packets) * self.byte_time
+
+
+@dataclass(frozen=True)
+class PlanParameters:
+    """Merge parameters chosen for a read plan.
+
+    Attributes:
+        max_gap: Largest gap in bytes merged into a block.
+        max_block_size: Largest merged block in bytes.
+        packet_count: Number of packets in the plan.
+        estimated_time: Expected execution time in seconds under the cost
+            model the parameters were chosen with.
+    """
+
+    max_gap: int
+    max_block_size: int
+    packet_count: int
+    estimated_time: float
+
+
+class CostEstimator:
+    """Fit a :class:`CostModel` to timed exchanges on a live connection.
+
+    Each sample is the wall time of one request/reply exchange and the number
+    of bytes it moved.  A least-squares line through the samples gives the
+    round-trip time (intercept) and the per-byte cost (slope).  Older samples
+    fade out with *decay* so the model follows changing link conditions.
+
+    Args:
+        decay: Weight kept by the previous samples when a new one is added.
+        min_samples: Samples needed before :meth:`model` returns a model.
+    """
+
+    def __init__(self, decay: float = 0.98, min_samples: int = 8) -> None:
+        self.decay = decay
+        self.min_samples = min_samples
+        self.samples = 0
+        self._w = 0.0
+        self._x = 0.0
+        self._y = 0.0
+        self._xx = 0.0
+        self._xy = 0.0
+
+    def add_sample(self, size: int, elapsed: float) -> None:
+        """Record an exchange that moved *size* bytes in *elapsed* seconds."""
+        d = self.decay
+        self._w = self._w * d + 1.0
+        self._x = self._x * d + size
+        self._y = self._y * d + elapsed
+        self._xx = self._xx * d + size * size
+        self._xy = self._xy * d + size * elapsed
+        self.samples += 1
+
+    def model(self) -> Optional[CostModel]:
+        """The fitted cost model, or None until enough samples were recorded."""
+        if self.samples < self.min_samples:
+            return None
+
+        mean_x = self._x / self._w
+        mean_y = self._y / self._w
+        var_x = self._xx / self._w - mean_x * mean_x
+        if var_x < 1.0:
+            # All exchanges had about the same size: the per-byte cost cannot
+            # be separated from the round-trip, so keep the default for it.
+            byte_time = CostModel.byte_time
+        else:
+            byte_time = max(1e-9, (self._xy / self._w - mean_x * mean_y) / var_x)
+        return CostModel(rtt=max(0.0, mean_y - byte_time * mean_x), byte_time=byte_time)
+
+
+def packet_bytes(packet: ReadPacket) -> int:
+    """Bytes a read packet moves on the wire: request and reply PDU plus transport framing."""
+    framing = 7  # TPKT + COTP DT
+    request = 14 + 12 * len(packet.blocks)
+    reply = 14 + sum(4 + _ceil_even(block.byte_length) for block in packet.blocks)
+    return request + reply + 2 * framing
+
+
+def gap_bytes(packets: Sequence[ReadPacket]) -> int:
+    """Bytes the blocks of *packets* read that none of their items asked for."""
+    total = 0
+    for packet in packets:
+        for block in packet.blocks:
+            block_end = block.start_offset + block.byte_length
+            covered_end = block.start_offset
+            covered = 0
+            for item in sorted(block.items, key=lambda i: i.byte_offset):
+                start = max(item.byte_offset, covered_end)
+                end = min(item.byte_offset + item.byte_length, block_end)
+                if end > start:
+                    covered += end - start
+                    covered_end = end
+            total += block.byte_length - covered
+    return total
+
+
+# Gaps tried by :func:`choose_parameters`, in bytes
+_CANDIDATE_GAPS: tuple[int, ...] = (0, 2, 5, 8, 16, 32, 64, 128, 256, 512)
+
+
+def choose_parameters(
+    sorted_items: list[ReadItem],
+    pdu_size: int,
+    model: CostModel,
+    max_block_size: int,
+    max_blocks: int = 20,
+    depth: int = 1,
+) -> tuple[PlanParameters, list[ReadPacket]]:
+    """Choose gap merging and block splitting that minimize the expected read time.
+
+    Every candidate gap is combined with block size limits of the full
+    *max_block_size*, its half and its quarter; each combination is merged,
+    packetized and priced with :meth:`CostModel.estimate`.  On a slow link
+    a large gap that saves a packet wins, while on a fast link with a
+    relatively high per-byte cost reading gap bytes does not pay off.
+
+    Args:
+        sorted_items: Items pre-sorted by :func:`sort_items`.
+        pdu_size: Negotiated PDU size in bytes.
+        model: Cost model of the connection.
+        max_block_size: Largest block a single read can return.
+        max_blocks: Maximum number of address specs per packet.
+        depth: Number of packets that may be in flight at once.
+
+    Returns:
+        The chosen parameters and the packets they produce.
+    """
+    best: Optional[tuple[PlanParameters, list[ReadPacket]]] = None
+    block_sizes = sorted({max(1, max_block_size // divisor) for divisor in (1, 2, 4)}, reverse=True)
+    for max_gap in _CANDIDATE_GAPS:
+        if max_gap >= max_block_size:
+            break
+        for block_size in block_sizes:
+            blocks = merge_items(sorted_items, max_gap=max_gap, max_block_size=block_size)
+            packets = packetize(blocks, pdu_size, max_blocks=max_blocks)
+            cost = model.estimate(packets, depth)
+            if best is None or cost < best[0].estimated_time:
+                best = (PlanParameters(max_gap, block_size, len(packets), cost), packets)
+
+    if best is None:
+        return PlanParameters(0, max_block_size, 0, 0.0), []
+    return best
+
+
+def extract_results(
+    packets: Sequence[ReadPacket], original_count: int, buffers: Optional[Sequence[Sequence[bytearray]]] = None
+) -> list[bytearray]:
     """Map block buffers back to original items using offset math.
 
-    Each block must have its ``buffer`` attribute set (a bytearray of the
-    block's data as returned by the PLC) before calling this function.
-    The buffer is stored as a dynamic attribute on the ReadBlock dataclass.
+    Block data is taken from *buffers* when given (one sequence of block
+    data per packet, parallel to ``packet.blocks``), which leaves the packets
+    untouched so a cached plan can be shared between calls.  Otherwise each
+    block must have its ``buffer`` attribute set (a bytearray of the block's
+    data as returned by the PLC) before calling this function.
 
     Args:
-        packets: Packets with block buffers populated.
+        packets: Packets of the plan.
         original_count: Number of original read items.
+        buffers: Optional per-packet block data.
 
     Returns:
         List of bytearrays indexed by original ``ReadItem.index``.
     """
     results: list[bytearray] = [bytearray() for _ in range(original_count)]
 
-    for packet in packets:
-        for block in packet.blocks:
-            buf = block.buffer
+    for packet_index, packet in enumerate(packets):
+        for block_index, block in enumerate(packet.blocks):
+            buf = block.buffer if buffers is None else buffers[packet_index][block_index]
             for item in block.items:
                 local_offset = item.byte_offset - block.start_offset
                 item_data = buf[local_offset : local_offset + item.byte_length]
                 results[item.index] = bytearray(item_data)
 
     return results
+
+
+# Element size in bytes for word lengths whose start address counts elements
+# rather than bytes (timers and counters).
+_ELEMENT_SIZES: dict[int, int] = {0x1C: 2, 0x1D: 2}  # COUNTER, TIMER
+
+
+def _split_write_item(item: WriteItem, max_data_size: int) -> list[WriteItem]:
+    """Split an oversized write item into consecutive chunks.
+
+    All chunks keep the original ``index`` so their results can be folded
+    back onto the caller's item.
+
+    Args:
+        item: The item to split.
+        max_data_size: Maximum data bytes per chunk.
+
+    Returns:
+        List of items that each fit within *max_data_size*.
+    """
+    if len(item.data) <= max_data_size:
+        return [item]
+
+    element_size = _ELEMENT_SIZES.get(item.word_len, 1)
+    chunk_size = max(element_size, max_data_size - max_data_size % element_size)
+
+    return [
+        WriteItem(
+            area=item.area,
+            db_number=item.db_number,
+            start=item.start + offset // element_size,
+            word_len=item.word_len,
+            data=item.data[offset : offset + chunk_size],
+            index=item.index,
+        )
+        for offset in range(0, len(item.data), chunk_size)
+    ]
+
+
+def packetize_writes(items: list[WriteItem], pdu_size: int, max_items: int = 20) -> list[WritePacket]:
+    """Pack write items into PDU-sized packets.
+
+    Two budgets are enforced per packet:
+      - **Request budget**: ``12 (header) + 2 (func+count) + sum(12 (address spec) + 4 + ceil_even(length)) <= pdu_size``
+      - **Reply budget**: ``12 (header) + 2 (func+count) + N (return codes) <= pdu_size``
+
+    Items whose data would not fit in a packet on their own are first split
+    into consecutive chunks, then items are greedily packed into packets of at
+    most *max_items* items.  Unlike reads, writes are never merged: gap bytes
+    would overwrite PLC memory the caller did not ask to touch.
+
+    Args:
+        items: Write items in caller order.
+        pdu_size: Negotiated PDU size in bytes.
+        max_items: Maximum number of items per packet.
+
+    Returns:
+        List of WritePackets.
+    """
+    request_overhead = 14  # 12 header + 2 (func + count)
+    reply_overhead = 14  # 12 header + 2 (func + count)
+    item_overhead = 12 + 4  # address spec + data item header
+
+    # Largest even data size that fits in a single-item packet
+    max_single_item = pdu_size - request_overhead - item_overhead
+    max_single_item -= max_single_item % 2
+
+    all_items: list[WriteItem] = []
+    for item in items:
+        all_items.extend(_split_write_item(item, max_single_item))
+
+    packets: list[WritePacket] = []
+    current_packet = WritePacket()
+    current_req_used = request_overhead
+    current_reply_used = reply_overhead
+
+    for item in all_items:
+        req_cost = item_overhead + _ceil_even(len(item.data))
+        reply_cost = 1
+
+        fits_request = current_req_used + req_cost <= pdu_size
+        fits_reply = current_reply_used + reply_cost <= pdu_size
+        fits_count = len(current_packet.items) < max_items
+
+        if current_packet.items and (not fits_request or not fits_reply or not fits_count):
+            packets.append(current_packet)
+            current_packet = WritePacket()
+            current_req_used = request_overhead
+            current_reply_used = reply_overhead
+
+        current_packet.items.append(item)
+        current_req_used += req_cost
+        current_reply_used += reply_cost
+
+    if current_packet.items:
+        packets.append(current_packet)
+
+    return packets
@@ -20,6 +20,7 @@ from ctypes import c_int32, c_uint32
 
 from .connection import ISOTCPConnection
 from .error import S7Error, S7ConnectionError, S7TimeoutError
+from .metrics import ClientMetrics, track
 from .s7protocol import S7Protocol, S7PDUType
 from .type import Parameter
 
@@ -107,6 +108,10 @@ class Partner:
         self.last_send_time = 0
         self.last_recv_time = 0
 
+        # Latency histograms and traffic counters, see snap7.metrics
+        self.metrics = ClientMetrics()
+        track(self)
+
         # Callbacks
         self._recv_callback: Optional[Callable[[bytes], None]] = None
         self._send_callback_fn: Optional[Callable[[int], None]] = None
@@ -276,7 +281,9 @@ class Partner:
             self._parse_partner_ack(ack_data)
 
             self.bytes_sent += len(self._send_data)
-            self.last_send_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            elapsed = (datetime.now() - start_time).total_seconds()
+            self.last_send_time = int(elapsed * 1000)
+            self.metrics.observe("b_send", elapsed)
 
             logger.debug(f"Sent {len(self._send_data)} bytes synchronously")
             return 0
@@ -312,7 +319,9 @@ class Partner:
                 self._connection.send_data(ack)
 
             self.bytes_recv += len(received)
-            self.last_recv_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            elapsed = (datetime.now() - start_time).total_seconds()
+            self.last_recv_time = int(elapsed * 1000)
+            self.metrics.observe("b_recv", elapsed)
             self._recv_data = received
             self._recv_r_id = r_id
 
@@ -645,6 +654,7 @@ class Partner:
         self._connection = ISOTCPConnection(
             host=self.remote_ip, port=self.port, local_tsap=self.local_tsap, remote_tsap=self.remote_tsap
         )
+        self._connection.metrics = self.metrics
 
         self._connection.connect()
         self._socket = self._connection.socket
@@ -693,6 +703,7 @@ class Partner:
                     host=addr[0], port=addr[1], local_tsap=self.local_tsap, remote_tsap=self.remote_tsap
                 )
                 self._connection.socket = client_sock
+                self._connection.metrics = self.metrics
 
                 # Handle COTP Connection Request from active partner
                 self._handle_cotp_cr(client_sock)
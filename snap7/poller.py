@@ -0,0 +1,536 @@
+"""
+Cyclic tag polling for the classic S7 client.
+
+S7-300/400 CPUs have no subscription mechanism, so values are acquired by
+reading them periodically. :class:`Poller` runs that loop for any number of
+tag groups, each with its own scan interval, on one :class:`~snap7.client.Client`.
+
+Groups that are due at the same time are read together in one optimized
+request, so a 100 ms group and a 1 s group cost one exchange (not two) on the
+ticks where both are due. Tags are parsed and the request layout is built
+once per combination of groups, and the client caches the compiled plan for
+each layout.
+
+Groups can report changes only: each block read from the PLC is compared
+with the bytes of the previous scan, and only tags whose bytes changed are
+decoded, optionally filtered by an absolute or percent deadband.
+
+Example::
+
+    from snap7 import Client, Poller
+
+    client = Client()
+    client.connect("192.168.1.10", 0, 1)
+
+    poller = Poller(client)
+    poller.add_group("fast", ["DB1.DBD0:REAL", "DB1.DBX4.0:BOOL"], interval=0.1, callback=print)
+    poller.add_group("slow", {"temperature": "DB2.DBW0:INT"}, interval=1.0, deadband=0.5)
+    poller.start()
+    result = poller.queue.get()  # results of groups without a callback
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from queue import Empty, Full, Queue
+from types import TracebackType
+from typing import Any, Callable, Mapping, Optional, Sequence, Type, Union
+
+from .client import Client, _decode_tag, _OptimizationPlan
+from .error import S7Error
+from .tags import Tag
+from .type import Area
+
+logger = logging.getLogger(__name__)
+
+TagSpec = Union[Sequence[Union[Tag, str]], Mapping[str, Union[Tag, str]]]
+
+DEADBAND_TYPES = ("absolute", "percent")
+
+
+@dataclass(frozen=True)
+class PollResult:
+    """Values of one tag group from one scan.
+
+    Attributes:
+        group: Name of the tag group.
+        values: Decoded values keyed by tag name, in the order the tags were
+            added.  For change-only groups, just the tags that changed.
+        timestamp: Wall-clock time (``time.time()``) at which the read completed.
+        error: The exception raised by the read, or None.  When set, *values* is empty.
+    """
+
+    group: str
+    values: dict[str, Any]
+    timestamp: float
+    error: Optional[Exception] = None
+
+
+@dataclass
+class PollGroup:
+    """A set of tags scanned at a common interval.
+
+    Attributes:
+        name: Group name, used in :class:`PollResult`.
+        tags: Resolved tags keyed by name.
+        interval: Scan interval in seconds.
+        callback: Called with each :class:`PollResult`; if None, results go to :attr:`Poller.queue`.
+        changes_only: Report only tags whose value changed since it was last reported.
+        deadband: Minimum change of a numeric tag before it is reported again
+            (change-only groups); 0 reports every change.
+        deadband_type: ``"absolute"``, or ``"percent"`` of the last reported value.
+        cycles: Number of scans performed.
+        overruns: Number of scans skipped because the previous one finished too late.
+        errors: Number of scans that failed.
+    """
+
+    name: str
+    tags: dict[str, Tag]
+    interval: float
+    callback: Optional[Callable[[PollResult], None]] = None
+    changes_only: bool = False
+    deadband: float = 0.0
+    deadband_type: str = "absolute"
+    cycles: int = 0
+    overruns: int = 0
+    errors: int = 0
+    # Scheduling grid: the group is due at origin + slot * interval
+    _origin: float = field(default=0.0, repr=False)
+    _slot: int = field(default=0, repr=False)
+    _items: list[dict[str, Any]] = field(default_factory=list, repr=False)
+    # Change detection: bytes last read and value last reported, per tag
+    _raw: dict[str, bytes] = field(default_factory=dict, repr=False)
+    _reported: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def next_due(self) -> float:
+        """Monotonic time at which the next scan is due."""
+        return self._origin + self._slot * self.interval
+
+    def advance(self, finished: float) -> int:
+        """Count a scan that finished at monotonic time *finished* and move to the next slot.
+
+        Slots that passed while the scan ran are skipped rather than caught
+        up, and counted in :attr:`overruns`.
+
+        Returns:
+            The number of slots skipped.
+        """
+        self.cycles += 1
+        self._slot += 1
+        if self.next_due > finished:
+            return 0
+        missed = int((finished - self.next_due) // self.interval) + 1
+        self.overruns += missed
+        self._slot += missed
+        return missed
+
+    def _exceeds_deadband(self, name: str, value: Any) -> bool:
+        """Whether *value* differs enough from the last reported value of tag *name*."""
+        if name not in self._reported:
+            return True
+        last = self._reported[name]
+        if self.deadband <= 0 or isinstance(value, bool) or not isinstance(value, (int, float)):
+            return bool(value != last)
+        change = abs(value - last)
+        if self.deadband_type == "percent":
+            return bool(change > abs(last) * self.deadband / 100) if last else bool(change)
+        return bool(change > self.deadband)
+
+
+@dataclass
+class _Entry:
+    """Where one tag of a group sits inside a block of a layout."""
+
+    group: PollGroup
+    name: str
+    tag: Tag
+    offset: int
+    size: int
+
+
+@dataclass
+class _Layout:
+    """Combined request of the groups due on a tick, with its change-detection state.
+
+    ``blocks`` lists the tags found in each block read by the plan (one
+    block per item when the client's optimizer is disabled).  ``snapshot``
+    holds the bytes of every block from the last scan with this layout, and
+    ``cycles`` the cycle count each group will have if its next scan uses
+    this layout again; only then is the snapshot still the latest data of
+    the group and an unchanged block can be skipped as a whole.
+    """
+
+    groups: list[PollGroup]
+    items: list[dict[str, Any]]
+    plan: Optional[_OptimizationPlan] = None
+    blocks: list[list[_Entry]] = field(default_factory=list)
+    snapshot: list[Optional[bytes]] = field(default_factory=list)
+    cycles: dict[str, int] = field(default_factory=dict)
+
+    def bind(self, plan: Optional[_OptimizationPlan]) -> None:
+        """Map the tags onto the blocks of *plan* (or onto one block per item if None)."""
+        owners = [(g, name, tag) for g in self.groups for name, tag in g.tags.items()]
+        if plan is None:
+            self.blocks = [[_Entry(g, name, tag, 0, tag.size)] for g, name, tag in owners]
+        else:
+            # Distinct plan item -> (block number, offset within the block)
+            located: dict[int, tuple[int, int]] = {}
+            block_number = 0
+            for packet in plan.packets:
+                for block in packet.blocks:
+                    for item in block.items:
+                        located[item.index] = (block_number, item.byte_offset - block.start_offset)
+                    block_number += 1
+            self.blocks = [[] for _ in range(block_number)]
+            for index, (g, name, tag) in enumerate(owners):
+                number, offset = located[index if plan.item_map is None else plan.item_map[index]]
+                self.blocks[number].append(_Entry(g, name, tag, offset, tag.size))
+        self.plan = plan
+        self.snapshot = [None] * len(self.blocks)
+        self.cycles = {}
+
+
+def _resolve_tags(tags: TagSpec) -> dict[str, Tag]:
+    """Parse a tag list or mapping into ``{name: Tag}``."""
+    if isinstance(tags, Mapping):
+        pairs = list(tags.items())
+    else:
+        pairs = [(t if isinstance(t, str) else (t.name or str(t)), t) for t in tags]
+
+    resolved: dict[str, Tag] = {}
+    for name, tag in pairs:
+        if name in resolved:
+            raise ValueError(f"Duplicate tag name {name!r}")
+        resolved[name] = Tag.from_string(tag) if isinstance(tag, str) else tag
+    return resolved
+
+
+def _group_items(resolved: dict[str, Tag]) -> list[dict[str, Any]]:
+    """Build the ``read_multi_vars`` items of a group's tags, in tag order."""
+    for name, tag in resolved.items():
+        if tag.is_symbolic:
+            raise ValueError(f"Tag {name!r} uses symbolic access, which the classic client cannot poll")
+    return [
+        {"area": Area(t.area), "db_number": t.db_number, "start": t.byte_offset, "size": t.size, "bit": t.bit}
+        for t in resolved.values()
+    ]
+
+
+def _new_group(
+    name: str,
+    tags: TagSpec,
+    interval: float,
+    callback: Optional[Callable[[PollResult], None]] = None,
+    changes_only: bool = False,
+    deadband: float = 0.0,
+    deadband_type: str = "absolute",
+) -> PollGroup:
+    """Validate the arguments of ``add_group`` and build the group, with its first scan due now."""
+    if interval <= 0:
+        raise ValueError(f"Interval must be positive, got {interval}")
+    if deadband < 0 or deadband_type not in DEADBAND_TYPES:
+        raise ValueError(f"Invalid deadband {deadband!r} ({deadband_type!r}); expected >= 0, one of {DEADBAND_TYPES}")
+    resolved = _resolve_tags(tags)
+    group = PollGroup(
+        name,
+        resolved,
+        interval,
+        callback,
+        changes_only=changes_only or deadband > 0,
+        deadband=deadband,
+        deadband_type=deadband_type,
+        _origin=time.monotonic(),
+    )
+    group._items = _group_items(resolved)
+    return group
+
+
+def _put_dropping_oldest(queue: "Union[Queue[Any], asyncio.Queue[Any]]", item: Any) -> None:
+    """Put *item* on *queue* without blocking, discarding the oldest entries while it is full."""
+    while True:
+        try:
+            queue.put_nowait(item)
+            return
+        except (Full, asyncio.QueueFull):
+            try:
+                queue.get_nowait()
+            except (Empty, asyncio.QueueEmpty):
+                pass
+
+
+class Poller:
+    """Reads tag groups cyclically, each at its own interval.
+
+    Scheduling is drift-free: scan *n* of a group is due at
+    ``start + n * interval`` regardless of how long earlier scans took.  If a
+    scan finishes after one or more later scans were due, those scans are
+    skipped (not run back to back) and counted in :attr:`PollGroup.overruns`.
+
+    Groups due on the same tick are merged into one optimized read.  Groups
+    whose due times lie within :attr:`MERGE_WINDOW` of each other count as
+    the same tick.
+
+    For change-only groups, every block read is compared with the bytes it
+    held on the previous scan.  Tags in unchanged blocks are neither decoded
+    nor reported, and a scan with no changes delivers no result at all.
+
+    Args:
+        client: Connected client to read with.  The poller thread is its only
+            user while running; other threads should not share it.
+        queue_size: Maximum number of results held in :attr:`queue`; 0 means
+            unbounded.  When full, the oldest result is discarded.
+
+    Examples:
+        >>> poller = snap7.Poller(client)
+        >>> poller.add_group("fast", ["DB1.DBW0:INT"], interval=0.1, callback=print)
+        >>> with poller:
+        ...     time.sleep(1)
+    """
+
+    MERGE_WINDOW = 0.002
+    MAX_LAYOUTS = 64
+
+    def __init__(self, client: Client, queue_size: int = 0) -> None:
+        self.client = client
+        self.queue: "Queue[PollResult]" = Queue(maxsize=queue_size)
+        self.encoding = "latin-1"
+        self._groups: dict[str, PollGroup] = {}
+        # Request layout per combination of due groups
+        self._layouts: dict[tuple[str, ...], _Layout] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def __enter__(self) -> "Poller":
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.stop()
+
+    @property
+    def groups(self) -> dict[str, PollGroup]:
+        """The registered groups, keyed by name."""
+        with self._lock:
+            return dict(self._groups)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_group(
+        self,
+        name: str,
+        tags: TagSpec,
+        interval: float,
+        callback: Optional[Callable[[PollResult], None]] = None,
+        changes_only: bool = False,
+        deadband: float = 0.0,
+        deadband_type: str = "absolute",
+    ) -> PollGroup:
+        """Register a tag group.
+
+        Args:
+            name: Unique group name.
+            tags: Tags or address strings, named by their ``name`` (or
+                address), or a mapping of names to tags or address strings.
+            interval: Scan interval in seconds.
+            callback: Called with each :class:`PollResult` from the polling
+                thread.  If None, results are put on :attr:`queue`.
+            changes_only: Report only the tags that changed.  The first
+                scan reports every tag.
+            deadband: Minimum change of a numeric (non-BOOL) tag before it
+                is reported again.  A nonzero deadband implies *changes_only*.
+            deadband_type: ``"absolute"`` or ``"percent"`` (of the last
+                reported value).
+
+        Returns:
+            The new group.  The first scan is due immediately.
+
+        Raises:
+            ValueError: If the name is taken, the interval is not positive,
+                the deadband is invalid, a tag name is repeated or a tag uses
+                symbolic access.
+        """
+        group = _new_group(name, tags, interval, callback, changes_only, deadband, deadband_type)
+        with self._lock:
+            if name in self._groups:
+                raise ValueError(f"Group {name!r} already exists")
+            self._groups[name] = group
+            self._layouts.clear()
+        return group
+
+    def remove_group(self, name: str) -> None:
+        """Unregister a tag group.
+
+        Raises:
+            KeyError: If there is no group with that name.
+        """
+        with self._lock:
+            del self._groups[name]
+            self._layouts.clear()
+
+    def poll(self, now: Optional[float] = None) -> list[PollResult]:
+        """Scan all groups that are due and deliver their results.
+
+        This is one tick of the background loop; call it directly to drive
+        the poller from an existing loop instead of :meth:`start`.
+
+        Args:
+            now: Monotonic time of the tick.  Defaults to ``time.monotonic()``.
+
+        Returns:
+            The results delivered on this tick: one per scanned group, except
+            change-only groups in which nothing changed.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            due = [g for g in self._groups.values() if g.next_due <= now + self.MERGE_WINDOW]
+            if not due:
+                return []
+            key = tuple(g.name for g in due)
+            layout = self._layouts.get(key)
+            if layout is None:
+                if len(self._layouts) >= self.MAX_LAYOUTS:
+                    self._layouts.clear()
+                layout = _Layout(due, [item for g in due for item in g._items])
+                self._layouts[key] = layout
+
+        results = self._scan(layout)
+        finished = time.monotonic()
+
+        for group in due:
+            missed = group.advance(finished)
+            if missed:
+                logger.debug(f"Poll group {group.name!r} overran by {missed} cycle(s)")
+        for group, result in results:
+            self._deliver(group, result)
+        return [result for _, result in results]
+
+    def _read(self, layout: _Layout) -> list[bytearray]:
+        """Read the blocks of *layout*, re-mapping it if the client planned it differently."""
+        client = self.client
+        if not client.use_optimizer:
+            if layout.plan is not None or not layout.blocks:
+                layout.bind(None)
+            _code, data_list = client.read_multi_vars(layout.items)
+            return list(data_list)
+
+        plan = client._optimization_plan(layout.items)
+        if plan is not layout.plan:
+            layout.bind(plan)
+        return [data for packet_data in client._read_plan(plan) for data in packet_data]
+
+    def _scan(self, layout: _Layout) -> list[tuple[PollGroup, PollResult]]:
+        """Read the tags of the groups in *layout* with one request and decode them per group."""
+        due = layout.groups
+        try:
+            blocks = self._read(layout)
+        except (S7Error, OSError) as e:
+            logger.warning(f"Poll of {', '.join(g.name for g in due)} failed: {e}")
+            timestamp = time.time()
+            for group in due:
+                group.errors += 1
+            return [(g, PollResult(g.name, {}, timestamp, e)) for g in due]
+
+        timestamp = time.time()
+        values: dict[str, dict[str, Any]] = {g.name: {} for g in due}
+        for number, (entries, data) in enumerate(zip(layout.blocks, blocks)):
+            # Skip the whole block if it is byte-identical to the last scan and
+            # no group in it has been scanned through another layout since
+            previous = layout.snapshot[number]
+            unchanged = (
+                previous is not None
+                and all(layout.cycles.get(e.group.name) == e.group.cycles for e in entries)
+                and data == previous
+            )
+            view = memoryview(data)
+            for entry in entries:
+                group = entry.group
+                if not group.changes_only:
+                    values[group.name][entry.name] = _decode_tag(
+                        entry.tag, data[entry.offset : entry.offset + entry.size], self.encoding
+                    )
+                    continue
+                if unchanged:
+                    continue
+                raw = view[entry.offset : entry.offset + entry.size]
+                last_raw = group._raw.get(entry.name)
+                if last_raw is not None and raw == last_raw:
+                    continue
+                group._raw[entry.name] = raw.tobytes()
+                value = _decode_tag(entry.tag, bytearray(raw), self.encoding)
+                if group._exceeds_deadband(entry.name, value):
+                    group._reported[entry.name] = value
+                    values[group.name][entry.name] = value
+            layout.snapshot[number] = bytes(data)
+        layout.cycles = {g.name: g.cycles + 1 for g in due}
+
+        # Keep the tag order of each group; change-only groups without changes report nothing
+        results = []
+        for group in due:
+            group_values = values[group.name]
+            if group.changes_only:
+                if not group_values:
+                    continue
+                group_values = {name: group_values[name] for name in group.tags if name in group_values}
+            else:
+                group_values = {name: group_values[name] for name in group.tags}
+            results.append((group, PollResult(group.name, group_values, timestamp)))
+        return results
+
+    def _deliver(self, group: PollGroup, result: PollResult) -> None:
+        """Pass *result* to the group's callback, or put it on the queue."""
+        if group.callback is not None:
+            try:
+                group.callback(result)
+            except Exception:
+                logger.exception(f"Poll callback of group {group.name!r} failed")
+            return
+        _put_dropping_oldest(self.queue, result)
+
+    def start(self) -> None:
+        """Start polling in a background thread.
+
+        Every group's schedule restarts from now, so all groups are scanned
+        on the first tick.
+        """
+        if self.running:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for group in self._groups.values():
+                group._origin = now
+                group._slot = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="s7-poller")
+        self._thread.start()
+        logger.debug(f"Poller started with {len(self._groups)} group(s)")
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the background thread, waiting up to *timeout* seconds for the current scan."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.debug("Poller stopped")
+
+    def _run(self) -> None:
+        """Background loop: scan the due groups, then sleep until the next one is due."""
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Poller tick failed")
+            with self._lock:
+                next_due = min((g.next_due for g in self._groups.values()), default=None)
+            delay = 0.1 if next_due is None else next_due - time.monotonic()
+            if delay > 0 and self._stop_event.wait(timeout=delay):
+                break
@@ -0,0 +1,200 @@
+"""
+Shared, long-lived connections to many PLCs for sync code.
+
+Opening a connection costs a TCP handshake, the COTP connect and the S7
+setup communication, which is often more than the read that follows.
+:class:`ClientPool` keeps one connected :class:`~snap7.client.Client` per
+(host, rack, slot) and hands it to every caller that needs that PLC.  It can
+also fan one operation out over many PLCs on a bounded thread pool.
+
+Example::
+
+    from snap7 import ClientPool
+
+    with ClientPool(max_workers=16) as pool:
+        plcs = [("10.0.0.1", 0, 1), ("10.0.0.2", 0, 1)]
+        for target, result in pool.read_tags(plcs, ["DB1.DBW0:INT", "DB1.DBD2:REAL"]).items():
+            print(target, result.error or result.value)
+
+        with pool.session("10.0.0.1", 0, 1) as client:
+            client.db_write(1, 0, bytearray(b"\\x00\\x01"))
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Callable, Generic, Iterator, Optional, Sequence, Type, TypeVar, Union
+
+from .client import Client
+from .error import S7ConnectionError
+from .tags import Tag
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# A PLC is identified by (host, rack, slot)
+Target = tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class PoolResult(Generic[_T]):
+    """Outcome of an operation on one PLC of a fan-out.
+
+    Attributes:
+        target: The PLC as ``(host, rack, slot)``.
+        value: What the operation returned, or None if it failed.
+        error: The exception the operation raised, or None.
+    """
+
+    target: Target
+    value: Optional[_T] = None
+    error: Optional[Exception] = None
+
+
+class _Member:
+    """A pooled client and the lock that gives one caller at a time access to it."""
+
+    def __init__(self, client: Client) -> None:
+        self.client = client
+        self.lock = threading.Lock()
+
+
+class ClientPool:
+    """Long-lived clients for many PLCs, shared between callers.
+
+    Each (host, rack, slot) gets one :class:`~snap7.client.Client`, created
+    and connected on first use and kept connected afterwards.  A caller gets
+    the client for the duration of a :meth:`session`, during which no other
+    caller uses it.  If an operation fails because the connection dropped,
+    the client is disconnected and the next session connects it again.
+
+    Args:
+        max_workers: Size of the thread pool used by :meth:`run`, i.e. the
+            maximum number of PLCs worked on at the same time.
+        tcp_port: TCP port of the PLCs.
+        **client_kwargs: Passed to every :class:`~snap7.client.Client`, e.g.
+            ``auto_reconnect`` or ``heartbeat_interval``.
+    """
+
+    def __init__(self, max_workers: int = 16, tcp_port: int = 102, **client_kwargs: Any) -> None:
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+        self.tcp_port = tcp_port
+        self._client_kwargs = client_kwargs
+        self._members: dict[Target, _Member] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    @property
+    def targets(self) -> list[Target]:
+        """The PLCs the pool holds a client for."""
+        with self._lock:
+            return list(self._members)
+
+    def _member(self, target: Target) -> _Member:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ClientPool is closed")
+            member = self._members.get(target)
+            if member is None:
+                member = _Member(Client(**self._client_kwargs))
+                self._members[target] = member
+            return member
+
+    @contextmanager
+    def session(self, host: str, rack: int, slot: int) -> Iterator[Client]:
+        """Exclusive use of the pooled client of a PLC, connected.
+
+        Blocks while another caller uses the same PLC.  Connection errors
+        raised inside the block disconnect the client before propagating.
+
+        Raises:
+            S7ConnectionError: If the PLC cannot be connected.
+        """
+        target = (host, rack, slot)
+        member = self._member(target)
+        with member.lock:
+            client = member.client
+            if not client.get_connected():
+                client.connect(host, rack, slot, self.tcp_port)
+                logger.debug(f"Pooled connection to {host} rack {rack} slot {slot} opened")
+            try:
+                yield client
+            except (S7ConnectionError, OSError):
+                client.disconnect()
+                raise
+
+    def run(self, targets: Sequence[Target], operation: Callable[[Client], _T]) -> dict[Target, PoolResult[_T]]:
+        """Run *operation* on the pooled client of every target, in parallel.
+
+        At most :attr:`max_workers` PLCs are worked on at the same time.  An
+        operation that fails only fails its own target.
+
+        Args:
+            targets: PLCs as ``(host, rack, slot)``.
+            operation: Called with a connected client; its return value is
+                the target's result.
+
+        Returns:
+            One :class:`PoolResult` per target, in the order of *targets*.
+        """
+
+        def run_one(target: Target) -> PoolResult[_T]:
+            try:
+                with self.session(*target) as client:
+                    return PoolResult(target, value=operation(client))
+            except Exception as e:
+                logger.warning(f"Pooled operation on {target[0]} rack {target[1]} slot {target[2]} failed: {e}")
+                return PoolResult(target, error=e)
+
+        unique = list(dict.fromkeys(targets))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ClientPool is closed")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="s7-pool")
+            executor = self._executor
+        return dict(zip(unique, executor.map(run_one, unique)))
+
+    def read_tags(
+        self, targets: Sequence[Target], tags: "list[Union[Tag, str]]", encoding: str = "latin-1"
+    ) -> dict[Target, PoolResult[list[Any]]]:
+        """Read the same tags from every target; see :meth:`run`."""
+        return self.run(targets, lambda client: client.read_tags(tags, encoding=encoding))
+
+    def discard(self, host: str, rack: int, slot: int) -> None:
+        """Disconnect a PLC and drop its client from the pool.
+
+        Waits until the current session on it, if any, has ended.
+        """
+        with self._lock:
+            member = self._members.pop((host, rack, slot), None)
+        if member is not None:
+            with member.lock:
+                member.client.disconnect()
+
+    def close(self) -> None:
+        """Wait for running operations, then disconnect every client."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+            members, self._members = list(self._members.values()), {}
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for member in members:
+            with member.lock:
+                member.client.disconnect()
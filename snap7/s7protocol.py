@@ -7,7 +7,7 @@ Handles S7 PDU encoding/decoding and protocol operations.
 import struct
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Union
 from enum import IntEnum
 
 from .datatypes import S7Area, S7WordLen, S7DataTypes
@@ -116,6 +116,72 @@ _HOT_START_PARAMS = bytes.fromhex("28000000000000fd000009") + b"P_PROGRAM"
 _COLD_START_PARAMS = bytes.fromhex("28000000000000fd0002432009") + b"P_PROGRAM"
 
 
+# Precompiled layouts for the read reply fast path (see S7Protocol.parse_read_reply)
+_ACK_HEADER = struct.Struct(">BBHHHHBB")  # protocol id, type, reserved, sequence, param len, data len, error class/code
+_FUNCTION_ITEM_COUNT = struct.Struct(">BB")  # function code, item count
+_DATA_ITEM_HEADER = struct.Struct(">BBH")  # return code, transport size, length
+
+_PDU_REFERENCE = struct.Struct(">H")
+_PDU_REFERENCE_OFFSET = 4  # Offset of the PDU reference (sequence) in the S7 header
+
+# Map word_len to data section transport size.
+# Data section uses different transport size codes than address specification:
+# - 0x03 = BIT
+# - 0x04 = BYTE/WORD/DWORD (byte-oriented data)
+# - 0x05 = INT
+# - 0x06 = DINT
+# - 0x07 = REAL
+# - 0x09 = OCTET STRING
+_WRITE_TRANSPORT_SIZES: Dict[int, int] = {
+    S7WordLen.BIT: 0x03,
+    S7WordLen.BYTE: 0x04,
+    S7WordLen.CHAR: 0x04,
+    S7WordLen.WORD: 0x04,
+    S7WordLen.INT: 0x05,
+    S7WordLen.DWORD: 0x04,
+    S7WordLen.DINT: 0x06,
+    S7WordLen.REAL: 0x07,
+    S7WordLen.COUNTER: 0x04,
+    S7WordLen.TIMER: 0x04,
+}
+
+
+class RequestTemplate:
+    """A request compiled once, transport framing included, for repeated sends.
+
+    Polling the same addresses produces byte-identical requests except for
+    the PDU reference, so instead of encoding the request again on every
+    send only the sequence number is patched into the reusable frame.
+
+    Attributes:
+        frame: The complete frame as sent on the wire.
+        header_size: Number of framing bytes in front of the S7 PDU.
+        sequence: PDU reference of the last :meth:`stamp`.
+    """
+
+    __slots__ = ("frame", "header_size", "sequence")
+
+    def __init__(self, frame: bytearray, header_size: int = 0) -> None:
+        self.frame = frame
+        self.header_size = header_size
+        self.sequence: int = _PDU_REFERENCE.unpack_from(frame, header_size + _PDU_REFERENCE_OFFSET)[0]
+
+    @property
+    def pdu(self) -> memoryview:
+        """View of the S7 PDU inside the frame."""
+        return memoryview(self.frame)[self.header_size :]
+
+    def stamp(self, sequence: int) -> bytearray:
+        """Patch *sequence* into the frame in place and return the frame."""
+        _PDU_REFERENCE.pack_into(self.frame, self.header_size + _PDU_REFERENCE_OFFSET, sequence)
+        self.sequence = sequence
+        return self.frame
+
+    def copy(self) -> "RequestTemplate":
+        """A separate template with the same frame, to stamp and send without touching this one."""
+        return RequestTemplate(bytearray(self.frame), self.header_size)
+
+
 class S7Protocol:
     """
     S7 protocol implementation.
@@ -131,6 +197,14 @@ class S7Protocol:
         self.sequence = (self.sequence + 1) & 0xFFFF
         return self.sequence
 
+    def stamp_request(self, template: RequestTemplate) -> bytearray:
+        """Give a compiled request the next sequence number.
+
+        Returns:
+            The template's frame, ready to send.
+        """
+        return template.stamp(self._next_sequence())
+
     def validate_pdu_reference(self, response_sequence: int) -> None:
         """Validate the PDU reference number from a response.
 
@@ -330,27 +404,7 @@ class S7Protocol:
         address_spec = S7DataTypes.encode_address(area, db_number, start, word_len, count)
         parameters += address_spec[1:]  # Skip first byte
 
-        # Map word_len to data section transport size
-        # Data section uses different transport size codes than address specification:
-        # - 0x03 = BIT
-        # - 0x04 = BYTE/WORD/DWORD (byte-oriented data)
-        # - 0x05 = INT
-        # - 0x06 = DINT
-        # - 0x07 = REAL
-        # - 0x09 = OCTET STRING
-        transport_size_map = {
-            S7WordLen.BIT: 0x03,
-            S7WordLen.BYTE: 0x04,
-            S7WordLen.CHAR: 0x04,
-            S7WordLen.WORD: 0x04,
-            S7WordLen.INT: 0x05,
-            S7WordLen.DWORD: 0x04,
-            S7WordLen.DINT: 0x06,
-            S7WordLen.REAL: 0x07,
-            S7WordLen.COUNTER: 0x04,
-            S7WordLen.TIMER: 0x04,
-        }
-        transport_size = transport_size_map.get(word_len, 0x04)
+        transport_size = _WRITE_TRANSPORT_SIZES.get(word_len, 0x04)
 
         # Data section
         data_section = (
@@ -365,6 +419,79 @@ class S7Protocol:
 
         return header + parameters + data_section
 
+    def build_multi_write_request(self, items: List[Tuple[int, int, int, int, bytes]]) -> bytes:
+        """Build S7 multi-variable write request PDU.
+
+        Encodes several address specifications and their data items into a
+        single WRITE_AREA request.  The PLC answers with one return code per
+        item (see :meth:`extract_multi_write_results`).
+
+        Args:
+            items: List of (area, db_number, start, word_len, data) tuples.
+                For ``S7WordLen.BIT`` items *start* is a bit address
+                (``byte * 8 + bit``) and *data* holds one byte per bit.
+
+        Returns:
+            Complete S7 PDU.
+        """
+        item_count = len(items)
+
+        addr_spec_parts: list[bytes] = []
+        data_parts: list[bytes] = []
+        for i, (area_code, db_number, start, word_len, data) in enumerate(items):
+            s7_word_len = S7WordLen(word_len)
+            if s7_word_len == S7WordLen.BIT:
+                count = len(data)
+                bit_length = len(data)  # Bit transport: length is the number of bits
+            else:
+                count = len(data) // S7DataTypes.get_size_bytes(s7_word_len, 1)
+                bit_length = len(data) * 8
+            addr_spec_parts.append(S7DataTypes.encode_address(S7Area(area_code), db_number, start, s7_word_len, count))
+
+            transport_size = _WRITE_TRANSPORT_SIZES.get(s7_word_len, 0x04)
+            data_parts.append(struct.pack(">BBH", 0x00, transport_size, bit_length) + data)
+            # Fill byte for even alignment (not after the last item)
+            if i < item_count - 1 and len(data) % 2 != 0:
+                data_parts.append(b"\x00")
+
+        # Parameter: function_code(1) + item_count(1) + N * address_spec(12)
+        param_data = struct.pack(">BB", S7Function.WRITE_AREA, item_count) + b"".join(addr_spec_parts)
+        data_section = b"".join(data_parts)
+
+        header = struct.pack(
+            ">BBHHHH",
+            0x32,  # Protocol ID
+            S7PDUType.REQUEST,  # PDU type
+            0x0000,  # Reserved
+            self._next_sequence(),  # Sequence
+            len(param_data),  # Parameter length
+            len(data_section),  # Data length
+        )
+
+        return header + param_data + data_section
+
+    def extract_multi_write_results(self, response: Dict[str, Any], item_count: int) -> List[int]:
+        """Extract per-item return codes from a multi-variable write response.
+
+        The data section of a WRITE_AREA response holds one return code byte
+        per item (``0xFF`` = success).
+
+        Args:
+            response: Parsed S7 response from :meth:`parse_response`.
+            item_count: Number of items in the request.
+
+        Returns:
+            List of return codes, one per item in request order.
+
+        Raises:
+            ~snap7.error.S7ProtocolError: If the response does not contain a
+                return code for every item.
+        """
+        raw = response.get("raw_data", b"")
+        if len(raw) < item_count:
+            raise S7ProtocolError(f"Multi-write response has {len(raw)} return codes, expected {item_count}")
+        return list(raw[:item_count])
+
     def build_setup_communication_request(self, max_amq_caller: int = 1, max_amq_callee: int = 1, pdu_length: int = 480) -> bytes:
         """
         Build S7 setup communication request.
@@ -1592,6 +1719,60 @@ class S7Protocol:
 
         return response
 
+    def parse_read_reply(self, pdu: Union[bytes, bytearray, memoryview]) -> Tuple[int, memoryview]:
+        """Decode a single-item READ_AREA reply without building dicts.
+
+        Fast path for the hot read case: validates the header, error class,
+        function code and item return code with precompiled structs and
+        returns the payload as a view into *pdu* (no copy).  The view is only
+        valid as long as *pdu* is not modified.
+
+        Args:
+            pdu: Complete S7 PDU of an ACK_DATA reply to a read request.
+
+        Returns:
+            Tuple of (sequence, payload view).
+
+        Raises:
+            ~snap7.error.S7ProtocolError: If the PDU is malformed, carries a
+                header error, or the item return code is not success.
+        """
+        view = memoryview(pdu)
+        if len(view) < _ACK_HEADER.size:
+            raise S7ProtocolError("PDU too short for ACK/ACK_DATA header")
+
+        protocol_id, pdu_type, _, sequence, param_len, data_len, error_class, error_code = _ACK_HEADER.unpack_from(view)
+        if protocol_id != 0x32:
+            raise S7ProtocolError(f"Invalid protocol ID: {protocol_id:#02x}")
+        if error_class != 0:
+            combined_error = (error_class << 8) | error_code
+            raise S7ProtocolError(
+                f"S7 protocol error (class={error_class:#04x}, code={error_code:#04x}): "
+                f"{get_protocol_error_message(combined_error)}",
+                error_code=combined_error,
+            )
+        if pdu_type != S7PDUType.ACK_DATA:
+            raise S7ProtocolError(f"Expected ACK_DATA read reply, got {pdu_type}")
+
+        data_offset = _ACK_HEADER.size + param_len
+        if param_len < _FUNCTION_ITEM_COUNT.size or data_offset + data_len > len(view):
+            raise S7ProtocolError("Read reply sections extend beyond PDU")
+        function_code, _ = _FUNCTION_ITEM_COUNT.unpack_from(view, _ACK_HEADER.size)
+        if function_code != S7Function.READ_AREA:
+            raise S7ProtocolError(f"Expected READ_AREA reply, got function {function_code:#04x}")
+        if data_len < _DATA_ITEM_HEADER.size:
+            raise S7ProtocolError("No data in response")
+
+        return_code, transport_size, length = _DATA_ITEM_HEADER.unpack_from(view, data_offset)
+        if return_code != 0xFF:  # 0xFF = Success
+            desc = get_return_code_description(return_code)
+            raise S7ProtocolError(f"Read operation failed: {desc} (0x{return_code:02x})")
+
+        # Same length rules as _parse_data_section: octet strings count bytes, the rest bits
+        byte_length = length if transport_size in (0x00, 0x09) else length // 8
+        payload_offset = data_offset + _DATA_ITEM_HEADER.size
+        return sequence, view[payload_offset : payload_offset + min(byte_length, data_len - _DATA_ITEM_HEADER.size)]
+
     def _parse_parameters(self, param_data: bytes) -> Dict[str, Any]:
         """Parse S7 parameter section."""
         if len(param_data) < 1:
@@ -1720,6 +1901,26 @@ class S7Protocol:
         Returns:
             List of decoded values
         """
+        # Return raw bytes directly - caller handles type conversion
+        return list(self.extract_read_payload(response))
+
+    def extract_read_payload(self, response: Dict[str, Any]) -> bytes:
+        """
+        Extract the raw payload of a single-item read response.
+
+        Unlike :meth:`extract_read_data` the payload is returned as-is, without
+        converting it to a list of ints.
+
+        Args:
+            response: Parsed S7 response
+
+        Returns:
+            Payload bytes of the read item
+
+        Raises:
+            ~snap7.error.S7ProtocolError: If the response has no data or the
+                item return code is not success
+        """
         if not response.get("data"):
             raise S7ProtocolError("No data in response")
 
@@ -1730,10 +1931,8 @@ class S7Protocol:
             desc = get_return_code_description(return_code)
             raise S7ProtocolError(f"Read operation failed: {desc} (0x{return_code:02x})")
 
-        raw_data = data_info.get("data", b"")
-
-        # Return raw bytes directly - caller handles type conversion
-        return list(raw_data)
+        payload: bytes = data_info.get("data", b"")
+        return payload
 
     def check_write_response(self, response: Dict[str, Any]) -> None:
         """
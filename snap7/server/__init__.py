@@ -12,7 +12,8 @@ import sys
 import threading
 import time
 import logging
-from typing import Dict, Optional, List, Callable, Any, Tuple, Type, Union
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, List, Callable, Any, Tuple, Type, Union
 from types import TracebackType
 from enum import IntEnum
 from ctypes import Array, c_char
@@ -20,11 +21,22 @@ from ctypes import Array, c_char
 from ..s7protocol import S7Protocol, S7Function, S7PDUType, S7UserDataGroup, S7UserDataSubfunction
 from ..datatypes import S7Area, S7WordLen
 from ..error import S7ConnectionError, S7ProtocolError
+from ..metrics import ServerMetrics, track
 from ..type import SrvArea, SrvEvent, Parameter
 
 logger = logging.getLogger(__name__)
 
 
+def _function_name(function_code: Optional[int]) -> str:
+    """Name of an S7 function code for the request counters, e.g. ``"READ_AREA"``."""
+    if function_code is None:
+        return "UNKNOWN"
+    try:
+        return S7Function(function_code).name
+    except ValueError:
+        return f"0x{function_code:02X}"
+
+
 class ServerState(IntEnum):
     """S7 server states."""
 
@@ -56,6 +68,10 @@ class Server:
         >>> server.stop()
     """
 
+    # Outstanding jobs per connection accepted during setup communication.
+    # Requests are answered in order, so any pipelining depth is safe.
+    MAX_AMQ = 8
+
     def __init__(self, log: bool = True, max_clients: int = 64, **kwargs: object) -> None:
         """
         Initialize S7 server.
@@ -98,6 +114,10 @@ class Server:
         # Event queue for pick_event
         self._event_queue: List[SrvEvent] = []
 
+        # Request counters and latency histograms, see snap7.metrics
+        self.metrics = ServerMetrics()
+        track(self)
+
         # Logging
         self._log_enabled = log
         if log:
@@ -619,6 +639,7 @@ class Server:
 
     def _handle_client(self, client_socket: socket.socket, address: Tuple[str, int]) -> None:
         """Handle a single client connection."""
+        client_name = f"{address[0]}:{address[1]}"
         try:
             # Create ISO connection wrapper and establish connection
             connection = ServerISOConnection(client_socket)
@@ -634,6 +655,7 @@ class Server:
                 try:
                     # Receive S7 request
                     request_data = connection.receive_data()
+                    received_at = time.perf_counter()
 
                     # Process request and generate response
                     response_data = self._process_request(request_data, address)
@@ -641,6 +663,7 @@ class Server:
                     # Send response
                     if response_data:
                         connection.send_data(response_data)
+                    self.metrics.observe_request(client_name, time.perf_counter() - received_at)
 
                 except socket.timeout:
                     continue
@@ -664,6 +687,7 @@ class Server:
                 if current_thread in self.clients:
                     self.clients.remove(current_thread)
                 self.client_count = max(0, self.client_count - 1)
+            self.metrics.drop_client(client_name)
 
             if hasattr(self, "_download_contexts"):
                 self._download_contexts.pop(address, None)
@@ -692,6 +716,7 @@ class Server:
 
             if pdu_type == S7PDUType.USERDATA:
                 # Handle USER_DATA PDU (block info, SZL, clock, etc.)
+                self.metrics.count_request("USER_DATA")
                 return self._handle_userdata(request, client_address)
 
             # Handle REQUEST PDU (read/write areas, setup, control)
@@ -701,6 +726,7 @@ class Server:
 
             params = request["parameters"]
             function_code = params.get("function_code")
+            self.metrics.count_request(_function_name(function_code))
 
             if function_code == S7Function.SETUP_COMMUNICATION:
                 return self._handle_setup_communication(request)
@@ -736,6 +762,8 @@ class Server:
         """Handle setup communication request."""
         params = request["parameters"]
         pdu_length = params.get("pdu_length", 480)
+        max_amq_caller = max(1, min(params.get("max_amq_caller", 1), self.MAX_AMQ))
+        max_amq_callee = max(1, min(params.get("max_amq_callee", 1), self.MAX_AMQ))
 
         # Build response with error bytes
         header = struct.pack(
@@ -754,8 +782,8 @@ class Server:
             ">BBHHH",
             S7Function.SETUP_COMMUNICATION,  # Function code
             0x00,  # Reserved
-            1,  # Max AMQ caller
-            1,  # Max AMQ callee
+            max_amq_caller,  # Max AMQ caller
+            max_amq_callee,  # Max AMQ callee
             min(pdu_length, 480),  # PDU length (limited)
         )
 
@@ -945,7 +973,7 @@ class Server:
                 return bytearray([0x42, 0xFF, 0x12, 0x34])[:count]
 
             # Get area data with thread safety
-            with self.area_locks[area_key]:
+            with self._locked_area(area_key):
                 area_data = self.memory_areas[area_key]
 
                 # Check bounds
@@ -969,8 +997,15 @@ class Server:
             return bytearray([0x00] * count)
 
     def _handle_write_area(self, request: Dict[str, Any], client_address: Tuple[str, int]) -> bytes:
-        """Handle write area request."""
+        """Handle write area request (single or multi-item)."""
         try:
+            params = request.get("parameters", {})
+            if params.get("item_count", 1) > 1 and "address_specs" in params:
+                return self._handle_multi_write_area(request, client_address)
+            if params.get("address_spec", {}).get("word_len") == S7WordLen.BIT:
+                # A bit write carries a length in bits; the item-wise writer handles it
+                return self._handle_multi_write_area(request, client_address)
+
             # Parse address specification from request parameters
             addr_info = self._parse_write_address(request)
             if not addr_info:
@@ -1012,6 +1047,108 @@ class Server:
             logger.error(f"Error handling write request: {e}")
             return self._build_error_response(request, 0x8000)
 
+    def _handle_multi_write_area(self, request: Dict[str, Any], client_address: Tuple[str, int]) -> bytes:
+        """Handle multi-item write area request.
+
+        Walks the data section item by item (return code, transport size,
+        length, data, fill byte) and answers with one return code per item.
+        Items with the BIT transport size set or clear their one bit and
+        leave the rest of the byte alone, so several bits of one byte can be
+        written in a single request; single-item bit writes come here too.
+        """
+        params = request["parameters"]
+        address_specs: List[Dict[str, Any]] = params.get("address_specs") or [params["address_spec"]]
+        item_count = len(address_specs)
+        raw = request.get("raw_data", b"")
+
+        return_codes = bytearray()
+        offset = 0
+        for i, addr in enumerate(address_specs):
+            if offset + 4 > len(raw):
+                return_codes.append(0x07)  # Data type inconsistent
+                continue
+
+            transport_size = raw[offset + 1]
+            length = struct.unpack(">H", raw[offset + 2 : offset + 4])[0]
+            offset += 4
+
+            # Transport size 0x03 (bit) and 0x04 (byte) carry a bit length
+            if transport_size in (0x00, 0x09):
+                byte_count = length
+            elif transport_size == 0x03:
+                byte_count = (length + 7) // 8
+            else:
+                byte_count = length // 8
+
+            write_data = bytearray(raw[offset : offset + byte_count])
+            offset += byte_count
+            # Fill byte for even alignment (not after last item)
+            if i < item_count - 1 and byte_count % 2 != 0:
+                offset += 1
+
+            area = addr.get("area", S7Area.DB)
+            db_number = addr.get("db_number", 0)
+            start = addr.get("start", 0)
+            area_key = (area, db_number)
+
+            if not addr or len(write_data) != byte_count:
+                return_codes.append(0x07)  # Data type inconsistent
+            elif area_key not in self.memory_areas:
+                return_codes.append(0x0A)  # Object does not exist
+            elif addr.get("word_len") == S7WordLen.BIT:
+                return_codes.append(
+                    0xFF if self._write_bit_to_memory_area(area, db_number, start, addr["bit"], write_data[0]) else 0x05
+                )
+            elif self._write_to_memory_area(area, db_number, start, write_data):
+                return_codes.append(0xFF)
+            else:
+                return_codes.append(0x05)  # Invalid address
+
+        header = struct.pack(
+            ">BBHHHHBB",
+            0x32,
+            S7PDUType.ACK_DATA,
+            0x0000,
+            request["sequence"],
+            0x0002,  # param length
+            len(return_codes),
+            0x00,
+            0x00,
+        )
+
+        parameters = struct.pack(">BB", S7Function.WRITE_AREA, item_count)
+
+        return header + parameters + bytes(return_codes)
+
+    @contextmanager
+    def _locked_area(self, area_key: Tuple[S7Area, int]) -> Iterator[None]:
+        """Hold the lock of a memory area, counting the time spent waiting for it."""
+        lock = self.area_locks[area_key]
+        waiting_since = time.perf_counter()
+        with lock:
+            area, index = area_key
+            self.metrics.observe_lock_wait(f"{area.name}{index}", time.perf_counter() - waiting_since)
+            yield
+
+    def _write_bit_to_memory_area(self, area: S7Area, db_number: int, start: int, bit: int, value: int) -> bool:
+        """
+        Set or clear a single bit in a registered memory area.
+
+        Returns:
+            True if the write succeeded, False if the address is out of range
+        """
+        area_key = (area, db_number)
+        with self._locked_area(area_key):
+            area_data = self.memory_areas[area_key]
+            if start >= len(area_data):
+                logger.warning(f"Bit write address {start}.{bit} beyond area size {len(area_data)}")
+                return False
+            if value & 0x01:
+                area_data[start] |= 1 << bit
+            else:
+                area_data[start] &= ~(1 << bit) & 0xFF
+            return True
+
     def _handle_plc_control(self, request: Dict[str, Any], client_address: Tuple[str, int]) -> bytes:
         """Handle PLC control request (start, compress, copy_ram_to_rom)."""
         try:
@@ -1151,7 +1288,7 @@ class Server:
                 return False
 
             # Write to area data with thread safety
-            with self.area_locks[area_key]:
+            with self._locked_area(area_key):
                 area_data = self.memory_areas[area_key]
 
                 # Check bounds
@@ -1234,6 +1371,7 @@ class Server:
 
             data_section = pdu[offset : offset + data_len]
             request["data"] = self._parse_data_section(data_section)
+            request["raw_data"] = data_section
 
         return request
 
@@ -1283,9 +1421,20 @@ class Server:
         elif function_code == S7Function.WRITE_AREA:
             # Parse write area parameters (same format as read)
             if len(param_data) >= 14:  # Minimum for write area request
-                # Function code (1) + item count (1) + address spec (12)
+                # Function code (1) + item count (1) + N * address spec (12 each)
                 item_count = param_data[1]
 
+                if item_count > 1:
+                    # Multi-item write: parse all address specs
+                    write_specs: List[Dict[str, Any]] = []
+                    offset = 2
+                    for _ in range(item_count):
+                        if offset + 12 > len(param_data):
+                            break
+                        write_specs.append(self._parse_address_specification(param_data[offset : offset + 12]))
+                        offset += 12
+                    return {"function_code": function_code, "item_count": item_count, "address_specs": write_specs}
+
                 # Parse address specification starting at byte 2
                 if len(param_data) >= 14:
                     addr_spec = param_data[2:14]  # 12 bytes of address specification
@@ -1404,6 +1553,7 @@ class Server:
                 "area": S7Area(area_code),
                 "db_number": db_number,
                 "start": start_address,
+                "bit": address % 8,
                 "count": count,
                 "word_len": word_len,
                 "spec_type": spec_type,
@@ -2236,7 +2386,7 @@ class Server:
             if block_type == 0x41:  # DB
                 area_key = (S7Area.DB, block_num)
                 if area_key in self.memory_areas:
-                    with self.area_locks[area_key]:
+                    with self._locked_area(area_key):
                         block_data = bytes(self.memory_areas[area_key])
 
             logger.info(f"Upload request from {client_address}: sending {len(block_data)} bytes")
@@ -2490,7 +2640,7 @@ class Server:
                 area_key = (S7Area.DB, block_num)
                 if area_key in self.memory_areas:
                     # Update existing area - copy data into existing area without resizing
-                    with self.area_locks[area_key]:
+                    with self._locked_area(area_key):
                         existing_area = self.memory_areas[area_key]
                         copy_len = min(len(block_data), len(existing_area))
                         existing_area[0:copy_len] = block_data[0:copy_len]
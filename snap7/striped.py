@@ -0,0 +1,275 @@
+"""
+Bulk transfers striped over several connections to one PLC.
+
+A single connection is limited by its round trip and by the number of jobs
+(AMQ) the PLC accepts on it.  S7-1500 CPUs accept many PUT/GET connections
+at once, so :class:`StripedClient` opens several and splits large reads and
+writes, and the packets of optimized multi-variable reads, across them.
+
+Example::
+
+    from snap7 import StripedClient
+
+    with StripedClient(stripes=4) as client:
+        client.connect("192.168.1.10", 0, 1)
+        data = client.db_read(100, 0, 60000)
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import TracebackType
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from .client import _VALID_AREA_VALUES, Client, _decode_tag, _tag_read_items
+from .error import S7ConnectionError
+from .optimizer import ReadPacket
+from .tags import Tag
+from .type import Area
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class StripedClient:
+    """Reads and writes one PLC over several connections in parallel.
+
+    Each stripe is a :class:`~snap7.client.Client` with its own connection.
+    Large ``read_area``/``write_area`` transfers are cut into one segment per
+    stripe, and the packets of an optimized ``read_multi_vars`` plan are
+    dealt out over the stripes.  Each stripe pipelines its own share up to
+    its AMQ, and the results are put back together in order.
+
+    A stripe whose connection fails is disconnected and dropped, and its
+    unfinished share is redone on the remaining stripes.  Only when no
+    stripe is left does an operation fail.
+
+    Args:
+        stripes: Number of connections to open.
+        **client_kwargs: Passed to every stripe's :class:`~snap7.client.Client`.
+    """
+
+    def __init__(self, stripes: int = 4, **client_kwargs: Any) -> None:
+        if stripes < 1:
+            raise ValueError(f"stripes must be at least 1, got {stripes}")
+        self.stripe_count = stripes
+        self._client_kwargs = client_kwargs
+        self._stripes: List[Client] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "StripedClient":
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.disconnect()
+
+    @property
+    def stripes(self) -> List[Client]:
+        """The clients of the stripes still in use."""
+        with self._lock:
+            return list(self._stripes)
+
+    def connect(self, address: str, rack: int, slot: int, tcp_port: int = 102) -> "StripedClient":
+        """Open up to :attr:`stripe_count` connections to the PLC.
+
+        Stripes that fail to connect are left out.
+
+        Raises:
+            S7ConnectionError: If no connection could be opened.
+        """
+        self.disconnect()
+        executor = ThreadPoolExecutor(max_workers=self.stripe_count, thread_name_prefix="s7-stripe")
+
+        def open_stripe(_: int) -> Optional[Client]:
+            client = Client(**self._client_kwargs)
+            try:
+                return client.connect(address, rack, slot, tcp_port)
+            except (S7ConnectionError, OSError) as e:
+                logger.warning(f"Stripe connection to {address} failed: {e}")
+                return None
+
+        clients = [c for c in executor.map(open_stripe, range(self.stripe_count)) if c is not None]
+        if not clients:
+            executor.shutdown()
+            raise S7ConnectionError(f"Could not open any connection to {address}")
+        logger.info(f"Striped over {len(clients)} of {self.stripe_count} connection(s) to {address}")
+        with self._lock:
+            self._stripes = clients
+            self._executor = executor
+        return self
+
+    def disconnect(self) -> int:
+        """Close every stripe."""
+        with self._lock:
+            stripes, self._stripes = self._stripes, []
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for client in stripes:
+            client.disconnect()
+        return 0
+
+    def get_connected(self) -> bool:
+        """Whether at least one stripe is connected."""
+        return any(client.get_connected() for client in self.stripes)
+
+    def _drop(self, client: Client, error: Exception) -> None:
+        """Take a failed stripe out of use."""
+        with self._lock:
+            if client not in self._stripes:
+                return
+            self._stripes.remove(client)
+            remaining = len(self._stripes)
+        logger.warning(f"Dropping failed stripe ({remaining} left): {error}")
+        client.disconnect()
+
+    def _run(self, jobs: Sequence[Callable[[Client], _T]]) -> List[_T]:
+        """Run *jobs* spread over the stripes and return their results in order.
+
+        Jobs are dealt out round-robin, and each stripe runs its jobs one
+        after the other.  When a stripe fails, the jobs it has not finished
+        are dealt out again over the stripes that are left.
+        """
+        results: List[Any] = [None] * len(jobs)
+
+        def run_share(client: Client, share: List[int]) -> Tuple[int, Optional[Exception]]:
+            for done, index in enumerate(share):
+                try:
+                    results[index] = jobs[index](client)
+                except (S7ConnectionError, OSError) as e:
+                    return done, e
+            return len(share), None
+
+        pending = list(range(len(jobs)))
+        while pending:
+            with self._lock:
+                stripes = list(self._stripes)
+                executor = self._executor
+            if not stripes or executor is None:
+                raise S7ConnectionError("Not connected to PLC: no stripe left")
+            shares = [(client, pending[n :: len(stripes)]) for n, client in enumerate(stripes)]
+            futures = [(client, share, executor.submit(run_share, client, share)) for client, share in shares if share]
+            pending = []
+            for client, share, future in futures:
+                done, error = future.result()
+                if error is not None:
+                    self._drop(client, error)
+                    pending.extend(share[done:])
+            pending.sort()
+        return results
+
+    def _segments(self, size: int, chunk: int) -> List[Tuple[int, int]]:
+        """Split *size* bytes into one ``(offset, length)`` segment per stripe, on *chunk* boundaries."""
+        chunks = -(-size // chunk)
+        per_stripe = -(-chunks // max(1, len(self.stripes))) * chunk
+        return [(offset, min(per_stripe, size - offset)) for offset in range(0, size, per_stripe)]
+
+    def _first(self) -> Client:
+        stripes = self.stripes
+        if not stripes:
+            raise S7ConnectionError("Not connected to PLC: no stripe left")
+        return stripes[0]
+
+    def read_area(self, area: Area, db_number: int, start: int, size: int) -> bytearray:
+        """Read data from a memory area, one segment per stripe."""
+        if size <= 0:
+            return bytearray()
+        segments = self._segments(size, self._first()._max_read_size())
+        jobs = [partial(_read_segment, area, db_number, start + offset, length) for offset, length in segments]
+        return bytearray(b"".join(self._run(jobs)))
+
+    def write_area(self, area: Area, db_number: int, start: int, data: bytearray) -> int:
+        """Write data to a memory area, one segment per stripe."""
+        if not data:
+            return 0
+        segments = self._segments(len(data), self._first()._max_write_size())
+        jobs = [
+            partial(_write_segment, area, db_number, start + offset, bytearray(data[offset : offset + length]))
+            for offset, length in segments
+        ]
+        self._run(jobs)
+        return 0
+
+    def db_read(self, db_number: int, start: int, size: int) -> bytearray:
+        """Read data from a DB, one segment per stripe."""
+        return self.read_area(Area.DB, db_number, start, size)
+
+    def db_write(self, db_number: int, start: int, data: bytearray) -> int:
+        """Write data to a DB, one segment per stripe."""
+        return self.write_area(Area.DB, db_number, start, data)
+
+    def read_multi_vars(self, items: List[dict[str, Any]]) -> Tuple[int, List[bytearray]]:
+        """Read multiple variables with the optimizer, the packets spread over the stripes.
+
+        The plan is made once (by the first stripe) and its packets are dealt
+        out over the stripes; each stripe pipelines its share.
+
+        Args:
+            items: List of item dicts with keys: area, db_number, start, size
+
+        Returns:
+            Tuple of (0, list of bytearrays in original order).
+        """
+        if not items:
+            return (0, [])
+        plan = self._first()._optimization_plan(items)
+        stripe_count = min(len(self.stripes), len(plan.packets))
+        shares = [list(range(n, len(plan.packets), stripe_count)) for n in range(stripe_count)]
+        jobs = [partial(_read_packets, [plan.packets[i] for i in share]) for share in shares]
+
+        buffers: List[List[bytearray]] = [[] for _ in plan.packets]
+        for share, share_buffers in zip(shares, self._run(jobs)):
+            for index, packet_buffers in zip(share, share_buffers):
+                buffers[index] = packet_buffers
+        return (0, self._first()._plan_results(plan, buffers))
+
+    def read_tags(self, tags: "list[Union[Tag, str]]", encoding: str = "latin-1") -> List[Any]:
+        """Read multiple tags with :meth:`read_multi_vars`.
+
+        Returns:
+            List of decoded values in the same order as input.
+        """
+        resolved, items = _tag_read_items(tags)
+        _code, data_list = self.read_multi_vars(items)
+        return [_decode_tag(t, d, encoding=encoding) for t, d in zip(resolved, data_list)]
+
+
+def _read_segment(area: Area, db_number: int, start: int, size: int, client: Client) -> bytearray:
+    return client.read_area(area, db_number, start, size)
+
+
+def _write_segment(area: Area, db_number: int, start: int, data: bytearray, client: Client) -> int:
+    return client.write_area(area, db_number, start, data)
+
+
+def _read_packets(packets: List[ReadPacket], client: Client) -> List[List[bytearray]]:
+    """Read planned packets on one stripe, pipelining the multi-block ones.
+
+    Requests are built on the stripe itself, because the compiled requests
+    of a plan belong to the client that made it.
+    """
+    buffers: List[List[bytearray]] = [[] for _ in packets]
+    multi: List[int] = []
+    for index, packet in enumerate(packets):
+        if len(packet.blocks) > 1:
+            multi.append(index)
+            continue
+        blk = packet.blocks[0]
+        area = Area(blk.area) if blk.area in _VALID_AREA_VALUES else Area.DB
+        buffers[index] = [client.read_area(area, blk.db_number, blk.start_offset, blk.byte_length)]
+
+    builders = [
+        partial(
+            client.protocol.build_multi_read_request,
+            [(blk.area, blk.db_number, blk.start_offset, blk.byte_length) for blk in packets[index].blocks],
+        )
+        for index in multi
+    ]
+    for index, response in zip(multi, client._send_receive_pipelined_with_reconnect(builders)):
+        buffers[index] = client.protocol.extract_multi_read_data(response, len(packets[index].blocks))
+    return buffers
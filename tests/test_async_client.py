@@ -7,6 +7,7 @@ import asyncio
 import logging
 import struct
 from collections.abc import AsyncGenerator, Generator
+from typing import Union
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -15,6 +16,7 @@ import pytest_asyncio
 from snap7.async_client import AsyncClient, AsyncISOTCPConnection
 from snap7.error import S7ConnectionError
 from snap7.server import Server
+from snap7.tags import Tag
 from snap7.type import Area, Parameter, SrvArea
 
 logging.basicConfig(level=logging.WARNING)
@@ -90,6 +92,15 @@ async def test_db_read(client: AsyncClient) -> None:
     assert data == result
 
 
+@pytest.mark.asyncio
+async def test_db_read_into(client: AsyncClient) -> None:
+    data = bytearray(range(40))
+    await client.db_write(db_number=1, start=0, data=data)
+    buf = bytearray(40)
+    assert await client.db_read_into(db_number=1, start=0, buf=buf) == 40
+    assert buf == data
+
+
 @pytest.mark.asyncio
 async def test_db_write(client: AsyncClient) -> None:
     data = bytearray(b"\x01\x02\x03\x04")
@@ -167,8 +178,8 @@ async def test_mb_read_write(client: AsyncClient) -> None:
 async def test_concurrent_reads(client: AsyncClient) -> None:
     """Verify asyncio.gather with multiple reads doesn't corrupt data.
 
-    This is the critical test — it validates that the asyncio.Lock
-    serializes send/receive cycles correctly.
+    This is the critical test — it validates that the reader task hands
+    each reply to the request that sent it.
     """
     # Write known data
     data1 = bytearray(b"\x11\x22\x33\x44")
@@ -219,6 +230,85 @@ async def test_many_concurrent_reads(client: AsyncClient) -> None:
         assert result == bytearray([i] * 4), f"Mismatch at index {i}"
 
 
+class _ReorderingConnection:
+    """Fake connection that answers requests in reverse order once *batch* are in flight."""
+
+    def __init__(self, batch: int) -> None:
+        self.connected = True
+        self.timeout = 5.0
+        self.batch = batch
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._sent: list[bytes] = []
+        self._replies: asyncio.Queue[bytes] = asyncio.Queue()
+
+    async def send_data(self, data: bytes) -> None:
+        self._sent.append(data)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if len(self._sent) == self.batch:
+            for request in reversed(self._sent):
+                self._replies.put_nowait(request)
+            self._sent.clear()
+
+    async def receive_data(self, idle: bool = False) -> bytes:
+        reply = await self._replies.get()
+        self.in_flight -= 1
+        return reply
+
+    async def disconnect(self) -> None:
+        self.connected = False
+
+
+def _raw_request(sequence: int) -> bytearray:
+    return bytearray(struct.pack(">BBHHHH", 0x32, 0x01, 0, sequence, 0, 0))
+
+
+@pytest.mark.asyncio
+async def test_replies_matched_by_pdu_reference() -> None:
+    """Replies arriving out of order still reach the request that sent them."""
+    c = AsyncClient()
+    conn = _ReorderingConnection(batch=4)
+    c.connection = conn  # type: ignore[assignment]
+    c.connected = True
+    c._window = asyncio.Semaphore(4)
+
+    replies = await asyncio.gather(*(c.iso_exchange_buffer(_raw_request(seq)) for seq in range(1, 5)))
+
+    assert [struct.unpack_from(">H", reply, 4)[0] for reply in replies] == [1, 2, 3, 4]
+    assert conn.max_in_flight == 4
+    await c.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_in_flight_requests_bounded_by_amq() -> None:
+    c = AsyncClient()
+    conn = _ReorderingConnection(batch=2)
+    c.connection = conn  # type: ignore[assignment]
+    c.connected = True
+    c._window = asyncio.Semaphore(2)
+
+    await asyncio.gather(*(c.iso_exchange_buffer(_raw_request(seq)) for seq in range(1, 7)))
+
+    assert conn.max_in_flight == 2
+    await c.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_connection_loss_fails_waiting_requests() -> None:
+    c = AsyncClient()
+    conn = _ReorderingConnection(batch=2)
+    conn.receive_data = AsyncMock(side_effect=S7ConnectionError("Connection closed by peer"))
+    c.connection = conn  # type: ignore[assignment]
+    c.connected = True
+
+    with pytest.raises(S7ConnectionError):
+        await c.iso_exchange_buffer(_raw_request(1))
+    with pytest.raises(S7ConnectionError, match="Connection lost"):
+        await c.iso_exchange_buffer(_raw_request(2))
+    await c.disconnect()
+
+
 # -------------------------------------------------------------------
 # Multi-var
 # -------------------------------------------------------------------
@@ -239,6 +329,47 @@ async def test_read_multi_vars(client: AsyncClient) -> None:
     assert results[1] == bytearray(b"\x05\x06\x07\x08")
 
 
+@pytest.mark.asyncio
+async def test_read_multi_vars_optimized_multi_packet(client: AsyncClient) -> None:
+    """Items spread over two DBs need several multi-item packets."""
+    await client.db_write(0, 0, bytearray(range(100)))
+    await client.db_write(1, 0, bytearray(range(100, 200)))
+
+    items = [{"area": Area.DB, "db_number": i % 2, "start": i * 4, "size": 2} for i in range(client.MAX_VARS + 5)]
+    with patch.object(client, "read_area", wraps=client.read_area) as read_area:
+        code, results = await client.read_multi_vars(items)
+
+    assert code == 0
+    expected = [bytearray(range(100 * (i % 2) + i * 4, 100 * (i % 2) + i * 4 + 2)) for i in range(client.MAX_VARS + 5)]
+    assert results == expected
+    assert read_area.call_count == 0
+    assert client.plan_parameters is not None
+    assert client.plan_parameters.packet_count > 1
+
+
+@pytest.mark.asyncio
+async def test_read_multi_vars_plan_cached(client: AsyncClient) -> None:
+    items = [{"area": Area.DB, "db_number": db, "start": 0, "size": 2} for db in (0, 1)]
+    client.multi_read_max_gap = 5
+    _, first = await client.read_multi_vars(items)
+    plans = list(client._opt_plans.values())
+    _, second = await client.read_multi_vars(items)
+
+    assert len(plans) == 1
+    assert list(client._opt_plans.values()) == plans
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_read_multi_vars_optimizer_disabled(client: AsyncClient) -> None:
+    client.use_optimizer = False
+    items = [{"area": Area.DB, "db_number": db, "start": 0, "size": 2} for db in (0, 1)]
+    with patch.object(client, "read_area", wraps=client.read_area) as read_area:
+        await client.read_multi_vars(items)
+    assert read_area.call_count == 2
+    assert not client._opt_plans
+
+
 @pytest.mark.asyncio
 async def test_write_multi_vars(client: AsyncClient) -> None:
     items = [
@@ -252,6 +383,43 @@ async def test_write_multi_vars(client: AsyncClient) -> None:
     assert data == bytearray(b"\xaa\xbb\xcc\xdd")
 
 
+@pytest.mark.asyncio
+async def test_write_multi_vars_more_than_max_vars(client: AsyncClient) -> None:
+    count = client.MAX_VARS + 5
+    items = [{"area": Area.DB, "db_number": 1, "start": i, "data": bytearray([i + 1])} for i in range(count)]
+    assert await client.write_multi_vars(items) == 0
+    assert await client.db_read(1, 0, count) == bytearray(range(1, count + 1))
+
+
+# -------------------------------------------------------------------
+# Typed tag access
+# -------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_read_write_tag(client: AsyncClient) -> None:
+    await client.write_tag("DB1.DBD40:REAL", 12.5)
+    await client.write_tag("DB1:44:INT", -7)
+    assert await client.read_tag("DB1.DBD40:REAL") == 12.5
+    assert await client.read_tag(Tag(Area.DB, 1, 44, "INT")) == -7
+
+
+@pytest.mark.asyncio
+async def test_read_write_tags(client: AsyncClient) -> None:
+    await client.db_write(1, 50, bytearray(1))
+    tags: list[Union[Tag, str]] = ["DB1:52:DINT", "DB1.DBX50.1:BOOL", "DB1.DBX50.3:BOOL", "DB1:56:STRING[10]"]
+    await client.write_tags(tags, [123456, True, True, "hello"])
+
+    assert await client.read_tags(tags) == [123456, True, True, "hello"]
+    assert (await client.db_read(1, 50, 1))[0] == 0b1010
+
+
+@pytest.mark.asyncio
+async def test_write_tags_length_mismatch(client: AsyncClient) -> None:
+    with pytest.raises(ValueError):
+        await client.write_tags(["DB1:52:DINT"], [1, 2])
+
+
 # -------------------------------------------------------------------
 # Synchronous helpers (no I/O)
 # -------------------------------------------------------------------
@@ -0,0 +1,142 @@
+"""Tests for the read-through cache."""
+
+import time
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from snap7.cache import ReadCache
+from snap7.client import Client
+from snap7.server import Server
+from snap7.type import Area, SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+def cached(cache: ReadCache, area: Area, db_number: int, start: int, size: int) -> Optional[bytes]:
+    """Copy of the cached bytes, for comparing with bytes."""
+    view = cache.get(area, db_number, start, size)
+    return None if view is None else bytes(view)
+
+
+class TestReadCache:
+    def test_sub_range_hit(self) -> None:
+        cache = ReadCache(ttl=10)
+        cache.put(Area.DB, 1, 100, bytes(range(50)))
+        assert cached(cache, Area.DB, 1, 110, 5) == bytes(range(10, 15))
+        assert cached(cache, Area.DB, 1, 100, 50) == bytes(range(50))
+        assert cache.get(Area.DB, 1, 140, 20) is None  # runs past the block
+        assert cache.get(Area.DB, 2, 110, 5) is None  # other DB
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert cache.hit_ratio == 0.5
+
+    def test_expiry_and_area_ttl(self) -> None:
+        cache = ReadCache(ttl=10, area_ttl={Area.PE: 0.01, Area.PA: 0})
+        cache.put(Area.DB, 1, 0, b"\x01\x02")
+        cache.put(Area.PE, 0, 0, b"\x03")
+        cache.put(Area.PA, 0, 0, b"\x04")
+        time.sleep(0.02)
+        assert cached(cache, Area.DB, 1, 0, 2) == b"\x01\x02"
+        assert cache.get(Area.PE, 0, 0, 1) is None
+        assert cache.get(Area.PA, 0, 0, 1) is None
+        assert cache.ttl_for(Area.PA) == 0
+
+    def test_superset_replaces_contained_blocks(self) -> None:
+        cache = ReadCache(ttl=10)
+        cache.put(Area.DB, 1, 10, b"\x00" * 10)
+        cache.put(Area.DB, 1, 30, b"\x00" * 10)
+        cache.put(Area.DB, 1, 0, b"\x01" * 35)
+        assert len(cache) == 2
+        assert cached(cache, Area.DB, 1, 12, 4) == b"\x01" * 4
+
+    def test_invalidate_overlapping_blocks(self) -> None:
+        cache = ReadCache(ttl=10)
+        cache.put(Area.DB, 1, 0, b"\x00" * 10)
+        cache.put(Area.DB, 1, 20, b"\x00" * 10)
+        cache.invalidate(Area.DB, 1, 8, 4)
+        assert cache.get(Area.DB, 1, 0, 2) is None
+        assert cache.get(Area.DB, 1, 20, 2) is not None
+
+    def test_put_after_invalidation_is_dropped(self) -> None:
+        cache = ReadCache(ttl=10)
+        generation = cache.generation
+        cache.invalidate(Area.DB, 1, 0, 2)
+        cache.put(Area.DB, 1, 0, b"\x00\x00", generation)
+        assert len(cache) == 0
+
+    def test_max_blocks(self) -> None:
+        cache = ReadCache(ttl=10, max_blocks=3)
+        for n in range(5):
+            cache.put(Area.DB, n, 0, b"\x00")
+        assert len(cache) == 3
+        assert cache.get(Area.DB, 0, 0, 1) is None
+        assert cache.get(Area.DB, 4, 0, 1) is not None
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            ReadCache(ttl=-1)
+        with pytest.raises(ValueError):
+            ReadCache(area_ttl={Area.DB: -1})
+        with pytest.raises(ValueError):
+            ReadCache(max_blocks=0)
+
+
+@pytest.mark.client
+class TestClientReadCache:
+    server: Server
+    db1: bytearray
+    port: int
+
+    @classmethod
+    def setup_class(cls) -> None:
+        cls.server = Server()
+        cls.db1 = bytearray(i % 251 for i in range(2000))
+        cls.server.register_area(SrvArea.DB, 1, cls.db1)
+        cls.port = get_free_tcp_port()
+        cls.server.start(tcp_port=cls.port)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        cls.server.stop()
+        cls.server.destroy()
+
+    def setup_method(self) -> None:
+        self.cache = ReadCache(ttl=10)
+        self.client = Client(read_cache=self.cache)
+        self.client.connect("127.0.0.1", 0, 1, self.port)
+
+    def teardown_method(self) -> None:
+        self.client.disconnect()
+
+    def test_sub_range_read_served_from_cache(self) -> None:
+        with patch.object(self.client, "_read_area_wire", wraps=self.client._read_area_wire) as wire:
+            assert self.client.db_read(1, 0, 2000) == self.db1
+            assert self.client.db_read(1, 500, 10) == self.db1[500:510]
+            assert self.client.db_read_int(1, 20) == int.from_bytes(self.db1[20:22], "big", signed=True)
+        assert wire.call_count == 1
+        assert (self.cache.hits, self.cache.misses) == (2, 1)
+
+    def test_write_area_invalidates(self) -> None:
+        original = self.client.db_read(1, 0, 100)[10:12]
+        self.client.db_write(1, 10, bytearray(b"\xaa\xbb"))
+        assert self.client.db_read(1, 10, 2) == bytearray(b"\xaa\xbb")
+        self.client.db_write(1, 10, original)
+
+    def test_write_tag_invalidates(self) -> None:
+        bit = bool(self.client.db_read(1, 0, 100)[50] & 1)
+        self.client.write_tag("DB1.DBX50.0:BOOL", not bit)
+        assert self.client.read_tag("DB1.DBX50.0:BOOL") is not bit  # read_tag is never cached
+        assert bool(self.client.db_read(1, 50, 1)[0] & 1) is not bit
+        self.client.write_tag("DB1.DBX50.0:BOOL", bit)
+
+    def test_disconnect_clears(self) -> None:
+        self.client.db_read(1, 0, 100)
+        assert len(self.cache) == 1
+        self.client.disconnect()
+        assert len(self.cache) == 0
+
+    def test_disabled_area_bypasses_cache(self) -> None:
+        self.cache.area_ttl[Area.DB] = 0
+        self.client.db_read(1, 0, 10)
+        self.client.db_read(1, 0, 10)
+        assert (self.cache.hits, self.cache.misses) == (0, 0)
@@ -1,7 +1,8 @@
 import logging
 import struct
+import threading
 import time
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple, Union
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -22,8 +23,9 @@ from datetime import datetime, timedelta, timezone
 from typing import cast as typing_cast
 
 from snap7.util import get_real, get_int, set_int
-from snap7.error import check_error, S7ProtocolError, S7StalePacketError, S7PacketLostError
-from snap7.s7protocol import S7Protocol
+from snap7.error import check_error, S7ConnectionError, S7ProtocolError, S7StalePacketError, S7PacketLostError
+from snap7.s7protocol import RequestTemplate, S7Protocol
+from snap7.datatypes import S7Area, S7WordLen
 from snap7.server import Server
 from snap7.client import Client
 from snap7.type import SrvArea
@@ -120,6 +122,38 @@ class TestClient(unittest.TestCase):
         data = bytearray(size)
         self.client.db_write(db_number=1, start=0, data=data)
 
+    def test_db_read_into(self) -> None:
+        data = bytearray(range(40))
+        self.client.db_write(db_number=1, start=0, data=data)
+        buf = bytearray(60)
+        self.assertEqual(40, self.client.db_read_into(db_number=1, start=0, buf=memoryview(buf)[10:50]))
+        self.assertEqual(bytearray(10) + data + bytearray(10), buf)
+
+    def test_read_area_into_readonly(self) -> None:
+        self.assertRaises(TypeError, self.client.read_area_into, Area.DB, 1, 0, memoryview(bytes(4)))
+
+    def test_read_area_into_timers(self) -> None:
+        self.client.tm_write(0, 2, bytearray(b"\x10\x01\x20\x02"))
+        buf = bytearray(4)
+        self.assertEqual(4, self.client.read_area_into(Area.TM, 0, 0, buf))
+        self.assertEqual(bytearray(b"\x10\x01\x20\x02"), buf)
+        self.assertRaises(ValueError, self.client.read_area_into, Area.TM, 0, 0, bytearray(3))
+
+    def test_repeated_read_reuses_request(self) -> None:
+        self.client.db_write(db_number=1, start=0, data=bytearray(b"\x01\x02\x03\x04"))
+        self.assertEqual(bytearray(b"\x01\x02\x03\x04"), self.client.db_read(db_number=1, start=0, size=4))
+        template = self.client._read_templates[(S7Area.DB, 1, 0, S7WordLen.BYTE, 4)]
+        first_sequence = template.sequence
+        self.client.db_write(db_number=1, start=0, data=bytearray(b"\x05\x06\x07\x08"))
+        self.assertEqual(bytearray(b"\x05\x06\x07\x08"), self.client.db_read(db_number=1, start=0, size=4))
+        self.assertIs(template, self.client._read_templates[(S7Area.DB, 1, 0, S7WordLen.BYTE, 4)])
+        self.assertGreater(template.sequence, first_sequence)
+
+    def test_read_templates_bounded(self) -> None:
+        for start in range(Client.MAX_REQUEST_TEMPLATES + 5):
+            self.client.db_read(db_number=1, start=start, size=1)
+        self.assertEqual(Client.MAX_REQUEST_TEMPLATES, len(self.client._read_templates))
+
     def test_db_get(self) -> None:
         self.client.db_get(db_number=db_number)
 
@@ -1152,21 +1186,14 @@ class TestPDUSplitting:
 
         call_count = 0
 
-        def mock_send_receive(request: bytes, max_stale_retries: int = 3) -> dict[str, Any]:
+        def mock_send_receive_read(request: Union[bytes, RequestTemplate], max_stale_retries: int = 3) -> memoryview:
             nonlocal call_count
             call_count += 1
-            count = struct.unpack(">H", request[16:18])[0]
-            fake_data = bytes(range(count))
-            return {
-                "sequence": client.protocol.sequence,
-                "param_length": 2,
-                "data_length": count + 4,
-                "parameters": {"function_code": 0x04, "item_count": 1},
-                "data": {"return_code": 0xFF, "transport_size": 0x04, "data_length": count * 8, "data": fake_data},
-                "error_code": 0,
-            }
+            assert isinstance(request, RequestTemplate)
+            count = struct.unpack(">H", request.pdu[16:18])[0]
+            return memoryview(bytes(range(count)))
 
-        client._send_receive = mock_send_receive
+        client._send_receive_read = mock_send_receive_read
 
         result = client.read_area(Area.DB, 1, 0, 64)
         assert len(result) == 64
@@ -1183,7 +1210,7 @@ class TestPDUSplitting:
 
         call_count = 0
 
-        def mock_send_receive(request: bytes, max_stale_retries: int = 3) -> dict[str, Any]:
+        def mock_send_receive(request: Union[bytes, RequestTemplate], max_stale_retries: int = 3) -> dict[str, Any]:
             nonlocal call_count
             call_count += 1
             return {
@@ -1210,21 +1237,12 @@ class TestPDUSplitting:
 
         call_count = 0
 
-        def mock_send_receive(request: bytes, max_stale_retries: int = 3) -> dict[str, Any]:
+        def mock_send_receive_read(request: Union[bytes, RequestTemplate], max_stale_retries: int = 3) -> memoryview:
             nonlocal call_count
             call_count += 1
-            count = 10
-            fake_data = bytes(count)
-            return {
-                "sequence": client.protocol.sequence,
-                "param_length": 2,
-                "data_length": count + 4,
-                "parameters": {"function_code": 0x04, "item_count": 1},
-                "data": {"return_code": 0xFF, "transport_size": 0x04, "data_length": count * 8, "data": fake_data},
-                "error_code": 0,
-            }
+            return memoryview(bytes(10))
 
-        client._send_receive = mock_send_receive
+        client._send_receive_read = mock_send_receive_read
 
         result = client.read_area(Area.DB, 1, 0, 10)
         assert len(result) == 10
@@ -1238,25 +1256,53 @@ class TestMaxVars:
     def test_max_vars_constant(self) -> None:
         assert Client.MAX_VARS == 20
 
-    def test_read_multi_vars_rejects_too_many(self) -> None:
+    def test_read_multi_vars_limit_applies_per_packet(self) -> None:
+        """More than MAX_VARS items are split into packets of at most MAX_VARS specs."""
         client = Client()
         client.connected = True
-        mock_conn = MagicMock()
-        client.connection = mock_conn
+        client.connection = MagicMock()
+        client.pdu_length = 960  # room for far more than 20 address specs
+        item_counts: list[int] = []
+
+        def mock_send_receive(request: Union[bytes, RequestTemplate], max_stale_retries: int = 3) -> dict[str, Any]:
+            assert isinstance(request, RequestTemplate)
+            count = request.pdu[11]
+            item_counts.append(count)
+            raw = b""
+            for i in range(count):
+                raw += struct.pack(">BBH", 0xFF, 0x04, 8) + bytes([i])
+                if i < count - 1:
+                    raw += b"\x00"
+            return {"raw_data": raw}
 
-        items = [{"area": Area.DB, "db_number": 1, "start": i, "size": 1} for i in range(21)]
-        with pytest.raises(ValueError, match="Too many items.*21.*MAX_VARS.*20"):
-            client.read_multi_vars(items)
+        client._send_receive = mock_send_receive
 
-    def test_write_multi_vars_rejects_too_many(self) -> None:
+        # Items 10 bytes apart so none are merged into a shared block
+        items = [{"area": Area.DB, "db_number": 1, "start": i * 10, "size": 1} for i in range(45)]
+        result_code, results = client.read_multi_vars(items)
+        assert result_code == 0
+        assert len(results) == 45
+        assert item_counts == [20, 20, 5]
+        assert results[21] == bytearray([1])
+
+    def test_write_multi_vars_limit_applies_per_packet(self) -> None:
+        """More than MAX_VARS write items are split into packets of at most MAX_VARS items."""
         client = Client()
         client.connected = True
-        mock_conn = MagicMock()
-        client.connection = mock_conn
+        client.connection = MagicMock()
+        client.pdu_length = 960
+        item_counts: list[int] = []
+
+        def mock_send_receive(request: Union[bytes, RequestTemplate], max_stale_retries: int = 3) -> dict[str, Any]:
+            assert isinstance(request, bytes)
+            item_counts.append(request[11])
+            return {"raw_data": b"\xff" * request[11]}
 
-        items = [{"area": Area.DB, "db_number": 1, "start": i, "data": bytearray(1)} for i in range(21)]
-        with pytest.raises(ValueError, match="Too many items.*21.*MAX_VARS.*20"):
-            client.write_multi_vars(items)
+        client._send_receive = mock_send_receive
+
+        items = [{"area": Area.DB, "db_number": 1, "start": i * 10, "data": bytearray(1)} for i in range(45)]
+        assert client.write_multi_vars(items) == 0
+        assert item_counts == [20, 20, 5]
 
     def test_read_multi_vars_accepts_max(self) -> None:
         """20 items (the limit) should not raise."""
@@ -1277,7 +1323,7 @@ class TestMaxVars:
         client.connected = True
         mock_conn = MagicMock()
         client.connection = mock_conn
-        client.write_area = MagicMock(return_value=0)
+        client._send_receive = MagicMock(return_value={"raw_data": b"\xff" * 20})
 
         items = [{"area": Area.DB, "db_number": 1, "start": i, "data": bytearray(1)} for i in range(20)]
         result = client.write_multi_vars(items)
@@ -1289,5 +1335,213 @@ class TestMaxVars:
         assert result_code == 0
 
 
+@pytest.mark.client
+class TestPipelinedChunks:
+    """Test pipelined chunk transfers for large read_area/write_area calls."""
+
+    server: Server
+    client: Client
+    port: int
+
+    @classmethod
+    def setup_class(cls) -> None:
+        from .conftest import get_free_tcp_port
+
+        cls.server = Server()
+        cls.server.register_area(SrvArea.DB, 1, bytearray(4096))
+        cls.port = get_free_tcp_port()
+        cls.server.start(tcp_port=cls.port)
+        cls.client = Client()
+        cls.client.connect(ip, 0, 1, cls.port)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        cls.client.disconnect()
+        cls.server.stop()
+
+    def test_pipelined_read_matches_sequential(self) -> None:
+        data = bytearray(i % 251 for i in range(4096))
+        self.client.max_parallel = 1
+        self.client.db_write(1, 0, data)
+
+        self.client.max_parallel = 4
+        assert self.client.db_read(1, 0, 4096) == data
+
+        self.client.max_parallel = 1
+        assert self.client.db_read(1, 0, 4096) == data
+
+    def test_pipelined_write(self) -> None:
+        data = bytearray((i * 7) % 256 for i in range(3000))
+        self.client.max_parallel = 4
+        assert self.client.db_write(1, 10, data) == 0
+
+        self.client.max_parallel = 1
+        assert self.client.db_read(1, 10, 3000) == data
+
+    def test_chunked_read_into(self) -> None:
+        data = bytearray(i % 253 for i in range(4096))
+        self.client.db_write(1, 0, data)
+        buf = bytearray(4096)
+        for depth in (1, 4):
+            self.client.max_parallel = depth
+            buf[:] = bytes(4096)
+            assert self.client.db_read_into(1, 0, buf) == 4096
+            assert buf == data
+
+    def test_window_keeps_requests_in_flight(self) -> None:
+        """Several chunk requests are sent before the first reply is read."""
+        conn = self.client.connection
+        assert conn is not None
+        events: list[str] = []
+        batches: list[int] = []
+        original_send, original_batch, original_receive = conn.send_frame, conn.send_batch, conn.receive_data
+
+        def send(frame: bytes) -> None:
+            events.append("send")
+            original_send(frame)
+
+        def send_batch(pdus: list[bytes]) -> None:
+            events.extend(["send"] * len(pdus))
+            batches.append(len(pdus))
+            original_batch(pdus)
+
+        def receive() -> bytes:
+            events.append("recv")
+            return original_receive()
+
+        self.client.max_parallel = 3
+        with (
+            patch.object(conn, "send_frame", side_effect=send),
+            patch.object(conn, "send_batch", side_effect=send_batch),
+            patch.object(conn, "receive_data", side_effect=receive),
+        ):
+            self.client.db_read(1, 0, 2000)
+
+        assert events[:4] == ["send", "send", "send", "recv"]
+        assert events.count("send") == events.count("recv") == 5
+        # The initial window goes out in one batch
+        assert batches[0] == 3
+
+    def test_error_reply_drains_window(self) -> None:
+        """Replies still in flight after an error reply are not read by the next call."""
+        chunk = self.client._max_read_size()
+        original_read = self.server._read_from_memory_area
+
+        def read(area: Any, db_number: int, start: int, count: int) -> Optional[bytearray]:
+            return None if start == chunk else original_read(area, db_number, start, count)
+
+        self.client.max_parallel = 8
+        with patch.object(self.server, "_read_from_memory_area", side_effect=read):
+            with pytest.raises(S7ProtocolError):
+                self.client.db_read(1, 0, 4000)
+
+        assert self.client.get_connected()
+        self.client.db_write(1, 0, bytearray(b"\x01\x02\x03\x04"))
+        assert self.client.db_read(1, 0, 4) == bytearray(b"\x01\x02\x03\x04")
+
+
+@pytest.mark.client
+class TestReadCoalescing:
+    """Test single-flight coalescing of concurrent reads from several threads."""
+
+    server: Server
+    client: Client
+    port: int
+    data = bytearray(i % 251 for i in range(1000))
+
+    @classmethod
+    def setup_class(cls) -> None:
+        from .conftest import get_free_tcp_port
+
+        cls.server = Server()
+        cls.server.register_area(SrvArea.DB, 1, bytearray(cls.data))
+        cls.port = get_free_tcp_port()
+        cls.server.start(tcp_port=cls.port)
+        cls.client = Client(coalesce_reads=True)
+        cls.client.connect(ip, 0, 1, cls.port)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        cls.client.disconnect()
+        cls.server.stop()
+
+    def _hold_first_read(self, side_effect: Any = None) -> Tuple[Any, threading.Event, threading.Event]:
+        """Patch the wire read so that the first one blocks until released."""
+        entered, release = threading.Event(), threading.Event()
+        original = self.client._read_area_wire
+
+        def wire(*args: Any) -> Any:
+            if not entered.is_set():
+                entered.set()
+                release.wait(5)
+                if side_effect is not None:
+                    raise side_effect
+            return original(*args)
+
+        return patch.object(self.client, "_read_area_wire", side_effect=wire), entered, release
+
+    def test_sub_range_served_from_read_in_flight(self) -> None:
+        patcher, entered, release = self._hold_first_read()
+        results: dict[str, bytearray] = {}
+        with patcher as wire:
+            leader = threading.Thread(target=lambda: results.update(full=self.client.db_read(1, 0, 1000)))
+            leader.start()
+            assert entered.wait(5)
+            followers = [
+                threading.Thread(target=lambda n=n: results.update({f"part{n}": self.client.db_read(1, 100 * n, 50)}))
+                for n in range(3)
+            ]
+            for t in followers:
+                t.start()
+            while self.client._inflight_reads[0].followers < 3:
+                time.sleep(0.001)
+            release.set()
+            for t in [leader, *followers]:
+                t.join(5)
+
+        assert wire.call_count == 1
+        assert results["full"] == self.data
+        assert [results[f"part{n}"] for n in range(3)] == [self.data[100 * n : 100 * n + 50] for n in range(3)]
+
+    def test_range_not_covered_is_read_separately(self) -> None:
+        patcher, entered, release = self._hold_first_read()
+        results: dict[str, bytearray] = {}
+        with patcher as wire:
+            leader = threading.Thread(target=lambda: results.update(a=self.client.db_read(1, 0, 100)))
+            leader.start()
+            assert entered.wait(5)
+            release.set()
+            results["b"] = self.client.db_read(1, 50, 100)
+            leader.join(5)
+
+        assert wire.call_count == 2
+        assert results == {"a": self.data[0:100], "b": self.data[50:150]}
+
+    def test_error_shared_with_followers(self) -> None:
+        patcher, entered, release = self._hold_first_read(S7ConnectionError("gone"))
+        errors: list[Exception] = []
+
+        def read() -> None:
+            try:
+                self.client.db_read(1, 0, 10)
+            except S7ConnectionError as e:
+                errors.append(e)
+
+        with patcher:
+            leader = threading.Thread(target=read)
+            leader.start()
+            assert entered.wait(5)
+            follower = threading.Thread(target=read)
+            follower.start()
+            while self.client._inflight_reads[0].followers < 1:
+                time.sleep(0.001)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+
+        assert len(errors) == 2
+        assert not self.client._inflight_reads
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -76,6 +76,26 @@ class TestBuildCOTPDT:
         assert dt[3:] == data
 
 
+class TestFrameData:
+    """Test prebuilt data frames."""
+
+    def test_matches_send_data_framing(self) -> None:
+        conn = ISOTCPConnection("1.2.3.4")
+        data = b"\x32\x01\x00\x00\x00\x01"
+        frame = ISOTCPConnection.frame_data(data)
+        assert isinstance(frame, bytearray)
+        assert frame == conn._build_tpkt(conn._build_cotp_dt(data))
+        assert frame[ISOTCPConnection.FRAME_HEADER_SIZE :] == data
+
+    def test_send_frame(self) -> None:
+        conn = ISOTCPConnection("1.2.3.4")
+        conn.connected = True
+        conn.socket = MagicMock()
+        frame = ISOTCPConnection.frame_data(b"\x32")
+        conn.send_frame(frame)
+        conn.socket.sendall.assert_called_once_with(frame)
+
+
 class TestParseCOTPCC:
     """Test COTP Connection Confirm parsing."""
 
@@ -189,11 +209,75 @@ class TestSendData:
         conn = ISOTCPConnection("1.2.3.4")
         conn.connected = True
         conn.socket = MagicMock()
+        conn.socket.sendmsg.side_effect = socket.error("broken pipe")
         conn.socket.sendall.side_effect = socket.error("broken pipe")
         with pytest.raises(S7ConnectionError, match="Send failed"):
             conn.send_data(b"\x00")
         assert conn.connected is False
 
+    def test_send_data_framing(self) -> None:
+        conn = ISOTCPConnection("1.2.3.4")
+        conn.connected = True
+        conn.socket, peer = socket.socketpair()
+        try:
+            conn.send_data(b"\x32\x01\x00\x00")
+            assert peer.recv(100) == bytes(ISOTCPConnection.frame_data(b"\x32\x01\x00\x00"))
+        finally:
+            conn.socket.close()
+            peer.close()
+
+    def test_send_batch(self) -> None:
+        conn = ISOTCPConnection("1.2.3.4")
+        conn.connected = True
+        conn.socket, peer = socket.socketpair()
+        pdus = [bytes([0x32, 0x01, n % 256, n // 256]) for n in range(ISOTCPConnection.MAX_SEND_BATCH + 3)]
+        expected = b"".join(bytes(ISOTCPConnection.frame_data(pdu)) for pdu in pdus)
+        try:
+            conn.send_batch([memoryview(pdu) for pdu in pdus])
+            received = bytearray()
+            while len(received) < len(expected):
+                received += peer.recv(len(expected) - len(received))
+            assert received == expected
+        finally:
+            conn.socket.close()
+            peer.close()
+
+    @pytest.mark.skipif(not hasattr(socket.socket, "sendmsg"), reason="no sendmsg on this platform")
+    def test_send_batch_partial_sends(self) -> None:
+        conn = ISOTCPConnection("1.2.3.4")
+        conn.connected = True
+        conn.socket = MagicMock()
+        sent = bytearray()
+
+        def sendmsg(buffers: list[memoryview]) -> int:
+            # Accept at most 5 bytes per call
+            data = b"".join(bytes(b) for b in buffers)[:5]
+            sent.extend(data)
+            return len(data)
+
+        conn.socket.sendmsg.side_effect = sendmsg
+        conn.send_batch([b"\x32\x01abc", b"\x32\x01defgh"])
+        assert sent == ISOTCPConnection.frame_data(b"\x32\x01abc") + ISOTCPConnection.frame_data(b"\x32\x01defgh")
+
+
+def _recv_into(*chunks: object) -> object:
+    """``socket.recv_into`` side effect delivering *chunks* (bytes or exceptions) one per call."""
+    pending = list(chunks)
+
+    def recv_into(buf: memoryview) -> int:
+        chunk = pending.pop(0)
+        if isinstance(chunk, BaseException):
+            raise chunk
+        assert isinstance(chunk, bytes)
+        buf[: len(chunk)] = chunk
+        return len(chunk)
+
+    return recv_into
+
+
+def _dt_frame(pdu: bytes) -> bytes:
+    return bytes(ISOTCPConnection.frame_data(pdu))
+
 
 class TestReceiveData:
     """Test receive_data() error paths."""
@@ -209,7 +293,7 @@ class TestReceiveData:
         mock_socket = MagicMock()
         conn.socket = mock_socket
         # TPKT with version 5 instead of 3
-        mock_socket.recv.return_value = struct.pack(">BBH", 5, 0, 10)
+        mock_socket.recv_into.side_effect = _recv_into(struct.pack(">BBH", 5, 0, 10))
         with pytest.raises(S7ConnectionError, match="Invalid TPKT version"):
             conn.receive_data()
 
@@ -219,7 +303,7 @@ class TestReceiveData:
         mock_socket = MagicMock()
         conn.socket = mock_socket
         # Length = 3, remaining = -1
-        mock_socket.recv.return_value = struct.pack(">BBH", 3, 0, 3)
+        mock_socket.recv_into.side_effect = _recv_into(struct.pack(">BBH", 3, 0, 3))
         with pytest.raises(S7ConnectionError, match="Invalid TPKT length"):
             conn.receive_data()
 
@@ -228,7 +312,7 @@ class TestReceiveData:
         conn.connected = True
         mock_socket = MagicMock()
         conn.socket = mock_socket
-        mock_socket.recv.side_effect = socket.timeout("timeout")
+        mock_socket.recv_into.side_effect = socket.timeout("timeout")
         with pytest.raises(S7TimeoutError, match="Receive timeout"):
             conn.receive_data()
         assert conn.connected is False
@@ -238,49 +322,54 @@ class TestReceiveData:
         conn.connected = True
         mock_socket = MagicMock()
         conn.socket = mock_socket
-        # First recv returns valid TPKT header, second raises error
-        mock_socket.recv.side_effect = [struct.pack(">BBH", 3, 0, 10), socket.error("reset")]
+        # First read returns valid TPKT header, second raises error
+        mock_socket.recv_into.side_effect = _recv_into(struct.pack(">BBH", 3, 0, 10), socket.error("reset"))
         with pytest.raises(S7ConnectionError, match="Receive error"):
             conn.receive_data()
         assert conn.connected is False
 
-
-class TestRecvExact:
-    """Test _recv_exact() with various scenarios."""
-
-    def test_socket_none(self) -> None:
+    def test_several_frames_from_one_read(self) -> None:
         conn = ISOTCPConnection("1.2.3.4")
-        with pytest.raises(S7ConnectionError, match="Socket not initialized"):
-            conn._recv_exact(4)
+        conn.connected = True
+        conn.socket = MagicMock()
+        conn.socket.recv_into.side_effect = _recv_into(_dt_frame(b"\x32\x03first") + _dt_frame(b"\x32\x03second"))
+        assert conn.receive_data() == b"\x32\x03first"
+        assert conn.data_available()
+        assert conn.receive_data() == b"\x32\x03second"
+        assert conn.socket.recv_into.call_count == 1
 
-    def test_connection_closed(self) -> None:
+    def test_frame_split_over_reads(self) -> None:
         conn = ISOTCPConnection("1.2.3.4")
+        conn.connected = True
         conn.socket = MagicMock()
-        conn.socket.recv.return_value = b""  # empty = connection closed
-        with pytest.raises(S7ConnectionError, match="Connection closed"):
-            conn._recv_exact(4)
-        assert conn.connected is False
+        frame = _dt_frame(b"\x32\x03" + bytes(range(200)))
+        conn.socket.recv_into.side_effect = _recv_into(frame[:2], frame[2:50], frame[50:])
+        assert conn.receive_data() == frame[7:]
+        assert conn.socket.recv_into.call_count == 3
 
-    def test_partial_reads(self) -> None:
+    def test_partial_frame_moved_to_front(self) -> None:
         conn = ISOTCPConnection("1.2.3.4")
+        conn.connected = True
         conn.socket = MagicMock()
-        conn.socket.recv.side_effect = [b"\x01\x02", b"\x03\x04"]
-        result = conn._recv_exact(4)
-        assert result == b"\x01\x02\x03\x04"
+        big = _dt_frame(bytes(ISOTCPConnection.RECV_BUFFER_SIZE - 100))
+        last = _dt_frame(b"\x32\x03" + bytes(range(250)))
+        conn.socket.recv_into.side_effect = _recv_into(big + last[:50], last[50:])
+        assert len(conn.receive_data()) == len(big) - 7
+        assert conn.receive_data() == last[7:]
 
-    def test_timeout(self) -> None:
+    def test_connection_closed(self) -> None:
         conn = ISOTCPConnection("1.2.3.4")
+        conn.connected = True
         conn.socket = MagicMock()
-        conn.socket.recv.side_effect = socket.timeout("timeout")
-        with pytest.raises(S7TimeoutError):
-            conn._recv_exact(4)
+        conn.socket.recv_into.side_effect = _recv_into(b"")
+        with pytest.raises(S7ConnectionError, match="Connection closed"):
+            conn.receive_data()
+        assert conn.connected is False
 
-    def test_socket_error(self) -> None:
+    def test_socket_none(self) -> None:
         conn = ISOTCPConnection("1.2.3.4")
-        conn.socket = MagicMock()
-        conn.socket.recv.side_effect = socket.error("broken")
-        with pytest.raises(S7ConnectionError, match="Receive error"):
-            conn._recv_exact(4)
+        with pytest.raises(S7ConnectionError, match="Socket not initialized"):
+            conn._receive_frame()
 
 
 class TestSendCOTPDisconnect:
@@ -535,6 +624,6 @@ class TestISOConnect:
         # Build a valid CC response wrapped in a bad TPKT
         cc = struct.pack(">BBHHB", 6, 0xD0, 0x0001, 0x0001, 0x00)
         bad_tpkt = struct.pack(">BBH", 5, 0, 4 + len(cc))
-        mock_socket.recv.side_effect = [bad_tpkt, cc]
+        mock_socket.recv_into.side_effect = _recv_into(bad_tpkt, cc)
         with pytest.raises(S7ConnectionError, match="Invalid TPKT version"):
             conn._iso_connect()
@@ -0,0 +1,172 @@
+"""Tests for the selector-driven multi-connection engine."""
+
+import socket
+import struct
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from snap7.client import Client
+from snap7.engine import SelectorEngine
+from snap7.error import S7ConnectionError, S7TimeoutError
+from snap7.server import Server
+from snap7.type import Area, SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+@pytest.fixture(scope="module")
+def server() -> Generator[tuple[bytearray, int]]:
+    srv = Server()
+    db1 = bytearray(i % 251 for i in range(3000))
+    db1[0:6] = struct.pack(">hf", 1500, 2.5)
+    srv.register_area(SrvArea.DB, 1, db1)
+    srv.register_area(SrvArea.DB, 2, bytearray(3000))
+    port = get_free_tcp_port()
+    srv.start(tcp_port=port)
+    yield db1, port
+    srv.stop()
+    srv.destroy()
+
+
+@pytest.fixture
+def clients(server: tuple[bytearray, int]) -> Generator[list[Client]]:
+    _, port = server
+    connected = [Client().connect("127.0.0.1", 0, slot, port) for slot in (1, 2, 3)]
+    yield connected
+    for client in connected:
+        client.disconnect()
+
+
+@pytest.mark.client
+class TestSelectorEngine:
+    def test_reads_from_many_clients(self, server: tuple[bytearray, int], clients: list[Client]) -> None:
+        db1, _ = server
+        with SelectorEngine() as engine:
+            for client in clients:
+                engine.add(client)
+            futures = [engine.submit_read_area(client, Area.DB, 1, 0, 3000) for client in clients]
+            engine.wait(futures, timeout=5)
+        assert all(f.result() == db1 for f in futures)
+
+    def test_in_flight_bounded_by_amq(self, clients: list[Client]) -> None:
+        client = clients[0]
+        with SelectorEngine() as engine:
+            engine.add(client)
+            channel = engine._channels[client]
+            peak = 0
+            original = engine._flush
+
+            def flush(ch: object) -> None:
+                nonlocal peak
+                peak = max(peak, len(channel.in_flight))
+                original(ch)  # type: ignore[arg-type]
+
+            with patch.object(engine, "_flush", side_effect=flush):
+                future = engine.submit_read_area(client, Area.DB, 1, 0, 3000)
+                engine.wait([future], timeout=5)
+        assert 1 < peak <= client.max_amq_caller
+
+    def test_write_then_read(self, clients: list[Client]) -> None:
+        client = clients[0]
+        data = bytearray(i % 13 for i in range(1500))
+        with SelectorEngine() as engine:
+            engine.add(client)
+            write = engine.submit_write_area(client, Area.DB, 2, 100, data)
+            engine.wait([write], timeout=5)
+            read = engine.submit_read_area(client, Area.DB, 2, 100, 1500)
+            engine.wait([read], timeout=5)
+        assert write.result() == 0
+        assert read.result() == data
+
+    def test_read_tags(self, clients: list[Client]) -> None:
+        with SelectorEngine() as engine:
+            engine.add(clients[0])
+            future = engine.submit_read_tags(clients[0], ["DB1.DBW0:INT", "DB1.DBD2:REAL", "DB1.DBB2000:BYTE"])
+            engine.wait([future], timeout=5)
+        assert future.result() == [1500, 2.5, 2000 % 251]
+
+    def test_metrics(self, clients: list[Client]) -> None:
+        client = clients[0]
+        before = client.metrics.snapshot()
+        with SelectorEngine() as engine:
+            engine.add(client)
+            read = engine.submit_read_area(client, Area.DB, 1, 0, 3000)
+            tags = engine.submit_read_tags(client, ["DB1.DBW0:INT", "DB1.DBD2:REAL"])
+            engine.wait([read, tags], timeout=5)
+        after = client.metrics.snapshot()
+
+        requests = -(-3000 // client._max_read_size()) + 1
+        assert after.pdus_sent - before.pdus_sent == requests
+        assert after.pdus_received - before.pdus_received == requests
+        assert after.bytes_sent > before.bytes_sent
+        assert "read_area" not in before.latency and "read_multi_vars" not in before.latency
+        assert after.latency["read_area"].count == requests - 1
+        assert after.latency["read_multi_vars"].count == 1
+
+    def test_remove_restores_blocking_use(self, server: tuple[bytearray, int], clients: list[Client]) -> None:
+        db1, _ = server
+        client = clients[0]
+        engine = SelectorEngine()
+        engine.add(client)
+        engine.remove(client)
+        engine.close()
+        assert client.db_read(1, 0, 10) == db1[:10]
+
+    def test_remove_with_requests_in_flight_disconnects(self, clients: list[Client]) -> None:
+        client = clients[0]
+        with SelectorEngine() as engine:
+            engine.add(client)
+            future = engine.submit_read_area(client, Area.DB, 1, 0, 3000)
+            channel = engine._channels[client]
+            engine._dispatch(channel)  # send the requests without handling their replies
+            assert channel.in_flight
+            engine.remove(client)
+        assert isinstance(future.exception(), S7ConnectionError)
+        assert not client.connected
+        assert client.connection is None
+
+    def test_heartbeat_paused_while_added(self, server: tuple[bytearray, int]) -> None:
+        _, port = server
+        client = Client(heartbeat_interval=60).connect("127.0.0.1", 0, 1, port)
+        try:
+            with SelectorEngine() as engine:
+                engine.add(client)
+                assert client._heartbeat_thread is None
+                future = engine.submit_read_area(client, Area.DB, 1, 0, 10)
+                engine.wait([future], timeout=5)
+            assert client._heartbeat_thread is not None and client._heartbeat_thread.is_alive()
+        finally:
+            client.disconnect()
+        assert client._heartbeat_thread is None
+
+    def test_connection_loss_fails_requests(self, clients: list[Client]) -> None:
+        client = clients[0]
+        with SelectorEngine() as engine:
+            engine.add(client)
+            future = engine.submit_read_area(client, Area.DB, 1, 0, 10)
+            assert client.connection is not None and client.connection.socket is not None
+            client.connection.socket.shutdown(socket.SHUT_RDWR)
+            engine.wait([future], timeout=5)
+            assert isinstance(future.exception(), S7ConnectionError)
+            assert engine.clients == []
+        assert not client.get_connected()
+
+    def test_timeout(self, clients: list[Client]) -> None:
+        with SelectorEngine() as engine:
+            engine.add(clients[0])
+            future = engine.submit_read_area(clients[0], Area.DB, 1, 0, 10)
+            with pytest.raises(S7TimeoutError):
+                engine.wait([future], timeout=0)
+            engine.wait([future], timeout=5)
+            assert future.result() is not None
+
+    def test_invalid_use(self, clients: list[Client]) -> None:
+        with SelectorEngine() as engine:
+            with pytest.raises(ValueError):
+                engine.submit_read_area(clients[0], Area.DB, 1, 0, 10)
+            engine.add(clients[0])
+            with pytest.raises(ValueError):
+                engine.add(clients[0])
+            with pytest.raises(S7ConnectionError):
+                engine.add(Client())
@@ -0,0 +1,123 @@
+"""Tests for the OpenMetrics exporter."""
+
+import gc
+import urllib.error
+import urllib.request
+from collections.abc import Generator
+
+import pytest
+
+from snap7.client import Client
+from snap7.exporter import CONTENT_TYPE, MetricsExporter, _escape, render
+from snap7.metrics import tracked
+from snap7.partner import Partner
+from snap7.server import Server
+from snap7.type import SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+@pytest.fixture(scope="module")
+def server() -> Generator[Server]:
+    srv = Server()
+    srv.register_area(SrvArea.DB, 1, bytearray(100))
+    srv.start(tcp_port=get_free_tcp_port())
+    yield srv
+    srv.stop()
+    srv.destroy()
+
+
+@pytest.fixture
+def client(server: Server) -> Generator[Client]:
+    c = Client().connect("127.0.0.1", 0, 1, server.port)
+    yield c
+    c.disconnect()
+
+
+def samples(text: str) -> dict[str, float]:
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if not line.startswith("#")}
+
+
+@pytest.mark.client
+class TestRender:
+    def test_client_and_server(self, server: Server, client: Client) -> None:
+        client.db_read(1, 0, 10)
+        client.db_write(1, 0, bytearray(2))
+        text = render([client, server])
+        values = samples(text)
+
+        assert text.endswith("# EOF\n")
+        client_labels = f'id="{client.metrics.id}",host="127.0.0.1",rack="0",slot="1"'
+        assert values[f"snap7_client_connected{{{client_labels}}}"] == 1
+        assert values[f"snap7_client_pdus_sent_total{{{client_labels}}}"] == client.metrics.snapshot().pdus_sent
+        assert values[f'snap7_client_operation_seconds_count{{{client_labels},operation="read_area"}}'] == 1
+        assert values[f'snap7_client_operation_seconds_bucket{{{client_labels},operation="read_area",le="+Inf"}}'] == 1
+
+        server_labels = f'id="{server.metrics.id}",port="{server.port}"'
+        assert values[f"snap7_server_clients{{{server_labels}}}"] >= 1
+        assert values[f'snap7_server_requests_total{{{server_labels},function="READ_AREA"}}'] >= 1
+        assert values[f'snap7_server_requests_total{{{server_labels},function="WRITE_AREA"}}'] >= 1
+        assert values[f'snap7_server_area_lock_wait_seconds_count{{{server_labels},area="DB1"}}'] >= 2
+        assert any(name.startswith("snap7_server_request_seconds_count{") for name in values)
+
+    def test_each_family_once(self, server: Server, client: Client) -> None:
+        other = Client().connect("127.0.0.1", 0, 2, server.port)
+        try:
+            text = render([client, other, server])
+        finally:
+            other.disconnect()
+        types = [line for line in text.splitlines() if line.startswith("# TYPE")]
+        assert len(types) == len(set(types))
+        assert "# TYPE snap7_client_sent_bytes counter" in types
+        assert "# UNIT snap7_client_sent_bytes bytes" in text
+        assert "# TYPE snap7_client_operation_seconds histogram" in types
+
+    def test_partner(self) -> None:
+        partner = Partner()
+        try:
+            values = samples(render([partner]))
+        finally:
+            partner.destroy()
+        labels = f'id="{partner.metrics.id}",remote="",active="false"'
+        assert values[f"snap7_partner_connected{{{labels}}}"] == 0
+        assert values[f"snap7_partner_send_errors_total{{{labels}}}"] == 0
+
+    def test_tracks_live_objects(self, client: Client) -> None:
+        assert client in tracked()
+        assert f'id="{client.metrics.id}"' in render()
+        dropped = Client()
+        dropped_id = dropped.metrics.id
+        del dropped
+        gc.collect()
+        assert all(owner.metrics.id != dropped_id for owner in tracked())
+
+    def test_invalid_owner(self) -> None:
+        with pytest.raises(TypeError):
+            render([object()])
+
+    def test_escape(self) -> None:
+        assert _escape('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+@pytest.mark.client
+class TestMetricsExporter:
+    def test_serves_metrics(self, client: Client) -> None:
+        with MetricsExporter(host="127.0.0.1", port=0, owners=lambda: [client]) as exporter:
+            with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                body = response.read().decode()
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/other", timeout=5)
+            assert excinfo.value.code == 404
+        assert not exporter.running
+        assert f'snap7_client_connected{{id="{client.metrics.id}"' in body
+        assert body.endswith("# EOF\n")
+
+    def test_start_twice(self) -> None:
+        exporter = MetricsExporter(host="127.0.0.1", port=0, owners=list)
+        exporter.start()
+        try:
+            with pytest.raises(RuntimeError):
+                exporter.start()
+        finally:
+            exporter.stop()
+        exporter.stop()
@@ -0,0 +1,162 @@
+"""Tests for the asyncio fleet poller."""
+
+import asyncio
+import struct
+import time
+from collections.abc import Awaitable, Callable, Generator
+from unittest.mock import patch
+
+import pytest
+
+from snap7.error import S7ConnectionError
+from snap7.fleet import FleetPoller, FleetResult
+from snap7.server import Server
+from snap7.type import SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+@pytest.fixture(scope="module")
+def server() -> Generator[tuple[Server, bytearray, int]]:
+    srv = Server()
+    db1 = bytearray(100)
+    srv.register_area(SrvArea.DB, 1, db1)
+    srv.register_area(SrvArea.DB, 2, bytearray(2000))
+    port = get_free_tcp_port()
+    srv.start(tcp_port=port)
+    yield srv, db1, port
+    srv.stop()
+    srv.destroy()
+
+
+@pytest.mark.asyncio
+async def test_fleet_delivers_results_of_every_plc(server: tuple[Server, bytearray, int]) -> None:
+    _, db1, port = server
+    db1[0:6] = struct.pack(">hf", 1500, 2.5)
+    async with FleetPoller(connect_interval=0.01) as fleet:
+        for name in ("press1", "press2", "press3"):
+            fleet.add_plc(name, "127.0.0.1", 0, 1, tcp_port=port)
+            fleet.add_group(name, "status", {"speed": "DB1.DBW0:INT", "load": "DB1.DBD2:REAL"}, interval=0.05)
+
+        results: list[FleetResult] = []
+        async for result in fleet.results():
+            results.append(result)
+            if {r.plc for r in results} == {"press1", "press2", "press3"}:
+                break
+
+    assert all(r.error is None and r.values == {"speed": 1500, "load": 2.5} for r in results)
+    assert not fleet.running
+    assert all(not plc.client.get_connected() for plc in fleet.plcs.values())
+
+
+@pytest.mark.asyncio
+async def test_due_groups_share_one_read(server: tuple[Server, bytearray, int]) -> None:
+    _, _, port = server
+    fleet = FleetPoller()
+    plc = fleet.add_plc("press", "127.0.0.1", 0, 1, tcp_port=port)
+    fleet.add_group("press", "fast", ["DB1.DBW0:INT"], interval=0.1)
+    fleet.add_group("press", "slow", ["DB1.DBW4:INT"], interval=1.0)
+    await plc.client.connect("127.0.0.1", 0, 1, port)
+    try:
+        with patch.object(plc.client, "read_multi_vars", wraps=plc.client.read_multi_vars) as read:
+            results = await fleet.poll("press")
+            assert [r.group for r in results] == ["fast", "slow"]
+            assert read.call_count == 1
+
+            # Only the fast group is due 0.1 s later
+            results = await fleet.poll("press", now=time.monotonic() + 0.1)
+            assert [r.group for r in results] == ["fast"]
+            assert read.call_count == 2
+    finally:
+        await plc.client.disconnect()
+    assert fleet.queue.qsize() == 3
+
+
+@pytest.mark.asyncio
+async def test_lost_connection_reported_and_disconnected(server: tuple[Server, bytearray, int]) -> None:
+    _, _, port = server
+    fleet = FleetPoller()
+    plc = fleet.add_plc("press", "127.0.0.1", 0, 1, tcp_port=port)
+    group = fleet.add_group("press", "status", ["DB1.DBW0:INT"], interval=0.1)
+    await plc.client.connect("127.0.0.1", 0, 1, port)
+
+    with patch.object(plc.client, "read_multi_vars", side_effect=S7ConnectionError("gone")):
+        results = await fleet.poll("press")
+
+    assert isinstance(results[0].error, S7ConnectionError)
+    assert results[0].values == {}
+    assert group.errors == 1
+    assert not plc.client.get_connected()
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_reported() -> None:
+    port = get_free_tcp_port()
+    async with FleetPoller(reconnect_delay=10) as fleet:
+        plc = fleet.add_plc("offline", "127.0.0.1", 0, 1, tcp_port=port)
+        fleet.add_group("offline", "status", ["DB1.DBW0:INT"], interval=0.1)
+        result = await asyncio.wait_for(fleet.queue.get(), timeout=5)
+
+    assert result.plc == "offline"
+    assert result.error is not None
+    assert plc.connect_errors == 1
+    assert plc.connects == 0
+
+
+@pytest.mark.asyncio
+async def test_connects_are_staggered(server: tuple[Server, bytearray, int]) -> None:
+    _, _, port = server
+    fleet = FleetPoller(connect_interval=0.05)
+    plcs = [fleet.add_plc(f"press{n}", "127.0.0.1", 0, 1, tcp_port=port) for n in range(3)]
+
+    started = time.monotonic()
+    await asyncio.gather(*(fleet._connect(plc) for plc in plcs))
+    elapsed = time.monotonic() - started
+    await fleet.stop()
+
+    assert [plc.connects for plc in plcs] == [1, 1, 1]
+    assert elapsed >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_bounds_requests(server: tuple[Server, bytearray, int]) -> None:
+    _, _, port = server
+    fleet = FleetPoller(max_in_flight=1)
+    plcs = [fleet.add_plc(f"press{n}", "127.0.0.1", 0, 1, tcp_port=port) for n in range(2)]
+    peak = 0
+
+    for plc in plcs:
+        # Two blocks that do not fit in one PDU: two packets per scan
+        fleet.add_group(plc.name, "recipes", ["DB2.DBB0:FSTRING[400]", "DB2.DBB1000:FSTRING[400]"], interval=1.0)
+        await plc.client.connect("127.0.0.1", 0, 1, port)
+        assert plc.client.max_amq_caller > 1
+        conn = plc.client._get_connection()
+
+        async def send_data(data: bytes, send: Callable[[bytes], Awaitable[None]] = conn.send_data) -> None:
+            nonlocal peak
+            peak = max(peak, sum(len(p.client._pending) for p in plcs))
+            await send(data)
+
+        conn.send_data = send_data
+    try:
+        results = await asyncio.gather(*(fleet.poll(plc.name) for plc in plcs))
+    finally:
+        await fleet.stop()
+
+    assert all(r.error is None for plc_results in results for r in plc_results)
+    assert peak == 1
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        FleetPoller(max_in_flight=0)
+    fleet = FleetPoller()
+    fleet.add_plc("press", "127.0.0.1", 0, 1)
+    with pytest.raises(ValueError):
+        fleet.add_plc("press", "127.0.0.1", 0, 2)
+    fleet.add_group("press", "status", ["DB1.DBW0:INT"], interval=1.0)
+    with pytest.raises(ValueError):
+        fleet.add_group("press", "status", ["DB1.DBW2:INT"], interval=1.0)
+    with pytest.raises(ValueError):
+        fleet.add_group("press", "other", ["DB1.DBW2:INT"], interval=0)
+    with pytest.raises(KeyError):
+        fleet.add_group("missing", "status", ["DB1.DBW2:INT"], interval=1.0)
@@ -0,0 +1,204 @@
+"""Tests for the per-client performance metrics."""
+
+import math
+import threading
+import time
+from collections.abc import Generator
+
+import pytest
+
+from snap7.async_client import AsyncClient
+from snap7.client import Client
+from snap7.metrics import ClientMetrics, HistogramSnapshot, LatencyHistogram, ServerMetrics
+from snap7.optimizer import ReadBlock, ReadItem, ReadPacket, gap_bytes
+from snap7.server import Server, _function_name
+from snap7.type import Area, SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+@pytest.fixture(scope="module")
+def port() -> Generator[int]:
+    srv = Server()
+    srv.register_area(SrvArea.DB, 1, bytearray(2000))
+    tcp_port = get_free_tcp_port()
+    srv.start(tcp_port=tcp_port)
+    yield tcp_port
+    srv.stop()
+    srv.destroy()
+
+
+class TestLatencyHistogram:
+    def test_buckets_and_quantiles(self) -> None:
+        histogram = LatencyHistogram(bounds=(0.001, 0.01, 0.1))
+        for seconds in (0.0005, 0.001, 0.005, 0.05, 0.5):
+            histogram.observe(seconds)
+        snapshot = histogram.snapshot()
+        assert snapshot.counts == (2, 1, 1, 1)
+        assert snapshot.count == 5
+        assert snapshot.mean == pytest.approx(0.5565 / 5)
+        assert snapshot.quantile(0.4) == 0.001
+        assert snapshot.quantile(0.6) == 0.01
+        assert math.isinf(snapshot.quantile(1.0))
+
+    def test_empty(self) -> None:
+        snapshot = HistogramSnapshot((0.1,), (0, 0), 0, 0.0)
+        assert snapshot.quantile(0.5) == 0.0
+        assert snapshot.mean == 0.0
+        with pytest.raises(ValueError):
+            snapshot.quantile(2)
+
+    def test_invalid_bounds(self) -> None:
+        with pytest.raises(ValueError):
+            LatencyHistogram(bounds=(0.1, 0.01))
+        with pytest.raises(ValueError):
+            ClientMetrics(buckets=(0.1, 0.1))
+
+
+class TestClientMetrics:
+    def test_snapshot_is_a_copy(self) -> None:
+        metrics = ClientMetrics()
+        metrics.observe("read_area", 0.002)
+        metrics.count_sent(2, 100)
+        metrics.count_plan(3, 10)
+        metrics.count_plan(1, 0)
+        snapshot = metrics.snapshot()
+        metrics.observe("read_area", 0.002)
+        metrics.count_sent(1, 50)
+        assert snapshot.latency["read_area"].count == 1
+        assert (snapshot.pdus_sent, snapshot.bytes_sent) == (2, 100)
+        assert snapshot.packets_per_call == 2.0
+        assert snapshot.optimizer_gap_bytes == 10
+
+    def test_empty(self) -> None:
+        snapshot = ClientMetrics().snapshot()
+        assert snapshot.latency == {}
+        assert snapshot.reconnects == 0
+        assert snapshot.packets_per_call == 0.0
+
+    def test_concurrent_updates(self) -> None:
+        metrics = ClientMetrics()
+
+        def work() -> None:
+            for _ in range(1000):
+                metrics.count_received(1, 10)
+                metrics.observe("read_area", 0.001)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        snapshot = metrics.snapshot()
+        assert (snapshot.pdus_received, snapshot.bytes_received) == (4000, 40000)
+        assert snapshot.latency["read_area"].count == 4000
+
+
+def test_server_metrics() -> None:
+    metrics = ServerMetrics()
+    metrics.count_request("READ_AREA")
+    metrics.count_request("READ_AREA")
+    metrics.observe_request("10.0.0.1:4000", 0.001)
+    metrics.observe_lock_wait("DB1", 0.0)
+    snapshot = metrics.snapshot()
+    metrics.drop_client("10.0.0.1:4000")
+    assert snapshot.requests == {"READ_AREA": 2}
+    assert snapshot.request_latency["10.0.0.1:4000"].count == 1
+    assert snapshot.lock_wait["DB1"].count == 1
+    assert metrics.snapshot().request_latency == {}
+
+
+def test_function_name() -> None:
+    assert _function_name(0x04) == "READ_AREA"
+    assert _function_name(0x77) == "0x77"
+    assert _function_name(None) == "UNKNOWN"
+
+
+def test_gap_bytes() -> None:
+    items = [ReadItem(0x84, 1, 0, 0, 4, 0), ReadItem(0x84, 1, 2, 0, 4, 1), ReadItem(0x84, 1, 10, 0, 2, 2)]
+    packets = [ReadPacket([ReadBlock(0x84, 1, 0, 12, items), ReadBlock(0x84, 1, 20, 2, [ReadItem(0x84, 1, 20, 0, 2, 3)])])]
+    assert gap_bytes(packets) == 4  # bytes 6..9 of the first block
+
+
+@pytest.mark.client
+class TestClientCounting:
+    def test_read_counts_pdus_bytes_and_latency(self, port: int) -> None:
+        client = Client().connect("127.0.0.1", 0, 1, port)
+        try:
+            before = client.metrics.snapshot()
+            client.db_read(1, 0, 100)
+            after = client.metrics.snapshot()
+        finally:
+            client.disconnect()
+        assert before.latency["connect"].count == 1
+        assert after.pdus_sent - before.pdus_sent == 1
+        assert after.pdus_received - before.pdus_received == 1
+        # Read request of 31 bytes, reply of 125 bytes, framing included
+        assert after.bytes_sent - before.bytes_sent == 31
+        assert after.bytes_received - before.bytes_received == 125
+        assert after.latency["read_area"].count == 1
+
+    def test_pipelined_read_counts_every_pdu(self, port: int) -> None:
+        client = Client().connect("127.0.0.1", 0, 1, port)
+        try:
+            before = client.metrics.snapshot()
+            client.db_read(1, 0, 2000)
+            after = client.metrics.snapshot()
+        finally:
+            client.disconnect()
+        chunks = -(-2000 // client._max_read_size())
+        assert after.pdus_sent - before.pdus_sent == chunks
+        assert after.pdus_received - before.pdus_received == chunks
+
+    def test_optimizer_counters(self, port: int) -> None:
+        client = Client().connect("127.0.0.1", 0, 1, port)
+        client.multi_read_max_gap = 8
+        items = [{"area": Area.DB, "db_number": 1, "start": start, "size": 2} for start in (0, 6, 100)]
+        try:
+            client.read_multi_vars(items)
+            client.read_multi_vars(items)
+        finally:
+            client.disconnect()
+        snapshot = client.metrics.snapshot()
+        assert snapshot.optimizer_calls == 2
+        assert snapshot.optimizer_gap_bytes == 2 * 4
+        assert snapshot.packets_per_call == 1.0
+        assert snapshot.latency["read_multi_vars"].count == 2
+
+    def test_reconnect_counted(self, port: int) -> None:
+        client = Client(auto_reconnect=True, retry_delay=0.1).connect("127.0.0.1", 0, 1, port)
+        try:
+            assert client.connection is not None and client.connection.socket is not None
+            client.connection.socket.close()
+            client.connected = False
+            client.db_read(1, 0, 4)
+        finally:
+            client.disconnect()
+        assert client.metrics.snapshot().reconnects == 1
+
+    def test_heartbeat_failure_counted(self, port: int) -> None:
+        client = Client(heartbeat_interval=0.1).connect("127.0.0.1", 0, 1, port)
+        try:
+            assert client.connection is not None and client.connection.socket is not None
+            client.connection.socket.close()
+            for _ in range(50):
+                if client.metrics.snapshot().heartbeat_failures:
+                    break
+                time.sleep(0.05)
+        finally:
+            client.disconnect()
+        assert client.metrics.snapshot().heartbeat_failures >= 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_counting(port: int) -> None:
+    async with AsyncClient() as client:
+        await client.connect("127.0.0.1", 0, 1, port)
+        before = client.metrics.snapshot()
+        await client.db_read(1, 0, 100)
+        await client.db_write(1, 0, bytearray(10))
+        after = client.metrics.snapshot()
+    assert after.pdus_sent - before.pdus_sent == 2
+    assert after.pdus_received - before.pdus_received == 2
+    assert after.bytes_received - before.bytes_received > 100
+    assert after.latency["read_area"].count == 1
+    assert after.latency["write_area"].count == 1
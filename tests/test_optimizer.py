@@ -6,7 +6,7 @@ import time
 
 from .conftest import get_free_tcp_port
 from ctypes import c_char
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Union
 
 import pytest
 
@@ -15,14 +15,21 @@ if TYPE_CHECKING:
     from snap7.server import Server
 
 from snap7.optimizer import (
+    CostEstimator,
+    CostModel,
     ReadItem,
     ReadBlock,
     ReadPacket,
+    WriteItem,
+    choose_parameters,
+    coalesce_items,
     sort_items,
     merge_items,
     packetize,
+    packetize_writes,
     extract_results,
 )
+from snap7.tags import Tag
 from snap7.type import Area, SrvArea
 
 
@@ -153,6 +160,19 @@ class TestMergeItems:
 # ---------------------------------------------------------------------------
 
 
+class TestCoalesce:
+    """Tests for coalesce_items()."""
+
+    def test_bits_in_one_byte_read_once(self) -> None:
+        items = [
+            ReadItem(area=0x84, db_number=1, byte_offset=offset, bit_offset=bit, byte_length=1, index=i)
+            for i, (offset, bit) in enumerate([(0, 0), (0, 5), (1, 2), (0, 7)])
+        ]
+        distinct, item_map = coalesce_items(items)
+        assert [(d.byte_offset, d.index) for d in distinct] == [(0, 0), (1, 1)]
+        assert item_map == [0, 0, 1, 0]
+
+
 class TestPacketize:
     """Tests for packetize()."""
 
@@ -185,6 +205,12 @@ class TestPacketize:
         packets = packetize(blocks, pdu_size=240)
         assert len(packets) == 2
 
+    def test_max_blocks_limit(self) -> None:
+        # Budgets allow 78 specs at pdu=960; the per-request item limit applies first
+        blocks = [ReadBlock(area=0x84, db_number=i, start_offset=0, byte_length=2, items=[]) for i in range(45)]
+        packets = packetize(blocks, pdu_size=960, max_blocks=20)
+        assert [len(p.blocks) for p in packets] == [20, 20, 5]
+
     def test_oversized_block_split(self) -> None:
         # A block larger than pdu - overhead should be split at item boundaries
         items = [
@@ -198,6 +224,49 @@ class TestPacketize:
         assert total_blocks == 2
 
 
+# ---------------------------------------------------------------------------
+# Unit tests for packetize_writes
+# ---------------------------------------------------------------------------
+
+
+class TestPacketizeWrites:
+    """Tests for packetize_writes()."""
+
+    def test_twenty_setpoints_one_packet(self) -> None:
+        items = [WriteItem(area=0x84, db_number=1, start=i * 4, word_len=0x02, data=bytes(4), index=i) for i in range(20)]
+        packets = packetize_writes(items, pdu_size=480)
+        assert len(packets) == 1
+        assert [item.index for item in packets[0].items] == list(range(20))
+
+    def test_request_budget_limit(self) -> None:
+        # Each item costs 12 + 4 + 100 = 116. With pdu=240: budget = 240-14 = 226, fits 1 item.
+        items = [WriteItem(area=0x84, db_number=1, start=i * 100, word_len=0x02, data=bytes(100), index=i) for i in range(3)]
+        packets = packetize_writes(items, pdu_size=240)
+        assert len(packets) == 3
+
+    def test_max_items_limit(self) -> None:
+        items = [WriteItem(area=0x84, db_number=1, start=i, word_len=0x02, data=b"\x01", index=i) for i in range(25)]
+        packets = packetize_writes(items, pdu_size=960, max_items=20)
+        assert [len(p.items) for p in packets] == [20, 5]
+
+    def test_oversized_item_split(self) -> None:
+        # pdu=240: max single item data = 240-14-16 = 210
+        items = [WriteItem(area=0x84, db_number=1, start=10, word_len=0x02, data=bytes(range(250)), index=0)]
+        packets = packetize_writes(items, pdu_size=240)
+        chunks = [item for p in packets for item in p.items]
+        assert [c.start for c in chunks] == [10, 220]
+        assert b"".join(c.data for c in chunks) == bytes(range(250))
+        assert all(c.index == 0 for c in chunks)
+
+    def test_timer_split_counts_elements(self) -> None:
+        # Timers are addressed per 2-byte element
+        items = [WriteItem(area=0x1D, db_number=0, start=0, word_len=0x1D, data=bytes(300), index=0)]
+        packets = packetize_writes(items, pdu_size=240)
+        chunks = [item for p in packets for item in p.items]
+        assert [c.start for c in chunks] == [0, 105]
+        assert all(len(c.data) % 2 == 0 for c in chunks)
+
+
 # ---------------------------------------------------------------------------
 # Unit tests for extract_results
 # ---------------------------------------------------------------------------
@@ -228,6 +297,67 @@ class TestExtractResults:
         assert results[0] == bytearray(b"\x10\x20\x30\x40\x50\x60\x70\x80")
         assert results[1] == bytearray(b"\x50\x60\x70\x80")
 
+    def test_separate_buffers(self) -> None:
+        item_a = ReadItem(area=0x84, db_number=1, byte_offset=0, bit_offset=0, byte_length=2, index=0)
+        item_b = ReadItem(area=0x84, db_number=2, byte_offset=0, bit_offset=0, byte_length=2, index=1)
+        block_a = ReadBlock(area=0x84, db_number=1, start_offset=0, byte_length=2, items=[item_a])
+        block_b = ReadBlock(area=0x84, db_number=2, start_offset=0, byte_length=2, items=[item_b])
+        packets = [ReadPacket(blocks=[block_a]), ReadPacket(blocks=[block_b])]
+
+        results = extract_results(packets, 2, [[bytearray(b"\x01\x02")], [bytearray(b"\x03\x04")]])
+        assert results == [bytearray(b"\x01\x02"), bytearray(b"\x03\x04")]
+        assert block_a.buffer == bytearray()  # packets are left untouched
+
+
+class TestCostModel:
+    """Tests for CostEstimator and choose_parameters()."""
+
+    def _items(self, count: int, spacing: int, size: int) -> list[ReadItem]:
+        return [
+            ReadItem(area=0x84, db_number=1, byte_offset=i * spacing, bit_offset=0, byte_length=size, index=i)
+            for i in range(count)
+        ]
+
+    def test_estimator_fits_rtt_and_byte_time(self) -> None:
+        estimator = CostEstimator()
+        assert estimator.model() is None
+        for size in range(50, 1050, 50):
+            estimator.add_sample(size, 0.04 + size * 2e-6)
+        model = estimator.model()
+        assert model is not None
+        assert model.rtt == pytest.approx(0.04)
+        assert model.byte_time == pytest.approx(2e-6)
+
+    def test_estimator_constant_size(self) -> None:
+        estimator = CostEstimator()
+        for _ in range(10):
+            estimator.add_sample(100, 0.01)
+        model = estimator.model()
+        assert model is not None
+        assert model.byte_time == CostModel.byte_time
+        assert model.rtt == pytest.approx(0.01 - 100 * CostModel.byte_time)
+
+    def test_slow_link_merges_to_save_packets(self) -> None:
+        """On a high-latency link reading gap bytes beats a second packet."""
+        items = self._items(30, spacing=10, size=2)
+        parameters, packets = choose_parameters(items, 480, CostModel(rtt=0.04, byte_time=1e-7), 462)
+        assert parameters.max_gap >= 8
+        assert parameters.packet_count == len(packets) == 1
+
+    def test_fast_link_skips_wasted_bytes(self) -> None:
+        """When no packet is saved, gap bytes are not worth reading."""
+        items = self._items(15, spacing=30, size=1)
+        parameters, packets = choose_parameters(items, 480, CostModel(rtt=1e-4, byte_time=1e-5), 462)
+        assert parameters.max_gap < 29
+        assert len(packets) == 1
+        assert len(packets[0].blocks) == 15
+
+    def test_estimate_with_depth(self) -> None:
+        packets = [ReadPacket(blocks=[ReadBlock(area=0x84, db_number=1, start_offset=0, byte_length=2)])] * 4
+        model = CostModel(rtt=0.01, byte_time=0.0)
+        assert model.estimate(packets) == pytest.approx(0.04)
+        assert model.estimate(packets, depth=3) == pytest.approx(0.02)
+
 
 # ---------------------------------------------------------------------------
 # Integration tests against the server
@@ -319,6 +449,16 @@ class TestMultiReadServer:
             expected = bytearray(self.db1_data[i * 8 : i * 8 + 4])
             assert results[i] == expected, f"Mismatch at item {i}"
 
+    def test_more_than_max_vars(self) -> None:
+        """A single call may read more items than fit in one request."""
+        items = [{"area": Area.DB, "db_number": 1 + i % 2, "start": (i // 2) * 4, "size": 2} for i in range(50)]
+        result_code, results = self.client.read_multi_vars(items)
+        assert result_code == 0
+        for i, result in enumerate(results):
+            source = self.db1_data if i % 2 == 0 else self.db2_data
+            start = (i // 2) * 4
+            assert result == bytearray(source[start : start + 2]), f"Mismatch at item {i}"
+
     def test_parallel_dispatch(self) -> None:
         """Parallel dispatch produces the same results as sequential."""
         items = [{"area": Area.DB, "db_number": 1, "start": i * 8, "size": 4} for i in range(10)]
@@ -333,10 +473,114 @@ class TestMultiReadServer:
 
         assert seq_results == par_results
 
+    def test_plan_cache_keeps_several_layouts(self) -> None:
+        """Alternating tag groups reuse their compiled plans."""
+        group_a = [{"area": Area.DB, "db_number": 1, "start": i * 8, "size": 4} for i in range(4)]
+        group_b = [{"area": Area.DB, "db_number": 2, "start": i * 8, "size": 2} for i in range(4)]
+        self.client._opt_plans.clear()
+        self.client.multi_read_max_gap = 5  # keep cost model refreshes from dropping the plans
+        try:
+            _, results_a = self.client.read_multi_vars(group_a)
+            _, results_b = self.client.read_multi_vars(group_b)
+            plans = list(self.client._opt_plans.values())
+            assert len(plans) == 2
+
+            assert self.client.read_multi_vars(group_a)[1] == results_a
+            assert self.client.read_multi_vars(group_b)[1] == results_b
+            assert list(self.client._opt_plans.values()) == plans
+        finally:
+            self.client.multi_read_max_gap = None
+        assert all(not blk.buffer for plan in plans for packet in plan.packets for blk in packet.blocks)
+
+    def test_plan_requests_not_stamped(self) -> None:
+        """Sends stamp copies, so the compiled requests of a shared plan never change."""
+        items = [
+            {"area": Area.DB, "db_number": 1, "start": 0, "size": 2},
+            {"area": Area.DB, "db_number": 2, "start": 0, "size": 2},
+        ]
+        self.client._opt_plans.clear()
+        self.client.read_multi_vars(items)
+        plan = next(reversed(self.client._opt_plans.values()))
+        requests = [request for request in plan.requests if request is not None]
+        assert requests
+        frames = [bytes(request.frame) for request in requests]
+        for depth in (1, 4):
+            self.client.max_parallel = depth
+            self.client.read_multi_vars(items)
+        assert [bytes(request.frame) for request in requests] == frames
+
+    def test_plan_cache_bounded(self) -> None:
+        """Only the most recently used plans are kept."""
+        self.client._opt_plans.clear()
+        self.client.multi_read_max_gap = 5
+        try:
+            for i in range(self.client.MAX_OPTIMIZER_PLANS + 3):
+                items = [
+                    {"area": Area.DB, "db_number": 1, "start": i, "size": 1},
+                    {"area": Area.DB, "db_number": 2, "start": i, "size": 1},
+                ]
+                self.client.read_multi_vars(items)
+            assert len(self.client._opt_plans) == self.client.MAX_OPTIMIZER_PLANS
+        finally:
+            self.client.multi_read_max_gap = None
+
+    def test_bool_tags_share_byte(self) -> None:
+        """Many BOOL tags in a few bytes are read as one item per byte."""
+        tags: list[Union[Tag, str]] = [f"DB1.DBX{byte}.{bit}:BOOL" for byte in (6, 7) for bit in range(8)]
+        values = self.client.read_tags(tags)
+        expected = [bool(self.db1_data[byte] >> bit & 1) for byte in (6, 7) for bit in range(8)]
+        assert values == expected
+        plan = next(reversed(self.client._opt_plans.values()))
+        assert plan.item_count == 2
+
+    def test_cost_model_measured(self) -> None:
+        """The client times its exchanges and exposes the chosen plan parameters."""
+        for _ in range(10):
+            self.client.db_read(1, 0, 4)
+        items = [
+            {"area": Area.DB, "db_number": 1, "start": 0, "size": 2},
+            {"area": Area.DB, "db_number": 2, "start": 0, "size": 2},
+        ]
+        _, results = self.client.read_multi_vars(items)
+        assert results == [bytearray(self.db1_data[0:2]), bytearray(self.db2_data[0:2])]
+        assert self.client.cost_model is not None
+        parameters = self.client.plan_parameters
+        assert parameters is not None
+        assert parameters.packet_count == 1
+
     def test_auto_tune_parallel(self) -> None:
-        """Auto-tune sets max_parallel based on PDU size."""
+        """Auto-tune sets max_parallel to the negotiated AMQ depth."""
         self.client._auto_tune_parallel()
         assert self.client.max_parallel >= 1
+        assert self.client.max_parallel == self.client.max_amq_caller
+
+    def test_negotiated_amq(self) -> None:
+        """The server grants the requested AMQ depth, capped at its own maximum."""
+        assert self.client.max_amq_caller == min(self.client.AMQ_REQUEST, self.server.MAX_AMQ)
+        assert self.client.max_amq_callee == min(self.client.AMQ_REQUEST, self.server.MAX_AMQ)
+
+    def test_pipeline_depth_bounded_by_amq(self) -> None:
+        """A manual max_parallel above the negotiated AMQ is clamped."""
+        self.client.max_parallel = self.client.max_amq_caller + 10
+        assert self.client._pipeline_depth() == self.client.max_amq_caller
+        self.client.max_parallel = 1
+        assert self.client._pipeline_depth() == 1
+
+    def test_apply_setup_communication(self) -> None:
+        """Negotiated values from the setup reply are stored on the client."""
+        from snap7.client import Client as Cli
+        from snap7.type import Parameter
+
+        client = Cli()
+        client._apply_setup_communication({"max_amq_caller": 3, "max_amq_callee": 2, "pdu_length": 960})
+        assert client.max_amq_caller == 3
+        assert client.max_amq_callee == 2
+        assert client.pdu_length == 960
+        assert client.get_param(Parameter.PDURequest) == 960
+
+        # A zero AMQ would deadlock the pipeline; treat it as sequential
+        client._apply_setup_communication({"max_amq_caller": 0, "max_amq_callee": 0, "pdu_length": 240})
+        assert client.max_amq_caller == 1
 
     def test_data_available(self) -> None:
         """data_available returns False when no data is pending."""
@@ -344,3 +588,107 @@ class TestMultiReadServer:
         assert conn is not None
         # No data should be pending on an idle connection
         assert conn.data_available(timeout=0.0) is False
+
+
+@pytest.mark.server
+class TestMultiWriteServer:
+    """Integration tests for multi-item writes via server."""
+
+    server: Server
+    client: Client
+    db1_data: bytearray
+
+    @classmethod
+    def setup_class(cls) -> None:
+        """Start a server and connect a client."""
+        from snap7.server import Server as Srv
+        from snap7.client import Client as Cli
+
+        cls.server = Srv()
+        cls.db1_data = bytearray(100)
+        cls.server.register_area(SrvArea.DB, 1, (c_char * 100).from_buffer(cls.db1_data))
+
+        port = get_free_tcp_port()
+        cls.server.start(tcp_port=port)
+        time.sleep(0.2)
+
+        cls.client = Cli()
+        cls.client.connect("127.0.0.1", 0, 0, tcp_port=port)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        """Stop server and disconnect client."""
+        cls.client.disconnect()
+        cls.server.stop()
+
+    def test_twenty_setpoints_one_request(self) -> None:
+        """Twenty small writes travel in a single PDU."""
+        items = [{"area": Area.DB, "db_number": 1, "start": i * 4, "data": bytearray([i] * 3)} for i in range(20)]
+        conn = self.client.connection
+        assert conn is not None
+        sent: list[bytes] = []
+        original_send = conn.send_data
+
+        def counting_send(data: bytes) -> None:
+            sent.append(data)
+            original_send(data)
+
+        conn.send_data = counting_send
+        try:
+            assert self.client.write_multi_vars(items) == 0
+        finally:
+            conn.send_data = original_send
+
+        assert len(sent) == 1
+        data = self.client.db_read(1, 0, 80)
+        for i in range(20):
+            assert data[i * 4 : i * 4 + 3] == bytearray([i] * 3)
+            assert data[i * 4 + 3] == 0  # gap bytes untouched
+
+    def test_bit_item(self) -> None:
+        """Bit items set a single bit without disturbing its neighbours."""
+        from snap7.type import WordLen
+
+        self.client.db_write(1, 90, bytearray([0x81]))
+        items = [
+            {"area": Area.DB, "db_number": 1, "start": 90 * 8 + 3, "data": bytearray([1]), "word_len": WordLen.Bit},
+            {"area": Area.DB, "db_number": 1, "start": 90 * 8 + 7, "data": bytearray([0]), "word_len": WordLen.Bit},
+        ]
+        assert self.client.write_multi_vars(items) == 0
+        assert self.client.db_read(1, 90, 1) == bytearray([0x09])
+
+    def test_per_item_failure_reported(self) -> None:
+        """A failing item is reported without aborting the others."""
+        from snap7.error import S7ProtocolError
+
+        items = [
+            {"area": Area.DB, "db_number": 1, "start": 95, "data": bytearray(b"\x11")},
+            {"area": Area.DB, "db_number": 99, "start": 0, "data": bytearray(b"\x22")},
+        ]
+        with pytest.raises(S7ProtocolError, match="item 1: Object does not exist"):
+            self.client.write_multi_vars(items)
+        assert self.client.db_read(1, 95, 1) == bytearray(b"\x11")
+
+    def test_per_item_result_ctypes(self) -> None:
+        """S7DataItem.Result carries each item's own result code."""
+        from ctypes import POINTER, c_int32, c_uint8, cast
+        from snap7.type import S7DataItem, WordLen
+
+        items = []
+        buffers = []
+        for db_number in (1, 99):
+            item = S7DataItem()
+            item.Area = c_int32(Area.DB.value)
+            item.WordLen = c_int32(WordLen.Byte.value)
+            item.DBNumber = c_int32(db_number)
+            item.Start = c_int32(60)
+            item.Amount = c_int32(2)
+            buffer = (c_uint8 * 2).from_buffer_copy(b"\x33\x44")
+            buffers.append(buffer)
+            item.pData = cast(buffer, POINTER(c_uint8))
+            items.append(item)
+
+        assert self.client.write_multi_vars(items) == 0
+        assert items[0].Result == 0
+        assert items[1].Result == 0x00C00000  # errCliItemNotAvailable
+        assert self.client.db_read(1, 60, 2) == bytearray(b"\x33\x44")
@@ -0,0 +1,226 @@
+"""Tests for the cyclic tag poller."""
+
+import struct
+import time
+from queue import Queue
+from unittest.mock import patch
+
+import pytest
+
+from snap7.client import Client
+from snap7.error import S7ConnectionError
+from snap7.poller import Poller, PollGroup, PollResult
+from snap7.server import Server
+from snap7.tags import Tag
+from snap7.type import Area, SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+@pytest.mark.client
+class TestPoller:
+    server: Server
+    client: Client
+    db1: bytearray
+
+    @classmethod
+    def setup_class(cls) -> None:
+        cls.server = Server()
+        cls.db1 = bytearray(100)
+        cls.server.register_area(SrvArea.DB, 1, cls.db1)
+        port = get_free_tcp_port()
+        cls.server.start(tcp_port=port)
+        cls.client = Client()
+        cls.client.connect("127.0.0.1", 0, 1, tcp_port=port)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        cls.client.disconnect()
+        cls.server.stop()
+        cls.server.destroy()
+
+    def setup_method(self) -> None:
+        self.client.db_write(1, 0, bytearray(100))
+
+    def test_poll_decodes_values(self) -> None:
+        self.client.db_write(1, 0, bytearray(struct.pack(">hf", 1500, 2.5)))
+        self.client.db_write_bool(1, 10, 3, True)
+        poller = Poller(self.client)
+        poller.add_group("a", ["DB1.DBW0:INT", "DB1.DBD2:REAL"], interval=0.1)
+        poller.add_group("b", {"running": "DB1.DBX10.3:BOOL", "stopped": Tag(Area.DB, 1, 10, "BOOL", bit=4)}, interval=1.0)
+
+        results = poller.poll()
+
+        assert [r.group for r in results] == ["a", "b"]
+        assert results[0].values == {"DB1.DBW0:INT": 1500, "DB1.DBD2:REAL": 2.5}
+        assert results[1].values == {"running": True, "stopped": False}
+        assert poller.queue.qsize() == 2
+
+    def test_due_groups_share_one_read(self) -> None:
+        poller = Poller(self.client)
+        fast = poller.add_group("fast", ["DB1.DBW0:INT"], interval=0.1)
+        slow = poller.add_group("slow", ["DB1.DBW20:INT"], interval=1.0)
+        start = fast.next_due
+
+        with patch.object(self.client, "_optimization_plan", wraps=self.client._optimization_plan) as plan:
+            poller.poll(start)
+            assert plan.call_count == 1
+            assert len(plan.call_args[0][0]) == 2
+
+            # Only the fast group is due 100 ms later
+            results = poller.poll(start + 0.1)
+            assert [r.group for r in results] == ["fast"]
+            assert len(plan.call_args[0][0]) == 1
+
+            assert poller.poll(start + 0.15) == []
+            assert plan.call_count == 2
+        assert slow.cycles == 1
+        assert fast.cycles == 2
+
+    def test_schedule_is_drift_free(self) -> None:
+        poller = Poller(self.client)
+        group = poller.add_group("g", ["DB1.DBW0:INT"], interval=10.0)
+        start = group.next_due
+        poller.poll(start + 3.0)  # late tick: the next scan stays on the grid
+        assert group.next_due == pytest.approx(start + 10.0)
+        assert group.overruns == 0
+
+    def test_overrun_skips_missed_cycles(self) -> None:
+        poller = Poller(self.client)
+        group = poller.add_group("g", ["DB1.DBW0:INT"], interval=0.01)
+        start = group.next_due
+
+        def slow_read(plan: object) -> list[list[bytearray]]:
+            time.sleep(0.035)
+            return [[bytearray(2)]]
+
+        with patch.object(self.client, "_read_plan", side_effect=slow_read):
+            poller.poll(start)
+
+        assert group.overruns >= 3
+        assert group.next_due > time.monotonic()
+        assert (group.next_due - start) / group.interval == pytest.approx(round((group.next_due - start) / group.interval))
+
+    def test_advance(self) -> None:
+        group = PollGroup("g", {}, interval=1.0)
+        assert group.advance(0.5) == 0
+        assert group.advance(4.5) == 3  # slots 2, 3 and 4 have passed
+        assert (group.cycles, group.overruns, group.next_due) == (2, 3, 5.0)
+
+    def test_callback_and_errors(self) -> None:
+        received: list[PollResult] = []
+        poller = Poller(self.client)
+        group = poller.add_group("g", ["DB1.DBW0:INT"], interval=0.1, callback=received.append)
+
+        with patch.object(self.client, "_read_plan", side_effect=S7ConnectionError("gone")):
+            poller.poll()
+
+        assert len(received) == 1
+        assert isinstance(received[0].error, S7ConnectionError)
+        assert received[0].values == {}
+        assert group.errors == 1
+        assert poller.queue.empty()
+
+    def test_bounded_queue_drops_oldest(self) -> None:
+        poller = Poller(self.client, queue_size=1)
+        group = poller.add_group("g", ["DB1.DBW0:INT"], interval=0.1)
+        self.client.db_write(1, 0, bytearray(struct.pack(">h", 1)))
+        poller.poll()
+        self.client.db_write(1, 0, bytearray(struct.pack(">h", 2)))
+        poller.poll(group.next_due)
+        assert poller.queue.get_nowait().values == {"DB1.DBW0:INT": 2}
+
+    def test_add_group_validation(self) -> None:
+        poller = Poller(self.client)
+        poller.add_group("g", ["DB1.DBW0:INT"], interval=0.1)
+        with pytest.raises(ValueError):
+            poller.add_group("g", ["DB1.DBW2:INT"], interval=0.1)
+        with pytest.raises(ValueError):
+            poller.add_group("h", ["DB1.DBW2:INT"], interval=0)
+        with pytest.raises(ValueError):
+            poller.add_group("h", ["DB1.DBW2:INT", "DB1.DBW2:INT"], interval=0.1)
+        poller.remove_group("g")
+        assert poller.groups == {}
+
+    def test_background_thread(self) -> None:
+        self.client.db_write(1, 0, bytearray(struct.pack(">h", 42)))
+        results: "Queue[PollResult]" = Queue()
+        poller = Poller(self.client)
+        poller.add_group("fast", ["DB1.DBW0:INT"], interval=0.02, callback=results.put)
+        poller.add_group("slow", ["DB1.DBW0:INT"], interval=0.2)
+        with poller:
+            assert poller.running
+            first = results.get(timeout=2)
+            time.sleep(0.25)
+        assert not poller.running
+        assert first.values == {"DB1.DBW0:INT": 42}
+        assert poller.groups["fast"].cycles >= 5
+        assert poller.groups["slow"].cycles >= 1
+        assert poller.queue.get_nowait().group == "slow"
+
+    def test_changes_only(self) -> None:
+        self.client.db_write(1, 0, bytearray(struct.pack(">hhh", 1, 2, 3)))
+        poller = Poller(self.client)
+        group = poller.add_group("g", ["DB1.DBW0:INT", "DB1.DBW2:INT", "DB1.DBW4:INT"], interval=0.1, changes_only=True)
+
+        assert poller.poll()[0].values == {"DB1.DBW0:INT": 1, "DB1.DBW2:INT": 2, "DB1.DBW4:INT": 3}
+        with patch("snap7.poller._decode_tag") as decode:
+            assert poller.poll(group.next_due) == []
+            decode.assert_not_called()
+
+        self.client.db_write(1, 2, bytearray(struct.pack(">h", 20)))
+        assert poller.poll(group.next_due)[0].values == {"DB1.DBW2:INT": 20}
+        assert poller.queue.qsize() == 2
+
+    def test_changes_across_layouts(self) -> None:
+        poller = Poller(self.client)
+        fast = poller.add_group("fast", ["DB1.DBW0:INT"], interval=0.1, changes_only=True)
+        poller.add_group("slow", ["DB1.DBW2:INT"], interval=0.2)
+        start = fast.next_due
+
+        assert [r.group for r in poller.poll(start)] == ["fast", "slow"]
+        self.client.db_write(1, 0, bytearray(struct.pack(">h", 7)))
+        assert poller.poll(start + 0.1)[0].values == {"DB1.DBW0:INT": 7}
+        # Back to the value seen the last time both groups were read together
+        self.client.db_write(1, 0, bytearray(struct.pack(">h", 0)))
+        results = poller.poll(start + 0.2)
+        assert [(r.group, r.values) for r in results] == [("fast", {"DB1.DBW0:INT": 0}), ("slow", {"DB1.DBW2:INT": 0})]
+
+    def test_absolute_deadband(self) -> None:
+        poller = Poller(self.client)
+        group = poller.add_group("g", {"level": "DB1.DBD0:REAL"}, interval=0.1, deadband=1.0)
+        assert group.changes_only
+
+        results = []
+        for value in (10.0, 10.5, 10.9, 11.5, 9.0):
+            self.client.db_write(1, 0, bytearray(struct.pack(">f", value)))
+            results.extend(poller.poll(group.next_due))
+        assert [r.values["level"] for r in results] == [10.0, 11.5, 9.0]
+
+    def test_percent_deadband(self) -> None:
+        poller = Poller(self.client)
+        group = poller.add_group("g", {"speed": "DB1.DBW0:INT"}, interval=0.1, deadband=10, deadband_type="percent")
+
+        results = []
+        for value in (1000, 1050, 1099, 1101, 0, 1):
+            self.client.db_write(1, 0, bytearray(struct.pack(">h", value)))
+            results.extend(poller.poll(group.next_due))
+        assert [r.values["speed"] for r in results] == [1000, 1101, 0, 1]
+
+    def test_deadband_validation(self) -> None:
+        poller = Poller(self.client)
+        with pytest.raises(ValueError):
+            poller.add_group("g", ["DB1.DBW0:INT"], interval=0.1, deadband=-1)
+        with pytest.raises(ValueError):
+            poller.add_group("g", ["DB1.DBW0:INT"], interval=0.1, deadband=1, deadband_type="relative")
+
+    def test_changes_only_without_optimizer(self) -> None:
+        poller = Poller(self.client)
+        group = poller.add_group("g", ["DB1.DBW0:INT", "DB1.DBX2.1:BOOL"], interval=0.1, changes_only=True)
+        self.client.use_optimizer = False
+        try:
+            assert poller.poll()[0].values == {"DB1.DBW0:INT": 0, "DB1.DBX2.1:BOOL": False}
+            self.client.db_write_bool(1, 2, 1, True)
+            assert poller.poll(group.next_due)[0].values == {"DB1.DBX2.1:BOOL": True}
+            assert poller.poll(group.next_due) == []
+        finally:
+            self.client.use_optimizer = True
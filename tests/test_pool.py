@@ -0,0 +1,104 @@
+"""Tests for the multi-PLC client pool."""
+
+import struct
+import threading
+from typing import Any
+
+import pytest
+
+from snap7.client import Client
+from snap7.error import S7ConnectionError
+from snap7.pool import ClientPool
+from snap7.server import Server
+from snap7.type import SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+@pytest.mark.client
+class TestClientPool:
+    server: Server
+    port: int
+
+    @classmethod
+    def setup_class(cls) -> None:
+        cls.server = Server()
+        db1 = bytearray(100)
+        db1[0:6] = struct.pack(">hf", 1500, 2.5)
+        cls.server.register_area(SrvArea.DB, 1, db1)
+        cls.port = get_free_tcp_port()
+        cls.server.start(tcp_port=cls.port)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        cls.server.stop()
+        cls.server.destroy()
+
+    def test_session_reuses_connection(self) -> None:
+        with ClientPool(tcp_port=self.port) as pool:
+            with pool.session("127.0.0.1", 0, 1) as first:
+                assert first.db_read(1, 0, 2) == bytearray(struct.pack(">h", 1500))
+            with pool.session("127.0.0.1", 0, 1) as second:
+                assert second is first
+                assert second.get_connected()
+            assert pool.targets == [("127.0.0.1", 0, 1)]
+        assert not first.get_connected()
+
+    def test_read_tags_fan_out(self) -> None:
+        targets = [("127.0.0.1", 0, slot) for slot in (1, 2, 3)]
+        with ClientPool(max_workers=2, tcp_port=self.port) as pool:
+            results = pool.read_tags(targets, ["DB1.DBW0:INT", "DB1.DBD2:REAL"])
+        assert list(results) == targets
+        assert all(r.error is None and r.value == [1500, 2.5] for r in results.values())
+
+    def test_errors_are_per_target(self) -> None:
+        def operation(client: Client) -> Any:
+            if client.slot == 2:
+                raise ValueError("bad tag")
+            return client.db_read(1, 0, 2)
+
+        with ClientPool(tcp_port=self.port) as pool:
+            results = pool.run([("127.0.0.1", 0, 1), ("127.0.0.1", 0, 2)], operation)
+        assert results[("127.0.0.1", 0, 1)].error is None
+        assert isinstance(results[("127.0.0.1", 0, 2)].error, ValueError)
+
+    def test_connection_error_disconnects_client(self) -> None:
+        with ClientPool(tcp_port=self.port) as pool:
+            with pytest.raises(S7ConnectionError):
+                with pool.session("127.0.0.1", 0, 1) as client:
+                    raise S7ConnectionError("gone")
+            assert not client.get_connected()
+            with pool.session("127.0.0.1", 0, 1) as again:
+                assert again is client and again.get_connected()
+
+    def test_sessions_are_exclusive(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def operation(client: Client) -> None:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            client.db_read(1, 0, 2)
+            with lock:
+                active -= 1
+
+        with ClientPool(max_workers=4, tcp_port=self.port) as pool:
+            threads = [threading.Thread(target=pool.run, args=([("127.0.0.1", 0, 1)], operation)) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert peak == 1
+
+    def test_unreachable_plc(self) -> None:
+        with ClientPool(tcp_port=get_free_tcp_port()) as pool:
+            results = pool.read_tags([("127.0.0.1", 0, 1)], ["DB1.DBW0:INT"])
+        assert results[("127.0.0.1", 0, 1)].error is not None
+
+    def test_closed_pool(self) -> None:
+        pool = ClientPool(tcp_port=self.port)
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.run([("127.0.0.1", 0, 1)], lambda client: None)
@@ -7,6 +7,7 @@ import pytest
 from datetime import datetime
 
 from snap7.s7protocol import (
+    RequestTemplate,
     S7Protocol,
     S7PDUType,
     S7Function,
@@ -17,6 +18,7 @@ from snap7.s7protocol import (
     _HOT_START_PARAMS,
     _COLD_START_PARAMS,
 )
+from snap7.datatypes import S7Area, S7WordLen
 from snap7.error import S7ProtocolError
 
 
@@ -129,6 +131,120 @@ class TestParseResponse:
         assert resp["parameters"]["function_code"] == 0xAA
 
 
+class TestParseReadReply:
+    """Test the parse_read_reply() fast path."""
+
+    def setup_method(self) -> None:
+        self.proto = S7Protocol()
+
+    def _build_ack_data_pdu(
+        self,
+        func_code: int,
+        item_count: int = 1,
+        data_section: bytes = b"",
+        error_class: int = 0,
+        error_code: int = 0,
+        sequence: int = 1,
+    ) -> bytes:
+        params = struct.pack(">BB", func_code, item_count)
+        header = struct.pack(
+            ">BBHHHHBB", 0x32, S7PDUType.ACK_DATA, 0, sequence, len(params), len(data_section), error_class, error_code
+        )
+        return header + params + data_section
+
+    def test_payload_view(self) -> None:
+        data_section = struct.pack(">BBH", 0xFF, 0x04, 24) + b"\x01\x02\x03"
+        pdu = self._build_ack_data_pdu(S7Function.READ_AREA, 1, data_section, sequence=7)
+        sequence, payload = self.proto.parse_read_reply(pdu)
+        assert sequence == 7
+        assert isinstance(payload, memoryview)
+        assert payload.tobytes() == b"\x01\x02\x03"
+        assert payload.obj is pdu  # no copy
+        assert bytes(payload) == self.proto.parse_response(pdu)["data"]["data"]
+
+    def test_octet_string_length_in_bytes(self) -> None:
+        data_section = struct.pack(">BBH", 0xFF, 0x09, 2) + b"\xab\xcd"
+        pdu = self._build_ack_data_pdu(S7Function.READ_AREA, 1, data_section)
+        assert self.proto.parse_read_reply(pdu)[1].tobytes() == b"\xab\xcd"
+
+    def test_header_error(self) -> None:
+        pdu = self._build_ack_data_pdu(S7Function.READ_AREA, error_class=0x81, error_code=0x04)
+        with pytest.raises(S7ProtocolError, match="class=0x81") as exc_info:
+            self.proto.parse_read_reply(pdu)
+        assert exc_info.value.error_code == 0x8104
+
+    def test_item_return_code(self) -> None:
+        data_section = struct.pack(">BBH", 0x0A, 0x00, 0)
+        pdu = self._build_ack_data_pdu(S7Function.READ_AREA, 1, data_section)
+        with pytest.raises(S7ProtocolError, match="Object does not exist"):
+            self.proto.parse_read_reply(pdu)
+
+    def test_wrong_function(self) -> None:
+        pdu = self._build_ack_data_pdu(S7Function.WRITE_AREA, 1, b"\xff")
+        with pytest.raises(S7ProtocolError, match="Expected READ_AREA"):
+            self.proto.parse_read_reply(pdu)
+
+    def test_truncated(self) -> None:
+        data_section = struct.pack(">BBH", 0xFF, 0x04, 24) + b"\x01\x02\x03"
+        pdu = self._build_ack_data_pdu(S7Function.READ_AREA, 1, data_section)
+        with pytest.raises(S7ProtocolError):
+            self.proto.parse_read_reply(pdu[:-2])
+        with pytest.raises(S7ProtocolError, match="too short"):
+            self.proto.parse_read_reply(pdu[:8])
+
+
+class TestMultiWrite:
+    """Tests for build_multi_write_request / extract_multi_write_results."""
+
+    def setup_method(self) -> None:
+        self.proto = S7Protocol()
+
+    def test_build_two_items_with_fill_byte(self) -> None:
+        pdu = self.proto.build_multi_write_request([(0x84, 1, 0, 0x02, b"\x01\x02\x03"), (0x84, 2, 10, 0x02, b"\x04")])
+        _, _, _, _, param_len, data_len = struct.unpack(">BBHHHH", pdu[:10])
+        assert param_len == 2 + 2 * 12
+        assert pdu[10] == S7Function.WRITE_AREA
+        assert pdu[11] == 2
+        data = pdu[10 + param_len :]
+        assert len(data) == data_len
+        # First item: header + 3 bytes + fill byte; last item has no fill
+        assert data[:4] == struct.pack(">BBH", 0x00, 0x04, 24)
+        assert data[4:8] == b"\x01\x02\x03\x00"
+        assert data[8:] == struct.pack(">BBH", 0x00, 0x04, 8) + b"\x04"
+
+    def test_build_bit_item(self) -> None:
+        pdu = self.proto.build_multi_write_request([(0x84, 1, 8 * 3 + 5, 0x01, b"\x01"), (0x84, 1, 4, 0x02, b"\x00\x00")])
+        param_len = struct.unpack(">H", pdu[6:8])[0]
+        # Bit address spec keeps the bit offset, data is one bit long
+        assert pdu[12 + 3] == 0x01
+        assert pdu[12 + 9 : 12 + 12] == (3 * 8 + 5).to_bytes(3, "big")
+        assert pdu[10 + param_len : 10 + param_len + 5] == struct.pack(">BBH", 0x00, 0x03, 1) + b"\x01"
+
+    def test_extract_results(self) -> None:
+        assert self.proto.extract_multi_write_results({"raw_data": b"\xff\x0a\xff"}, 3) == [0xFF, 0x0A, 0xFF]
+
+    def test_extract_results_short(self) -> None:
+        with pytest.raises(S7ProtocolError, match="expected 3"):
+            self.proto.extract_multi_write_results({"raw_data": b"\xff"}, 3)
+
+
+class TestRequestTemplate:
+    """Tests for RequestTemplate / S7Protocol.stamp_request."""
+
+    def test_stamp_patches_only_sequence(self) -> None:
+        proto = S7Protocol()
+        pdu = proto.build_read_request(S7Area.DB, 1, 0, S7WordLen.BYTE, 4)
+        template = RequestTemplate(bytearray(b"\xaa\xbb") + pdu, header_size=2)
+        assert template.sequence == 1
+        assert template.pdu.tobytes() == pdu
+
+        frame = proto.stamp_request(template)
+        assert frame is template.frame
+        assert template.sequence == 2
+        assert frame[:2] == b"\xaa\xbb"
+        assert template.pdu.tobytes() == pdu[:4] + struct.pack(">H", 2) + pdu[6:]
+
+
 class TestUserDataParsing:
     """Test USERDATA PDU parsing."""
 
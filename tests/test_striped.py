@@ -0,0 +1,87 @@
+"""Tests for transfers striped over several connections."""
+
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pytest
+
+from snap7.error import S7ConnectionError
+from snap7.server import Server
+from snap7.striped import StripedClient
+from snap7.type import Area, SrvArea
+from tests.conftest import get_free_tcp_port
+
+
+@pytest.mark.client
+class TestStripedClient:
+    server: Server
+    client: StripedClient
+    db1: bytearray
+    port: int
+
+    @classmethod
+    def setup_class(cls) -> None:
+        cls.server = Server()
+        cls.db1 = bytearray(i % 251 for i in range(8000))
+        cls.server.register_area(SrvArea.DB, 1, cls.db1)
+        cls.server.register_area(SrvArea.DB, 2, bytearray(8000))
+        cls.port = get_free_tcp_port()
+        cls.server.start(tcp_port=cls.port)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        cls.server.stop()
+        cls.server.destroy()
+
+    def setup_method(self) -> None:
+        self.client = StripedClient(stripes=3).connect("127.0.0.1", 0, 1, self.port)
+
+    def teardown_method(self) -> None:
+        self.client.disconnect()
+
+    def test_connect_opens_every_stripe(self) -> None:
+        assert len(self.client.stripes) == 3
+        assert self.client.get_connected()
+
+    def test_read_area_reassembles_segments(self) -> None:
+        with ExitStack() as stack:
+            spies = [stack.enter_context(patch.object(c, "read_area", wraps=c.read_area)) for c in self.client.stripes]
+            assert self.client.db_read(1, 0, 8000) == self.db1
+        segments = sorted(spy.call_args.args[2:] for spy in spies)
+        assert all(spy.call_count == 1 for spy in spies)
+        assert segments[0][0] == 0 and sum(size for _, size in segments) == 8000
+
+    def test_write_area(self) -> None:
+        data = bytearray(i % 7 for i in range(5000))
+        self.client.db_write(2, 100, data)
+        assert self.client.db_read(2, 100, 5000) == data
+
+    def test_read_multi_vars_spreads_packets(self) -> None:
+        items = [{"area": Area.DB, "db_number": 1 + i % 2, "start": i * 200, "size": 4} for i in range(30)]
+        self.client.db_write(2, 0, bytearray(8000))
+        code, results = self.client.read_multi_vars(items)
+        assert code == 0
+        expected = [bytes(self.db1[i * 200 : i * 200 + 4]) if i % 2 == 0 else bytes(4) for i in range(30)]
+        assert [bytes(r) for r in results] == expected
+
+    def test_read_tags(self) -> None:
+        assert self.client.read_tags(["DB1.DBB1:BYTE", "DB1.DBB300:BYTE"]) == [1, 300 % 251]
+
+    def test_failed_stripe_is_dropped(self) -> None:
+        failing = self.client.stripes[1]
+        with patch.object(failing, "read_area", side_effect=S7ConnectionError("gone")):
+            assert self.client.db_read(1, 0, 8000) == self.db1
+        assert failing not in self.client.stripes
+        assert len(self.client.stripes) == 2
+        assert not failing.get_connected()
+
+    def test_all_stripes_failed(self) -> None:
+        for stripe in self.client.stripes:
+            stripe.disconnect()
+        with pytest.raises(S7ConnectionError):
+            self.client.db_read(1, 0, 8000)
+        assert self.client.stripes == []
+
+    def test_connect_failure(self) -> None:
+        with pytest.raises(S7ConnectionError):
+            StripedClient(stripes=2).connect("127.0.0.1", 0, 1, get_free_tcp_port())
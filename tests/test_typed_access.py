@@ -1,11 +1,13 @@
 """Tests for typed data access methods on Client."""
 
 import unittest
+from typing import Union
 
 import pytest
 
 from snap7.client import Client
 from snap7.server import Server
+from snap7.tags import Tag
 from snap7.type import SrvArea
 
 ip = "127.0.0.1"
@@ -72,6 +74,27 @@ class TestTypedAccess(unittest.TestCase):
             self.client.db_write_bool(1, 0, bit, True)
             self.assertTrue(self.client.db_read_bool(1, 0, bit))
 
+    def test_write_tags_bits_in_one_byte(self) -> None:
+        self.client.db_write_byte(1, 2, 0b10000001)
+        tags: list[Union[Tag, str]] = [f"DB1.DBX2.{bit}:BOOL" for bit in (1, 2, 7, 1)]
+        before = self.server.metrics.snapshot().requests
+        self.client.write_tags(tags, [True, True, False, False])
+        after = self.server.metrics.snapshot().requests
+        # One multi-item request of bit writes, the byte is never read
+        self.assertEqual(before.get("READ_AREA", 0), after.get("READ_AREA", 0))
+        self.assertEqual(before.get("WRITE_AREA", 0) + 1, after["WRITE_AREA"])
+        self.assertEqual(0b00000101, self.client.db_read_byte(1, 2))
+        self.assertEqual([False, True, False, False], self.client.read_tags(tags))
+
+    def test_write_tags_mixed(self) -> None:
+        self.client.db_write_byte(1, 3, 0)
+        self.client.write_tags(["DB1.DBX3.4:BOOL", "DB1:420:INT", "DB1:424:REAL"], [True, -7, 2.5])
+        values = self.client.read_tags(["DB1.DBX3.4:BOOL", "DB1.DBX3.3:BOOL", "DB1:420:INT", "DB1:424:REAL"])
+        self.assertEqual([True, False, -7, 2.5], values)
+
+    def test_write_tags_length_mismatch(self) -> None:
+        self.assertRaises(ValueError, self.client.write_tags, ["DB1:420:INT"], [])
+
     # Byte tests
 
     def test_byte_roundtrip(self) -> None: